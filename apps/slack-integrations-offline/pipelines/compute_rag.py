@@ -1,6 +1,5 @@
 from zenml import pipeline
 
-from steps.infrastructure.fetch_from_mongodb import fetch_from_mongodb
 from steps.compute_rag.chunk_embed_load import chunk_embed_load
 
 
@@ -13,21 +12,44 @@ def compute_rag(
     retriever_type: str,
     chunk_size: int,
     top_k: int,
-    processing_batch_size: int,
-    processing_max_workers: int,
+    splitter_type: str,
+    embedding_request_max_tokens: int,
+    embedding_tpm_limit: int,
+    split_workers: int,
+    embed_workers: int,
+    insert_workers: int,
+    queue_size: int,
     limit: int,
+    embedding_max_attempts: int,
+    embedding_retry_base_delay: float,
+    drain_dead_letter: bool,
+    embedding_storage: str,
+    embedding_storage_dim: int,
+    deduplicate: bool,
+    near_duplicate_threshold: float,
 ) -> None:
-    
-    documents = fetch_from_mongodb(collection_name=extract_collection_name, limit=limit)
 
     chunk_embed_load(
-        documents=documents,
+        extract_collection_name=extract_collection_name,
         collection_name=new_collection_name,
         embedding_model_id=embedding_model_id, 
         embedding_model_dim=embedding_model_dim,
         retriever_type=retriever_type, 
         chunk_size=chunk_size,
         top_k=top_k,
-        processing_batch_size=processing_batch_size,
-        processing_max_workers=processing_max_workers,
+        splitter_type=splitter_type,
+        embedding_request_max_tokens=embedding_request_max_tokens,
+        embedding_tpm_limit=embedding_tpm_limit,
+        split_workers=split_workers,
+        embed_workers=embed_workers,
+        insert_workers=insert_workers,
+        queue_size=queue_size,
+        limit=limit,
+        embedding_max_attempts=embedding_max_attempts,
+        embedding_retry_base_delay=embedding_retry_base_delay,
+        drain_dead_letter=drain_dead_letter,
+        embedding_storage=embedding_storage,
+        embedding_storage_dim=embedding_storage_dim,
+        deduplicate=deduplicate,
+        near_duplicate_threshold=near_duplicate_threshold,
     )
\ No newline at end of file
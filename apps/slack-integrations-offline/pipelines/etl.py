@@ -18,6 +18,7 @@ def etl(
     temperature: float = 0.0,
     max_workers: int = 10,
     summarization_max_characters: int = 1000,
+    ingest_writers: int = 2,
 ) -> None:
     
     crawled_data_dir = data_dir / "crawled"
@@ -42,5 +43,6 @@ def etl(
     ingest_to_mongodb(
         models=enhanced_documents,
         collection_name=load_collection_name,
-        clear_collection=True
+        clear_collection=True,
+        writers=ingest_writers,
     )
\ No newline at end of file
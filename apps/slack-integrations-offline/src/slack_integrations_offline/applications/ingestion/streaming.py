@@ -0,0 +1,236 @@
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, Iterator
+
+from loguru import logger
+
+
+_SENTINEL = object()
+
+
+@dataclass
+class Stage:
+    """Definition of a single stage of a streaming pipeline.
+
+    Attributes:
+        name: Human readable name of the stage, used for logging and stats.
+        fn: Callable receiving an iterator over the stage inputs and yielding the stage outputs.
+            Each worker runs its own copy of ``fn`` over a shared input queue.
+        workers: Number of worker threads running the stage.
+        size: Callable returning how many units an output item accounts for in the stats.
+    """
+
+    name: str
+    fn: Callable[[Iterator[Any]], Iterable[Any]]
+    workers: int = 1
+    size: Callable[[Any], int] = lambda _: 1
+
+
+@dataclass
+class StageStats:
+    """Throughput counters collected for a single pipeline stage.
+
+    Attributes:
+        name: Name of the stage.
+        workers: Number of worker threads that ran the stage.
+        items_in: Number of items consumed from the upstream queue.
+        items_out: Number of units produced by the stage.
+        seconds: Wall time between the stage start and its last worker finishing.
+    """
+
+    name: str
+    workers: int
+    items_in: int = 0
+    items_out: int = 0
+    seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+    def add(self, items_in: int = 0, items_out: int = 0) -> None:
+        """Atomically increment the stage counters."""
+
+        with self._lock:
+            self.items_in += items_in
+            self.items_out += items_out
+
+
+    @property
+    def throughput(self) -> float:
+        """Units produced per second of stage wall time."""
+
+        return self.items_out / self.seconds if self.seconds else 0.0
+
+
+    def to_metadata(self) -> dict:
+        """Serialize the stats into a JSON friendly dictionary.
+
+        Returns:
+            dict: Stage counters and throughput.
+        """
+
+        return {
+            "workers": self.workers,
+            "items_in": self.items_in,
+            "items_out": self.items_out,
+            "seconds": round(self.seconds, 3),
+            "throughput_per_second": round(self.throughput, 3),
+        }
+
+
+class StreamingPipeline:
+    """Thread based streaming pipeline connecting stages with bounded queues.
+
+    Items flow from a source iterable through every stage in order. Consecutive stages are
+    connected by ``queue.Queue(maxsize=queue_size)`` instances, so a slow stage applies
+    backpressure upstream and memory stays bounded by the queue sizes instead of the corpus size.
+
+    Attributes:
+        source: Zero-argument callable returning the iterable feeding the first stage.
+        stages: Ordered list of stages to run.
+        queue_size: Maximum number of items buffered between two stages.
+        poll_interval: Seconds between checks of the stop flag while blocked on a queue.
+    """
+
+    def __init__(
+        self,
+        source: Callable[[], Iterable[Any]],
+        stages: list[Stage],
+        queue_size: int = 32,
+        poll_interval: float = 0.5,
+    ) -> None:
+        if not stages:
+            raise ValueError("A streaming pipeline needs at least one stage.")
+
+        self.source = source
+        self.stages = stages
+        self.queue_size = queue_size
+        self.poll_interval = poll_interval
+
+        self._stop = threading.Event()
+        self._errors: list[BaseException] = []
+
+
+    def run(self) -> list[StageStats]:
+        """Run the pipeline until the source is exhausted and every stage has drained.
+
+        Returns:
+            list[StageStats]: Stats of the source followed by one entry per stage.
+
+        Raises:
+            BaseException: The first exception raised by any stage worker.
+        """
+
+        source_stage = Stage(name="source", fn=lambda _: self.source(), workers=1)
+        all_stages = [source_stage, *self.stages]
+
+        queues: list[queue.Queue | None] = [
+            queue.Queue(maxsize=self.queue_size) for _ in all_stages[:-1]
+        ] + [None]
+        stats = [StageStats(name=stage.name, workers=stage.workers) for stage in all_stages]
+        remaining = [stage.workers for stage in all_stages]
+        remaining_lock = threading.Lock()
+        started_at = time.perf_counter()
+
+        def on_worker_done(index: int) -> None:
+            with remaining_lock:
+                remaining[index] -= 1
+                is_last = remaining[index] == 0
+
+            if not is_last:
+                return
+
+            stats[index].seconds = time.perf_counter() - started_at
+            logger.info(
+                f"Stage '{all_stages[index].name}' finished: {stats[index].items_out} items "
+                f"in {stats[index].seconds:.2f}s ({stats[index].throughput:.2f}/s)"
+            )
+
+            output_queue = queues[index]
+            if output_queue is not None:
+                for _ in range(all_stages[index + 1].workers):
+                    self._put(output_queue, _SENTINEL, force=True)
+
+        threads = []
+        for index, stage in enumerate(all_stages):
+            input_queue = queues[index - 1] if index > 0 else None
+            for worker_id in range(stage.workers):
+                thread = threading.Thread(
+                    target=self._run_worker,
+                    args=(stage, stats[index], input_queue, queues[index], index, on_worker_done),
+                    name=f"{stage.name}-{worker_id}",
+                    daemon=True,
+                )
+                threads.append(thread)
+
+        for thread in threads:
+            thread.start()
+
+        for thread in threads:
+            thread.join()
+
+        if self._errors:
+            raise self._errors[0]
+
+        return stats
+
+
+    def _run_worker(
+        self,
+        stage: Stage,
+        stats: StageStats,
+        input_queue: queue.Queue | None,
+        output_queue: queue.Queue | None,
+        index: int,
+        on_done: Callable[[int], None],
+    ) -> None:
+        """Run one worker of a stage, forwarding its outputs downstream."""
+
+        try:
+            inputs = self._drain(input_queue, stats) if input_queue is not None else None
+
+            for output in stage.fn(inputs):
+                stats.add(items_out=stage.size(output))
+
+                if output_queue is not None:
+                    self._put(output_queue, output)
+
+                if self._stop.is_set():
+                    break
+
+        except BaseException as e:
+            logger.error(f"Stage '{stage.name}' failed: {e}")
+            self._errors.append(e)
+            self._stop.set()
+
+        finally:
+            on_done(index)
+
+
+    def _drain(self, input_queue: queue.Queue, stats: StageStats) -> Iterator[Any]:
+        """Yield items from a queue until a sentinel is received or the pipeline stops."""
+
+        while not self._stop.is_set():
+            try:
+                item = input_queue.get(timeout=self.poll_interval)
+            except queue.Empty:
+                continue
+
+            if item is _SENTINEL:
+                return
+
+            stats.add(items_in=1)
+            yield item
+
+
+    def _put(self, output_queue: queue.Queue, item: Any, force: bool = False) -> None:
+        """Put an item on a bounded queue, blocking until there is room or the pipeline stops."""
+
+        while force or not self._stop.is_set():
+            try:
+                output_queue.put(item, timeout=self.poll_interval)
+                return
+            except queue.Full:
+                if force and self._stop.is_set():
+                    return
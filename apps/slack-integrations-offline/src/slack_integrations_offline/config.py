@@ -62,6 +62,31 @@ class Settings(BaseSettings):
         description="MongoDB connection URI. If unset, local no-auth MongoDB is used.",
     )
 
+    MONGODB_MAX_POOL_SIZE: int = Field(
+        default=50,
+        description="Maximum number of connections in the shared MongoDB client pool.",
+    )
+
+    MONGODB_MIN_POOL_SIZE: int = Field(
+        default=0,
+        description="Minimum number of connections kept open in the shared MongoDB client pool.",
+    )
+
+    MONGODB_CONNECT_TIMEOUT_MS: int = Field(
+        default=20000,
+        description="Timeout in milliseconds to open a MongoDB connection.",
+    )
+
+    MONGODB_SERVER_SELECTION_TIMEOUT_MS: int = Field(
+        default=30000,
+        description="Timeout in milliseconds to find an available MongoDB server.",
+    )
+
+    MONGODB_WAIT_QUEUE_TIMEOUT_MS: int | None = Field(
+        default=None,
+        description="Timeout in milliseconds to wait for a free pooled connection. None waits forever.",
+    )
+
 
 # --------------------------------------------------
 # Load settings safely
@@ -0,0 +1,41 @@
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, Field
+
+from src.slack_integrations_offline.utils import generate_random_hex
+
+
+class DeadLetterChunk(BaseModel):
+    """Chunk that could not be embedded.
+    
+    Attributes:
+        text: Text content of the chunk.
+        metadata: Metadata inherited from the source document.
+    """
+
+    text: str
+    metadata: dict
+
+
+class DeadLetterBatch(BaseModel):
+    """Embedding batch that kept failing after every retry.
+    
+    Attributes:
+        id: Unique identifier for the batch, auto-generated as 32-character hex string.
+        chunks: Chunks of the failed embedding request.
+        tokens: Number of tokens of the batch.
+        error_class: Class name of the last error raised for the batch.
+        error_message: Message of the last error raised for the batch.
+        attempts: Total number of embedding attempts made for the batch, across runs.
+        created_at: When the batch was first dead-lettered.
+        updated_at: When the batch last failed.
+    """
+
+    id: str = Field(default_factory=lambda: generate_random_hex(length=32))
+    chunks: list[DeadLetterChunk]
+    tokens: int
+    error_class: str
+    error_message: str
+    attempts: int
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    updated_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,213 @@
+import atexit
+import threading
+from dataclasses import asdict, dataclass, field
+
+from loguru import logger
+from pymongo import MongoClient
+from pymongo.monitoring import (
+    ConnectionCheckedInEvent,
+    ConnectionCheckedOutEvent,
+    ConnectionCheckOutFailedEvent,
+    ConnectionCheckOutStartedEvent,
+    ConnectionClosedEvent,
+    ConnectionCreatedEvent,
+    ConnectionPoolListener,
+    ConnectionReadyEvent,
+    PoolClearedEvent,
+    PoolClosedEvent,
+    PoolCreatedEvent,
+)
+
+from src.slack_integrations_offline.config import settings
+
+
+@dataclass
+class PoolStats:
+    """Connection pool counters of a shared MongoDB client, across all its servers.
+
+    Attributes:
+        max_pool_size: Maximum number of connections per server.
+        open_connections: Number of connections currently open.
+        checked_out: Number of connections currently in use.
+        peak_checked_out: Highest number of connections in use at the same time.
+        connections_created: Number of connections opened since the client was created.
+        checkouts: Number of successful connection checkouts.
+        checkout_failures: Number of checkouts that failed, e.g. on a wait queue timeout.
+        pool_clears: Number of times a pool was cleared after a network error.
+    """
+
+    max_pool_size: int
+    open_connections: int = 0
+    checked_out: int = 0
+    peak_checked_out: int = 0
+    connections_created: int = 0
+    checkouts: int = 0
+    checkout_failures: int = 0
+    pool_clears: int = 0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+    def to_metadata(self) -> dict:
+        """Serialize the counters and the peak pool utilization into a JSON friendly dictionary."""
+
+        with self._lock:
+            stats = {key: value for key, value in asdict(self).items() if not key.startswith("_")}
+
+        stats["peak_utilization"] = (
+            round(self.peak_checked_out / self.max_pool_size, 3) if self.max_pool_size else 0.0
+        )
+
+        return stats
+
+
+class PoolStatsListener(ConnectionPoolListener):
+    """Connection pool listener maintaining the ``PoolStats`` of a client."""
+
+    def __init__(self, stats: PoolStats) -> None:
+        self.stats = stats
+
+
+    def connection_created(self, event: ConnectionCreatedEvent) -> None:
+        with self.stats._lock:
+            self.stats.open_connections += 1
+            self.stats.connections_created += 1
+
+
+    def connection_closed(self, event: ConnectionClosedEvent) -> None:
+        with self.stats._lock:
+            self.stats.open_connections -= 1
+
+
+    def connection_checked_out(self, event: ConnectionCheckedOutEvent) -> None:
+        with self.stats._lock:
+            self.stats.checkouts += 1
+            self.stats.checked_out += 1
+            self.stats.peak_checked_out = max(self.stats.peak_checked_out, self.stats.checked_out)
+
+
+    def connection_checked_in(self, event: ConnectionCheckedInEvent) -> None:
+        with self.stats._lock:
+            self.stats.checked_out -= 1
+
+
+    def connection_check_out_failed(self, event: ConnectionCheckOutFailedEvent) -> None:
+        with self.stats._lock:
+            self.stats.checkout_failures += 1
+
+
+    def pool_cleared(self, event: PoolClearedEvent) -> None:
+        with self.stats._lock:
+            self.stats.pool_clears += 1
+
+
+    def pool_created(self, event: PoolCreatedEvent) -> None:
+        pass
+
+
+    def pool_closed(self, event: PoolClosedEvent) -> None:
+        pass
+
+
+    def connection_ready(self, event: ConnectionReadyEvent) -> None:
+        pass
+
+
+    def connection_check_out_started(self, event: ConnectionCheckOutStartedEvent) -> None:
+        pass
+
+
+_clients: dict[str, MongoClient] = {}
+_pool_stats: dict[str, PoolStats] = {}
+_clients_lock = threading.Lock()
+
+
+def get_mongo_client(
+    mongodb_uri: str = settings.MONGODB_URI,
+    max_pool_size: int = settings.MONGODB_MAX_POOL_SIZE,
+    min_pool_size: int = settings.MONGODB_MIN_POOL_SIZE,
+    connect_timeout_ms: int = settings.MONGODB_CONNECT_TIMEOUT_MS,
+    server_selection_timeout_ms: int = settings.MONGODB_SERVER_SELECTION_TIMEOUT_MS,
+    wait_queue_timeout_ms: int | None = settings.MONGODB_WAIT_QUEUE_TIMEOUT_MS,
+) -> MongoClient:
+    """Get the process-wide MongoDB client of a URI, creating and pinging it on first use.
+
+    MongoClient is thread-safe and pools its connections, so every service, retriever and
+    vector store of the process shares one client per URI instead of opening its own pool.
+    The pool options only apply when the client is created.
+
+    Args:
+        mongodb_uri: MongoDB connection URI.
+        max_pool_size: Maximum number of connections per server.
+        min_pool_size: Minimum number of connections kept open per server.
+        connect_timeout_ms: Timeout in milliseconds to open a connection.
+        server_selection_timeout_ms: Timeout in milliseconds to find an available server.
+        wait_queue_timeout_ms: Timeout in milliseconds to wait for a free pooled connection.
+
+    Returns:
+        MongoClient: The shared client.
+    """
+
+    with _clients_lock:
+        client = _clients.get(mongodb_uri)
+        if client is not None:
+            return client
+
+        stats = PoolStats(max_pool_size=max_pool_size)
+
+        try:
+            client = MongoClient(
+                mongodb_uri,
+                appname="slack_integrations",
+                maxPoolSize=max_pool_size,
+                minPoolSize=min_pool_size,
+                connectTimeoutMS=connect_timeout_ms,
+                serverSelectionTimeoutMS=server_selection_timeout_ms,
+                waitQueueTimeoutMS=wait_queue_timeout_ms,
+                event_listeners=[PoolStatsListener(stats)],
+            )
+            client.admin.command("ping")
+
+        except Exception as e:
+            logger.error(f"Failed to create MongoDB client: {e}")
+            raise
+
+        _clients[mongodb_uri] = client
+        _pool_stats[mongodb_uri] = stats
+
+        logger.info(f"Created shared MongoDB client for {_redact(mongodb_uri)} (max pool size: {max_pool_size})")
+
+        return client
+
+
+def get_pool_stats() -> dict[str, dict]:
+    """Get the pool utilization of every shared client.
+
+    Returns:
+        dict[str, dict]: Pool counters keyed by the URI hosts, without credentials.
+    """
+
+    with _clients_lock:
+        return {_redact(uri): stats.to_metadata() for uri, stats in _pool_stats.items()}
+
+
+def close_mongo_clients() -> None:
+    """Close every shared client. Called automatically at interpreter exit."""
+
+    with _clients_lock:
+        for client in _clients.values():
+            client.close()
+
+        _clients.clear()
+        _pool_stats.clear()
+
+
+def _redact(mongodb_uri: str) -> str:
+    """Identify a URI by its scheme and hosts, dropping credentials and options."""
+
+    scheme, _, rest = mongodb_uri.partition("://")
+    hosts = rest.rsplit("@", 1)[-1].split("/", 1)[0].split("?", 1)[0]
+
+    return f"{scheme}://{hosts}"
+
+
+atexit.register(close_mongo_clients)
@@ -0,0 +1,176 @@
+from datetime import datetime, timezone
+
+from bson import ObjectId
+from langchain_core.documents import Document as LangChainDocument
+from loguru import logger
+
+from src.slack_integrations_offline.domain.dead_letter import DeadLetterBatch, DeadLetterChunk
+from src.slack_integrations_offline.infrastructure.mongodb.service import MongoDBService
+
+
+class DeadLetterQueue:
+    """Durable MongoDB-backed store for embedding batches that failed every retry.
+
+    Entries live in the ``<collection_name>_dead_letter`` collection so a later run can drain
+    them without reprocessing the whole corpus.
+
+    Attributes:
+        collection_name: Name of the dead-letter collection.
+        service: MongoDBService bound to the dead-letter collection.
+    """
+
+    def __init__(self, collection_name: str) -> None:
+        self.collection_name = f"{collection_name}_dead_letter"
+        self.service = MongoDBService(model=DeadLetterBatch, collection_name=self.collection_name)
+
+
+    def __enter__(self) -> "DeadLetterQueue":
+        """Enter context manager and return the queue instance.
+
+        Returns:
+            DeadLetterQueue: The queue instance for use in context.
+        """
+        return self
+
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Exit context manager and close the database connection."""
+        self.service.close()
+
+
+    def put(
+        self,
+        chunks: list[LangChainDocument],
+        tokens: int,
+        error: Exception,
+        attempts: int,
+    ) -> DeadLetterBatch:
+        """Persist a failed embedding batch.
+
+        Args:
+            chunks: Chunks of the failed request.
+            tokens: Number of tokens of the batch.
+            error: Last error raised for the batch.
+            attempts: Number of attempts made before giving up.
+
+        Returns:
+            DeadLetterBatch: The stored dead-letter entry.
+        """
+
+        entry = DeadLetterBatch(
+            chunks=[
+                DeadLetterChunk(text=chunk.page_content, metadata=chunk.metadata)
+                for chunk in chunks
+            ],
+            tokens=tokens,
+            error_class=type(error).__name__,
+            error_message=str(error),
+            attempts=attempts,
+        )
+        self.service.ingest_documents([entry])
+
+        logger.warning(
+            f"Dead-lettered batch of {len(chunks)} chunks after {attempts} attempts: "
+            f"{entry.error_class}: {entry.error_message}"
+        )
+
+        return entry
+
+
+    def entries(self) -> list[DeadLetterBatch]:
+        """Fetch every dead-letter entry, oldest first.
+
+        Returns:
+            list[DeadLetterBatch]: Stored dead-letter entries.
+        """
+
+        return list(self.service.iter_documents(sort=[("created_at", 1)]))
+
+
+    def ack(self, entry: DeadLetterBatch) -> None:
+        """Remove an entry once its chunks have been embedded and stored.
+
+        Args:
+            entry: Entry to remove.
+        """
+
+        self.service.collection.delete_one({"_id": ObjectId(entry.id)})
+
+
+    def fail(self, entry: DeadLetterBatch, error: Exception, attempts: int) -> None:
+        """Record another failed drain attempt for an entry.
+
+        Args:
+            entry: Entry that failed again.
+            error: Last error raised for the entry.
+            attempts: Number of attempts made during this run.
+        """
+
+        self.service.collection.update_one(
+            {"_id": ObjectId(entry.id)},
+            {
+                "$set": {
+                    "error_class": type(error).__name__,
+                    "error_message": str(error),
+                    "updated_at": datetime.now(timezone.utc),
+                },
+                "$inc": {"attempts": attempts},
+            },
+        )
+
+
+    def merge_duplicate_sources(self, duplicate_sources: dict[str, set[str]]) -> int:
+        """Add the URLs of dropped duplicates to the ``urls`` of the dead-lettered chunks they match.
+
+        A chunk kept by the deduplicator may have been dead-lettered, so it is not in the vector
+        store collection when the duplicate sources are merged. Its entry keeps them instead,
+        and draining it stores the chunk with every URL.
+
+        Args:
+            duplicate_sources: URLs of the dropped duplicates, keyed by the hash of the kept chunk.
+
+        Returns:
+            int: Number of dead-lettered chunks updated.
+        """
+
+        if not duplicate_sources:
+            return 0
+
+        merged = 0
+        for entry in self.entries():
+            matched = 0
+            for chunk in entry.chunks:
+                urls = duplicate_sources.get(chunk.metadata.get("chunk_hash"))
+                if urls:
+                    chunk.metadata["urls"] = list(
+                        dict.fromkeys([*chunk.metadata.get("urls", []), *sorted(urls)])
+                    )
+                    matched += 1
+
+            if matched:
+                self.service.collection.update_one(
+                    {"_id": ObjectId(entry.id)},
+                    {"$set": {"chunks": [chunk.model_dump() for chunk in entry.chunks]}},
+                )
+                merged += matched
+
+        if merged:
+            logger.info(f"Merged the source URLs of duplicates into {merged} dead-lettered chunks.")
+
+        return merged
+
+
+    def clear(self) -> None:
+        """Delete every dead-letter entry."""
+
+        self.service.clear_collection()
+
+
+    def count(self) -> int:
+        """Get the number of dead-letter entries.
+
+        Returns:
+            int: Number of stored entries.
+        """
+
+        return self.service.get_collection_count()
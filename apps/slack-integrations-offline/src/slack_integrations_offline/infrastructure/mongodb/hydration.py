@@ -0,0 +1,113 @@
+from functools import cache
+from typing import Generic, Type, TypeVar, get_args, get_origin
+
+from bson import ObjectId
+from bson.codec_options import CodecOptions, TypeDecoder, TypeRegistry
+from pydantic import BaseModel, TypeAdapter
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class ObjectIdAsStrDecoder(TypeDecoder):
+    """BSON type decoder turning every ObjectId into its hex string while decoding."""
+
+    bson_type = ObjectId
+
+    def transform_bson(self, value: ObjectId) -> str:
+        return str(value)
+
+
+OBJECT_ID_AS_STR_CODEC_OPTIONS = CodecOptions(type_registry=TypeRegistry([ObjectIdAsStrDecoder()]))
+
+
+class ModelHydrator(Generic[T]):
+    """Turn batches of decoded MongoDB documents into Pydantic models.
+
+    ObjectIds are expected to be converted by the BSON codec (see
+    ``OBJECT_ID_AS_STR_CODEC_OPTIONS``), so hydration only renames ``_id`` to ``id`` and then
+    either validates the whole batch with a single ``TypeAdapter(list[T])`` call or, for trusted
+    data written by this application, builds the models with ``model_construct``.
+
+    The batch validation runs in pydantic-core and is the fastest path on pydantic v2 (see
+    ``tools/benchmark_hydration.py``). The trusted path skips validation and coercion entirely,
+    which is useful for documents written by older versions of a model.
+
+    Attributes:
+        model: Pydantic model type to hydrate.
+        adapter: Type adapter validating a list of models in one call.
+    """
+
+    def __init__(self, model: Type[T]) -> None:
+        self.model = model
+        self.adapter = TypeAdapter(list[model])
+
+
+    def hydrate(self, documents: list[dict], trusted: bool = False) -> list[T]:
+        """Hydrate a batch of documents.
+
+        Args:
+            documents: Documents decoded with ObjectIds as strings. They are modified in place.
+            trusted: Whether to skip validation and build the models with ``model_construct``.
+
+        Returns:
+            list[T]: Hydrated models, in the order of the documents.
+        """
+
+        for doc in documents:
+            doc["id"] = doc.pop("_id", None)
+
+        if trusted:
+            return [construct_model(self.model, doc) for doc in documents]
+
+        return self.adapter.validate_python(documents)
+
+
+
+def construct_model(model: Type[T], data: dict) -> T:
+    """Build a model and its nested models without validation.
+
+    Unlike a bare ``model_construct``, fields annotated with a model or a list of models are
+    constructed recursively, so attribute access works like on validated models.
+
+    Args:
+        model: Pydantic model type to build.
+        data: Trusted field values.
+
+    Returns:
+        T: The constructed model.
+    """
+
+    values = dict(data)
+
+    for name, nested_model, is_list in _nested_model_fields(model):
+        value = values.get(name)
+
+        if is_list and isinstance(value, list):
+            values[name] = [
+                construct_model(nested_model, item) if isinstance(item, dict) else item
+                for item in value
+            ]
+
+        elif isinstance(value, dict):
+            values[name] = construct_model(nested_model, value)
+
+    return model.model_construct(**values)
+
+
+
+@cache
+def _nested_model_fields(model: Type[BaseModel]) -> tuple[tuple[str, Type[BaseModel], bool], ...]:
+    """List the fields of a model annotated with a model or a list of models."""
+
+    fields = []
+
+    for name, field in model.model_fields.items():
+        annotation, is_list = field.annotation, False
+
+        if get_origin(annotation) is list:
+            annotation, is_list = (get_args(annotation) or (None,))[0], True
+
+        if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+            fields.append((name, annotation, is_list))
+
+    return tuple(fields)
@@ -1,47 +1,345 @@
-from langchain_mongodb.index import create_fulltext_search_index
+import time
+from dataclasses import asdict, dataclass
+
+from loguru import logger
+from pymongo import ASCENDING, IndexModel
+from pymongo.collection import Collection
+from pymongo.operations import SearchIndexModel
 
 from src.slack_integrations_offline.infrastructure.mongodb.service import MongoDBService
+from src.slack_integrations_offline.rag.embedding_storage import EncodedEmbeddings
+
+
+@dataclass
+class IndexReport:
+    """Outcome of reconciling a single index.
+
+    Attributes:
+        collection: Name of the collection holding the index.
+        name: Name of the index.
+        kind: Index kind: "btree", "vectorSearch" or "search".
+        action: What reconciliation did: "created", "updated", "recreated" or "unchanged".
+        seconds: Time spent until the index was built and queryable.
+    """
+
+    collection: str
+    name: str
+    kind: str
+    action: str
+    seconds: float = 0.0
+
+
+    def to_metadata(self) -> dict:
+        """Serialize the report into a JSON friendly dictionary."""
+
+        return {**asdict(self), "seconds": round(self.seconds, 3)}
 
 
 class MongodbIndex:
-    """Manager for creating and configuring MongoDB vector search indexes.
-    
-    Handles creation of vector search indexes and optional full-text search indexes for hybrid retrieval.
-    
+    """Manager declaring and reconciling every index the RAG system relies on.
+
+    Declares the Atlas vector search index, the optional full-text search index used for hybrid
+    retrieval, and the B-tree indexes behind the URL, content hash and chunk ordinal lookups.
+    Reconciliation is idempotent: missing indexes are created, indexes whose definition changed
+    are updated or recreated, and matching ones are left untouched.
+
     Attributes:
         retriever: Retriever instance containing the vector store configuration.
         mongodb_client: MongoDBService instance for database operations.
+        raw_collection_name: Name of the collection holding the raw documents, if any.
+        timeout: Maximum number of seconds to wait for a search index to become queryable.
+        poll_interval: Seconds between two search index status checks.
     """
+
+    FILTER_FIELDS = ["url", "urls", "section"]
+
+    RAG_INDEXES = [
+        IndexModel([("url", ASCENDING), ("chunk_index", ASCENDING)]),
+        IndexModel([("urls", ASCENDING)]),
+        IndexModel([("chunk_hash", ASCENDING)]),
+    ]
+
+    RAW_INDEXES = [
+        IndexModel([("metadata.url", ASCENDING)]),
+    ]
+
     def __init__(
         self,
         retriever,
         mongodb_client: MongoDBService,
+        raw_collection_name: str | None = None,
+        timeout: float = 600.0,
+        poll_interval: float = 5.0,
     ) -> None:
         self.retriever = retriever
         self.mongodb_client = mongodb_client
+        self.raw_collection_name = raw_collection_name
+        self.timeout = timeout
+        self.poll_interval = poll_interval
 
 
     def create(
         self,
         embedding_dims: int,
         is_hybrid: bool = False,
-    ) -> None:
-        """Create vector search index and optionally full-text search index in MongoDB.
-    
+    ) -> list[IndexReport]:
+        """Create or update every index and wait until the search indexes are queryable.
+
+        Args:
+            embedding_dims: Dimensionality of the embedding model.
+            is_hybrid: Whether to create additional full-text search index for hybrid retrieval.
+
+        Returns:
+            list[IndexReport]: What was done for every index and how long it took.
+
+        Raises:
+            TimeoutError: If a search index is not queryable within ``timeout`` seconds.
+        """
+
+        return self.create_btree_indexes() + self.create_search_indexes(embedding_dims, is_hybrid)
+
+
+    def create_btree_indexes(self) -> list[IndexReport]:
+        """Create or update the B-tree indexes of the rag and raw collections.
+
+        They do not depend on the stored chunks, so they can be built on the empty collection
+        before loading, for the updates matching on ``chunk_hash`` during the load.
+
+        Returns:
+            list[IndexReport]: What was done for every index and how long it took.
+        """
+
+        reports = self.reconcile_btree_indexes(self.mongodb_client.collection, self.RAG_INDEXES)
+
+        if self.raw_collection_name:
+            reports += self.reconcile_btree_indexes(
+                self.mongodb_client.database[self.raw_collection_name], self.RAW_INDEXES
+            )
+
+        self._log(reports)
+
+        return reports
+
+
+    def create_search_indexes(
+        self,
+        embedding_dims: int,
+        is_hybrid: bool = False,
+    ) -> list[IndexReport]:
+        """Create or update the Atlas search indexes and wait until they are queryable.
+
+        The vector index declares ``url``, ``urls`` and ``section`` as filter fields, so searches
+        can be restricted to a page, including pages sharing a deduplicated chunk, or to a
+        markdown section. When the vector store stores truncated embeddings, the index declares
+        the stored dimensionality. Packed float32 and int8 binData vectors are detected by Atlas
+        from the stored field, so they use the same definition.
+
         Args:
-            embedding_dims: Dimensionality of the embedding vectors for the index.
+            embedding_dims: Dimensionality of the embedding model.
             is_hybrid: Whether to create additional full-text search index for hybrid retrieval.
+
+        Returns:
+            list[IndexReport]: What was done for every index and how long it took.
+
+        Raises:
+            TimeoutError: If a search index is not queryable within ``timeout`` seconds.
         """
-        
+
         vectorstore = self.retriever.vectorstore
+        collection = self.mongodb_client.collection
+
+        if isinstance(vectorstore.embeddings, EncodedEmbeddings):
+            embedding_dims = vectorstore.embeddings.codec.index_dimensions(embedding_dims)
 
-        vectorstore.create_vector_search_index(
-            dimensions=embedding_dims,
-        )
+        search_indexes = [
+            SearchIndexModel(
+                definition={
+                    "fields": [
+                        {
+                            "type": "vector",
+                            "path": vectorstore._embedding_key,
+                            "numDimensions": embedding_dims,
+                            "similarity": vectorstore._relevance_score_fn,
+                        },
+                        *({"type": "filter", "path": field} for field in self.FILTER_FIELDS),
+                    ]
+                },
+                name=vectorstore._index_name,
+                type="vectorSearch",
+            ),
+        ]
 
         if is_hybrid:
-            create_fulltext_search_index(
-                collection=self.mongodb_client.collection,
-                field=vectorstore._text_key,
-                index_name=self.retriever.search_index_name
-            )
\ No newline at end of file
+            search_indexes.append(
+                SearchIndexModel(
+                    definition={
+                        "mappings": {
+                            "dynamic": False,
+                            "fields": {vectorstore._text_key: [{"type": "string"}]},
+                        }
+                    },
+                    name=self.retriever.search_index_name,
+                    type="search",
+                )
+            )
+
+        reports = self.reconcile_search_indexes(collection, search_indexes)
+
+        self._log(reports)
+
+        return reports
+
+
+    def reconcile_btree_indexes(
+        self, collection: Collection, indexes: list[IndexModel],
+    ) -> list[IndexReport]:
+        """Create missing B-tree indexes and recreate the ones whose options changed.
+
+        Args:
+            collection: Collection holding the indexes.
+            indexes: Declared indexes, named after their keys by default.
+
+        Returns:
+            list[IndexReport]: What was done for every index.
+        """
+
+        existing = collection.index_information()
+        reports = []
+
+        for index in indexes:
+            document = index.document
+            name = document["name"]
+            kind = "btree"
+            start = time.perf_counter()
+
+            current = existing.get(name)
+            if current is not None and self._btree_matches(current, document):
+                reports.append(IndexReport(collection.name, name, kind, "unchanged"))
+                continue
+
+            if current is not None:
+                collection.drop_index(name)
+
+            collection.create_indexes([index])
+
+            reports.append(
+                IndexReport(
+                    collection.name,
+                    name,
+                    kind,
+                    "recreated" if current is not None else "created",
+                    time.perf_counter() - start,
+                )
+            )
+
+        return reports
+
+
+    def reconcile_search_indexes(
+        self, collection: Collection, indexes: list[SearchIndexModel],
+    ) -> list[IndexReport]:
+        """Create missing Atlas search indexes, update changed ones and wait until queryable.
+
+        Args:
+            collection: Collection holding the indexes.
+            indexes: Declared search and vector search indexes.
+
+        Returns:
+            list[IndexReport]: What was done for every index and how long its build took.
+        """
+
+        existing = {index["name"]: index for index in collection.list_search_indexes()}
+        pending = []
+
+        for index in indexes:
+            document = index.document
+            name, definition = document["name"], document["definition"]
+            kind = document.get("type", "search")
+            start = time.perf_counter()
+
+            current = existing.get(name)
+            if current is None:
+                collection.create_search_index(index)
+                action = "created"
+
+            elif not self._matches(current.get("latestDefinition", {}), definition):
+                collection.update_search_index(name, definition)
+                action = "updated"
+
+            else:
+                action = "unchanged"
+
+            pending.append((IndexReport(collection.name, name, kind, action), start))
+
+        reports = []
+        for report, start in pending:
+            self._wait_until_queryable(collection, report.name)
+            report.seconds = time.perf_counter() - start
+            reports.append(report)
+
+        return reports
+
+
+    def _wait_until_queryable(self, collection: Collection, name: str) -> None:
+        """Poll a search index until its latest definition is built and queryable."""
+
+        deadline = time.monotonic() + self.timeout
+
+        while True:
+            status = next(iter(collection.list_search_indexes(name)), {})
+            if status.get("queryable") and status.get("status") == "READY":
+                return
+
+            if time.monotonic() > deadline:
+                raise TimeoutError(
+                    f"Search index '{name}' not queryable after {self.timeout}s "
+                    f"(status: {status.get('status')})"
+                )
+
+            time.sleep(self.poll_interval)
+
+
+    @staticmethod
+    def _log(reports: list[IndexReport]) -> None:
+        """Log what reconciliation did for every index."""
+
+        for report in reports:
+            logger.info(
+                f"Index '{report.collection}.{report.name}' ({report.kind}) {report.action} "
+                f"in {report.seconds:.1f}s"
+            )
+
+
+    @staticmethod
+    def _btree_matches(current: dict, declared: dict) -> bool:
+        """Check whether an existing B-tree index has the declared keys and options."""
+
+        if list(current.get("key", [])) != list(declared["key"].items()):
+            return False
+
+        options = {key: value for key, value in declared.items() if key not in ("key", "name")}
+
+        return all(current.get(key) == value for key, value in options.items())
+
+
+    @classmethod
+    def _matches(cls, current: object, declared: object) -> bool:
+        """Check whether a server-side definition contains every declared setting.
+
+        Atlas adds defaults to stored definitions, so only the declared keys are compared and
+        lists are compared as unordered collections.
+        """
+
+        if isinstance(declared, dict):
+            return isinstance(current, dict) and all(
+                cls._matches(current.get(key), value) for key, value in declared.items()
+            )
+
+        if isinstance(declared, list):
+            return (
+                isinstance(current, list)
+                and len(current) == len(declared)
+                and all(any(cls._matches(item, value) for item in current) for value in declared)
+            )
+
+        return current == declared
@@ -1,15 +1,58 @@
 
-from typing import Generic, Type, TypeVar
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Generic, Iterable, Iterator, Type, TypeVar
+
+import bson
 from bson import ObjectId
 
 from loguru import logger
 from pydantic import BaseModel
-from pymongo import MongoClient, errors
+from pymongo import ReplaceOne, ReturnDocument, errors
 
 from src.slack_integrations_offline.config import settings
+from src.slack_integrations_offline.infrastructure.mongodb.client import get_mongo_client
+from src.slack_integrations_offline.infrastructure.mongodb.hydration import (
+    OBJECT_ID_AS_STR_CODEC_OPTIONS,
+    ModelHydrator,
+)
 
 T = TypeVar("T", bound=BaseModel)
 
+MAX_BULK_BATCH_BYTES = 16 * 1024 * 1024
+
+VERSIONS_COLLECTION_NAME = "collection_versions"
+
+
+@dataclass
+class BulkChunkResult:
+    """Outcome of a single bulk write chunk.
+
+    Attributes:
+        chunk: Index of the chunk in the ingested stream.
+        documents: Number of documents sent in the chunk.
+        inserted: Number of documents inserted.
+        upserted: Number of documents inserted by an upsert.
+        modified: Number of existing documents replaced by an upsert.
+        errors: Number of documents rejected by the server.
+        seconds: Wall time of the write.
+    """
+
+    chunk: int
+    documents: int
+    inserted: int = 0
+    upserted: int = 0
+    modified: int = 0
+    errors: int = 0
+    seconds: float = 0.0
+
+
+    def to_metadata(self) -> dict:
+        """Serialize the result into a JSON friendly dictionary."""
+
+        return {**asdict(self), "seconds": round(self.seconds, 3)}
+
 
 class MongoDBService(Generic[T]):
     """Generic service for MongoDB operations with Pydantic model support.
@@ -21,9 +64,10 @@ class MongoDBService(Generic[T]):
         collection_name: Name of the MongoDB collection.
         database_name: Name of the MongoDB database.
         mongodb_uri: MongoDB connection URI.
-        client: MongoClient instance for database connection.
+        client: Process-wide MongoClient shared by every service using the same URI.
         database: MongoDB database instance.
         collection: MongoDB collection instance.
+        hydrator: Hydrator turning decoded documents into model instances.
     """
 
     def __init__(
@@ -40,8 +84,7 @@ class MongoDBService(Generic[T]):
         self.mongodb_uri = mongodb_uri
 
         try: 
-            self.client = MongoClient(mongodb_uri, appname="slack_integrations")
-            self.client.admin.command("ping")
+            self.client = get_mongo_client(mongodb_uri)
 
         except Exception as e:
             logger.error(f"Failed to initialize MongoDBService: {e}")
@@ -49,6 +92,10 @@ class MongoDBService(Generic[T]):
 
         self.database = self.client[database_name]
         self.collection = self.database[collection_name]
+        self.hydrator = ModelHydrator(model)
+        self._hydration_collection = self.collection.with_options(
+            codec_options=OBJECT_ID_AS_STR_CODEC_OPTIONS
+        )
 
         logger.info(
             f"Connected to MongoDB instance:\n URI: {mongodb_uri}\n Database: {database_name}\n Collection: {collection_name}"
@@ -65,7 +112,7 @@ class MongoDBService(Generic[T]):
     
 
     def __exit__(self, exc_type, exc_val, exc_tb) -> None:
-        """Exit context manager and close database connection.
+        """Exit context manager and release the service.
     
         Args:
             exc_type: Exception type if an exception occurred.
@@ -127,6 +174,144 @@ class MongoDBService(Generic[T]):
             raise
 
 
+    def bulk_ingest(
+        self,
+        documents: Iterable[T | dict],
+        upsert_key: str | None = None,
+        max_batch_bytes: int = MAX_BULK_BATCH_BYTES,
+        max_batch_size: int = 1000,
+        writers: int = 1,
+    ) -> list[BulkChunkResult]:
+        """Stream documents into the collection in size-bounded, unordered bulk writes.
+
+        Documents are consumed lazily and grouped into chunks bounded by their BSON size and
+        count, so the full corpus is never materialized and no write exceeds the server batch
+        limit. Writes are unordered, so a rejected document does not abort the rest of its chunk,
+        and up to ``writers`` chunks are written in parallel.
+
+        Args:
+            documents: Iterable of Pydantic models or raw dictionaries to write.
+            upsert_key: Dotted field path identifying a document. When set, every document
+                replaces the one with the same key, or is inserted if none exists.
+            max_batch_bytes: Maximum BSON size of a chunk.
+            max_batch_size: Maximum number of documents in a chunk.
+            writers: Number of chunks written concurrently.
+
+        Returns:
+            list[BulkChunkResult]: Insert, upsert and error counts of every chunk, in order.
+
+        Raises:
+            errors.PyMongoError: If a write fails for a reason other than rejected documents.
+        """
+
+        results: list[BulkChunkResult] = []
+        pending: list[Future] = []
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, writers), thread_name_prefix=f"{self.collection_name}-writer"
+        ) as executor:
+            for index, chunk in enumerate(
+                self._chunk_documents(documents, max_batch_bytes, max_batch_size)
+            ):
+                pending.append(executor.submit(self._write_chunk, index, chunk, upsert_key))
+
+                if len(pending) >= 2 * max(1, writers):
+                    results.append(pending.pop(0).result())
+
+            results.extend(future.result() for future in pending)
+
+        logger.debug(
+            f"Bulk ingested {sum(result.documents for result in results)} documents in "
+            f"{len(results)} chunks: {sum(result.inserted for result in results)} inserted, "
+            f"{sum(result.upserted for result in results)} upserted, "
+            f"{sum(result.errors for result in results)} errors."
+        )
+
+        return results
+
+
+    def _chunk_documents(
+        self, documents: Iterable[T | dict], max_batch_bytes: int, max_batch_size: int,
+    ) -> Iterator[list[dict]]:
+        """Group documents into lists bounded by BSON size and count."""
+
+        chunk: list[dict] = []
+        chunk_bytes = 0
+
+        for document in documents:
+            if isinstance(document, BaseModel):
+                document = document.model_dump()
+                document.pop("_id", None)
+
+            size = len(bson.encode(document))
+
+            if chunk and (chunk_bytes + size > max_batch_bytes or len(chunk) >= max_batch_size):
+                yield chunk
+                chunk, chunk_bytes = [], 0
+
+            chunk.append(document)
+            chunk_bytes += size
+
+        if chunk:
+            yield chunk
+
+
+    def _write_chunk(
+        self, index: int, chunk: list[dict], upsert_key: str | None,
+    ) -> BulkChunkResult:
+        """Write a single chunk with an unordered bulk write."""
+
+        result = BulkChunkResult(chunk=index, documents=len(chunk))
+        start = time.perf_counter()
+
+        try:
+            if upsert_key:
+                write = self.collection.bulk_write(
+                    [
+                        ReplaceOne({upsert_key: self._get_field(doc, upsert_key)}, doc, upsert=True)
+                        for doc in chunk
+                    ],
+                    ordered=False,
+                )
+                result.upserted = write.upserted_count
+                result.modified = write.modified_count
+
+            else:
+                write = self.collection.insert_many(chunk, ordered=False)
+                result.inserted = len(write.inserted_ids)
+
+        except errors.BulkWriteError as e:
+            details = e.details
+            result.inserted = details.get("nInserted", 0)
+            result.upserted = details.get("nUpserted", 0)
+            result.modified = details.get("nModified", 0)
+            result.errors = len(details.get("writeErrors", []))
+
+            logger.warning(
+                f"Bulk write chunk {index} rejected {result.errors}/{len(chunk)} documents: "
+                f"{details.get('writeErrors', [{}])[0].get('errmsg', e)}"
+            )
+
+        except errors.PyMongoError as e:
+            logger.error(f"Error writing bulk chunk {index}: {e}")
+            raise
+
+        result.seconds = time.perf_counter() - start
+
+        return result
+
+
+    @staticmethod
+    def _get_field(document: dict, path: str) -> Any:
+        """Get the value of a dotted field path in a document."""
+
+        value: Any = document
+        for key in path.split("."):
+            value = value.get(key) if isinstance(value, dict) else None
+
+        return value
+
+
     def fetch_documents(self, limit: int | None = None, query: dict = None) -> list[T]:
         """Fetch documents from collection and parse them into Pydantic models.
     
@@ -139,40 +324,88 @@ class MongoDBService(Generic[T]):
         """
         
         try:
-            documents = list(self.collection.find(query).limit(limit or 0))
+            documents = list(self._hydration_collection.find(query).limit(limit or 0))
             logger.debug(f"Fetched {len(documents)} documents with query: {query}")
 
-            return self.__parsed_documents(documents)
+            return self.hydrator.hydrate(documents)
         
         except Exception as e:
             logger.error(f"Error fetching documents: {e}")
             raise
 
     
-    def __parsed_documents(self, documents: list[dict]) -> list[T]:
-        """Parse raw MongoDB documents into validated Pydantic model instances.
-    
+    def iter_documents(
+        self,
+        query: dict | None = None,
+        projection: dict | list[str] | None = None,
+        sort: list[tuple[str, int]] | None = None,
+        batch_size: int = 1000,
+        after_id: str | ObjectId | None = None,
+        until_id: str | ObjectId | None = None,
+        limit: int = 0,
+        raw: bool = False,
+        validate: bool = True,
+    ) -> Iterator[T | dict]:
+        """Stream documents from the collection through a server-side cursor.
+
+        Documents are fetched and hydrated ``batch_size`` at a time, so memory usage does not
+        grow with the collection. Scans can be resumed from the ``_id`` of the last
+        document seen: without an explicit ``sort``, documents are returned in ``_id`` order.
+
         Args:
-            documents: List of raw MongoDB document dictionaries.
-        
-        Returns:
-            list[T]: List of validated Pydantic model instances.
+            query: MongoDB query filter dictionary. Defaults to all documents.
+            projection: Fields to return, as a MongoDB projection or a list of field names.
+            sort: List of (field, direction) pairs. Defaults to ascending ``_id``.
+            batch_size: Number of documents fetched per cursor round trip.
+            after_id: Only return documents with an ``_id`` greater than this one.
+            until_id: Only return documents with an ``_id`` lower than or equal to this one.
+            limit: Maximum number of documents to return. 0 for no limit.
+            raw: Whether to yield the raw MongoDB dictionaries instead of models.
+            validate: Whether to validate the models. When False, trusted documents written by
+                this application are built with ``model_construct``, skipping validation.
+
+        Yields:
+            T | dict: Parsed models, or raw dictionaries if ``raw`` is set.
         """
-        
-        parsed_documents = []
-        for doc in documents:
-            for key, value in doc.items():
-                if isinstance(value, ObjectId):
-                    doc[key] = str(value)
 
-            _id = doc.pop("_id", None)
-            doc["id"] = _id
+        id_range = {}
+        if after_id is not None:
+            id_range["$gt"] = ObjectId(after_id)
+        if until_id is not None:
+            id_range["$lte"] = ObjectId(until_id)
+
+        query = dict(query or {})
+        if id_range:
+            query = {"$and": [query, {"_id": id_range}]} if "_id" in query else {**query, "_id": id_range}
+
+        collection = self.collection if raw else self._hydration_collection
+        cursor = collection.find(query, projection=projection).sort(
+            sort or [("_id", 1)]
+        ).batch_size(batch_size).limit(limit)
+
+        try:
+            if raw:
+                yield from cursor
+                return
+
+            batch = []
+            for doc in cursor:
+                batch.append(doc)
+
+                if len(batch) >= batch_size:
+                    yield from self.hydrator.hydrate(batch, trusted=not validate)
+                    batch = []
+
+            if batch:
+                yield from self.hydrator.hydrate(batch, trusted=not validate)
+
+        except errors.PyMongoError as e:
+            logger.error(f"Error iterating documents: {e}")
+            raise
+
+        finally:
+            cursor.close()
 
-            parsed_doc = self.model.model_validate(doc)
-            parsed_documents.append(parsed_doc)
-        
-        return parsed_documents
-    
 
     def get_collection_count(self) -> int:
         """Get the total count of documents in the collection.
@@ -192,8 +425,40 @@ class MongoDBService(Generic[T]):
             raise
 
         
+    def bump_version(self) -> int:
+        """Increment the content version of the collection after its documents changed.
+
+        Versions live in the ``collection_versions`` collection, one document per collection.
+        The online app compares them to invalidate the caches built from this collection.
+
+        Returns:
+            int: The new version of the collection.
+
+        Raises:
+            errors.PyMongoError: If the update fails.
+        """
+
+        try:
+            version = self.database[VERSIONS_COLLECTION_NAME].find_one_and_update(
+                {"_id": self.collection_name},
+                {"$inc": {"version": 1}, "$currentDate": {"updated_at": True}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER,
+            )["version"]
+
+            logger.info(f"Collection '{self.collection_name}' is now at version {version}")
+            return version
+
+        except errors.PyMongoError as e:
+            logger.error(f"Error bumping the version of '{self.collection_name}': {e}")
+            raise
+
+
     def close(self) -> None:
-        """Close the MongoDB client connection."""
+        """Release the service.
+
+        The client is shared by the whole process and stays open, so other services keep their
+        pooled connections. Shared clients are closed at interpreter exit.
+        """
         
-        self.client.close()
-        logger.debug("Closed MongoDB connection.")
+        logger.debug(f"Released MongoDB service for collection '{self.collection_name}'.")
@@ -0,0 +1,209 @@
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator
+
+import tiktoken
+from langchain_core.documents import Document as LangChainDocument
+from loguru import logger
+
+from src.slack_integrations_offline.rag.splitters import TOKEN_COUNT_KEY
+
+
+class TokenBudgetBatcher:
+    """Pack chunks into embedding requests bounded by a token budget.
+
+    Chunks are measured with the tokenizer of the embedding model, or by the ``token_count``
+    metadata set by the splitter workers, and appended to the current request until adding the
+    next chunk would exceed ``max_tokens`` or ``max_inputs``.
+
+    Attributes:
+        max_tokens: Maximum number of tokens sent in a single embedding request.
+        max_inputs: Maximum number of inputs sent in a single embedding request.
+        encoding: Tiktoken encoding used to measure the chunks.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        max_inputs: int = 2048,
+        encoding_name: str = "cl100k_base",
+    ) -> None:
+        self.max_tokens = max_tokens
+        self.max_inputs = max_inputs
+        self.encoding = tiktoken.get_encoding(encoding_name)
+
+
+    def count_tokens(self, text: str) -> int:
+        """Count the tokens of a text with the batcher encoding.
+
+        Args:
+            text: Text to measure.
+
+        Returns:
+            int: Number of tokens in the text.
+        """
+
+        return len(self.encoding.encode(text, disallowed_special=()))
+
+
+    def chunk_tokens(self, chunk: LangChainDocument) -> int:
+        """Count the tokens of a chunk, reusing the count measured by the splitter workers.
+
+        Args:
+            chunk: Chunk to measure.
+
+        Returns:
+            int: Number of tokens in the chunk content.
+        """
+
+        tokens = chunk.metadata.get(TOKEN_COUNT_KEY)
+
+        return tokens if tokens is not None else self.count_tokens(chunk.page_content)
+
+
+    def __call__(
+        self, chunks: Iterable[LangChainDocument],
+    ) -> Iterator[tuple[list[LangChainDocument], int]]:
+        """Group chunks into batches that fit the per-request token budget.
+
+        A single chunk larger than the budget is emitted alone.
+
+        Args:
+            chunks: Iterable of chunks to pack.
+
+        Yields:
+            tuple[list[LangChainDocument], int]: A batch of chunks and its total token count.
+        """
+
+        batch: list[LangChainDocument] = []
+        batch_tokens = 0
+
+        for chunk in chunks:
+            tokens = self.chunk_tokens(chunk)
+
+            if batch and (
+                batch_tokens + tokens > self.max_tokens or len(batch) >= self.max_inputs
+            ):
+                yield batch, batch_tokens
+                batch, batch_tokens = [], 0
+
+            batch.append(chunk)
+            batch_tokens += tokens
+
+        if batch:
+            yield batch, batch_tokens
+
+
+class TokenRateLimiter:
+    """Thread-safe token bucket limiting the tokens sent per minute.
+
+    Attributes:
+        tokens_per_minute: Maximum sustained number of tokens per minute.
+    """
+
+    def __init__(self, tokens_per_minute: int) -> None:
+        self.tokens_per_minute = tokens_per_minute
+
+        self._rate = tokens_per_minute / 60.0
+        self._available = float(tokens_per_minute)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+
+    def acquire(self, tokens: int) -> float:
+        """Block until ``tokens`` can be spent without exceeding the rate limit.
+
+        Args:
+            tokens: Number of tokens about to be sent.
+
+        Returns:
+            float: Number of seconds spent waiting.
+        """
+
+        tokens = min(tokens, self.tokens_per_minute)
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._available = min(
+                    float(self.tokens_per_minute),
+                    self._available + (now - self._updated_at) * self._rate,
+                )
+                self._updated_at = now
+
+                if self._available >= tokens:
+                    self._available -= tokens
+                    return waited
+
+                wait_seconds = (tokens - self._available) / self._rate
+
+            logger.debug(f"Token rate limit reached, waiting {wait_seconds:.2f}s")
+            time.sleep(wait_seconds)
+            waited += wait_seconds
+
+
+@dataclass
+class EmbeddingUsage:
+    """Thread-safe counters describing the embedding requests of a run.
+
+    Attributes:
+        requests: Number of successful embedding requests.
+        tokens: Number of tokens embedded.
+        chunks: Number of chunks embedded.
+        retried_chunks: Number of embedded chunks that needed more than one attempt.
+        failed_chunks: Number of chunks that failed every attempt and were dead-lettered.
+        throttled_seconds: Total time spent waiting on the rate limiter.
+    """
+
+    requests: int = 0
+    tokens: int = 0
+    chunks: int = 0
+    retried_chunks: int = 0
+    failed_chunks: int = 0
+    throttled_seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+
+    def record(
+        self, tokens: int, chunks: int, throttled_seconds: float = 0.0, attempts: int = 1,
+    ) -> None:
+        """Record a completed embedding request."""
+
+        with self._lock:
+            self.requests += 1
+            self.tokens += tokens
+            self.chunks += chunks
+            self.throttled_seconds += throttled_seconds
+            if attempts > 1:
+                self.retried_chunks += chunks
+
+
+    def record_failure(self, chunks: int) -> None:
+        """Record an embedding request that failed every attempt."""
+
+        with self._lock:
+            self.failed_chunks += chunks
+
+
+    def to_metadata(self, seconds: float) -> dict:
+        """Serialize the counters into a JSON friendly dictionary.
+
+        Args:
+            seconds: Wall time of the embedding stage, used to compute the rate.
+
+        Returns:
+            dict: Usage counters and chunks embedded per second.
+        """
+
+        return {
+            "requests": self.requests,
+            "tokens": self.tokens,
+            "chunks": self.chunks,
+            "retried_chunks": self.retried_chunks,
+            "failed_chunks": self.failed_chunks,
+            "avg_tokens_per_request": round(self.tokens / self.requests, 1) if self.requests else 0.0,
+            "throttled_seconds": round(self.throttled_seconds, 3),
+            "chunks_per_second": round(self.chunks / seconds, 3) if seconds else 0.0,
+        }
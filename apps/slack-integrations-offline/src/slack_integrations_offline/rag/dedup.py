@@ -0,0 +1,244 @@
+import hashlib
+import re
+import threading
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Callable, Iterable, Iterator
+
+import numpy as np
+from langchain_core.documents import Document as LangChainDocument
+
+
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+@dataclass
+class DedupStats:
+    """Counters describing the chunks removed by the deduplicator.
+
+    Attributes:
+        chunks_in: Number of chunks received.
+        unique_chunks: Number of chunks forwarded to the embedding stage.
+        exact_duplicates: Number of chunks dropped because of an identical normalized text.
+        near_duplicates: Number of chunks dropped because of a MinHash near-duplicate.
+        characters_saved: Number of characters not embedded nor stored.
+        tokens_saved: Number of tokens not sent to the embedding model.
+    """
+
+    chunks_in: int = 0
+    unique_chunks: int = 0
+    exact_duplicates: int = 0
+    near_duplicates: int = 0
+    characters_saved: int = 0
+    tokens_saved: int = 0
+
+
+    def to_metadata(self) -> dict:
+        """Serialize the counters into a JSON friendly dictionary.
+
+        Returns:
+            dict: Dedup counters and the share of chunks saved.
+        """
+
+        duplicates = self.exact_duplicates + self.near_duplicates
+
+        return {
+            "chunks_in": self.chunks_in,
+            "unique_chunks": self.unique_chunks,
+            "exact_duplicates": self.exact_duplicates,
+            "near_duplicates": self.near_duplicates,
+            "characters_saved": self.characters_saved,
+            "tokens_saved": self.tokens_saved,
+            "saved_ratio": round(duplicates / self.chunks_in, 4) if self.chunks_in else 0.0,
+        }
+
+
+class ChunkDeduplicator:
+    """Drop exact and near-duplicate chunks before they are embedded.
+
+    Exact duplicates are detected with a SHA-256 of the whitespace-normalized, lowercased text.
+    Near duplicates are detected with MinHash signatures over word shingles, indexed with
+    locality-sensitive hashing: signatures are split into ``bands`` bands and chunks sharing a band
+    are compared on their estimated Jaccard similarity.
+
+    The first occurrence of a chunk is forwarded with ``chunk_hash`` and ``urls`` metadata. The
+    URLs of its duplicates are collected in ``duplicate_sources``, keyed by the hash of the kept
+    chunk, so they can be merged into the stored chunk once it is inserted.
+
+    Attributes:
+        threshold: Minimum estimated Jaccard similarity for two chunks to be near duplicates.
+            0 disables near-duplicate detection.
+        num_perm: Number of MinHash permutations.
+        bands: Number of LSH bands. ``num_perm`` must be a multiple of it.
+        shingle_size: Number of words per shingle.
+        count_tokens: Optional callable measuring the tokens saved, given a chunk.
+        stats: Counters of the chunks seen and dropped.
+        duplicate_sources: URLs of the dropped duplicates, keyed by the hash of the kept chunk.
+    """
+
+    def __init__(
+        self,
+        threshold: float = 0.85,
+        num_perm: int = 128,
+        bands: int = 16,
+        shingle_size: int = 5,
+        count_tokens: Callable[[LangChainDocument], int] | None = None,
+        seed: int = 42,
+    ) -> None:
+        if num_perm % bands:
+            raise ValueError(f"num_perm ({num_perm}) must be a multiple of bands ({bands}).")
+
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.shingle_size = shingle_size
+        self.count_tokens = count_tokens
+
+        self.stats = DedupStats()
+        self.duplicate_sources: dict[str, set[str]] = defaultdict(set)
+
+        generator = np.random.default_rng(seed)
+        self._a = generator.integers(1, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+        self._b = generator.integers(0, _MERSENNE_PRIME, size=num_perm, dtype=np.uint64)
+
+        self._rows = num_perm // bands
+        self._hashes: set[str] = set()
+        self._signatures: dict[str, np.ndarray] = {}
+        self._buckets: list[dict[bytes, list[str]]] = [defaultdict(list) for _ in range(bands)]
+        self._lock = threading.Lock()
+
+
+    def __call__(self, chunks: Iterable[LangChainDocument]) -> Iterator[LangChainDocument]:
+        """Forward the first occurrence of every chunk and drop its duplicates.
+
+        Args:
+            chunks: Iterable of chunks to deduplicate.
+
+        Yields:
+            LangChainDocument: Unique chunks, with ``chunk_hash`` and ``urls`` metadata.
+        """
+
+        for chunk in chunks:
+            normalized = self.normalize(chunk.page_content)
+            chunk_hash = hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+            url = chunk.metadata.get("url")
+
+            signature = self.signature(normalized) if self.threshold else None
+
+            with self._lock:
+                self.stats.chunks_in += 1
+                kept_hash = self._find_duplicate(chunk_hash, signature)
+
+                if kept_hash is None:
+                    self._add(chunk_hash, signature)
+                    self.stats.unique_chunks += 1
+
+                elif kept_hash == chunk_hash:
+                    self.stats.exact_duplicates += 1
+
+                else:
+                    self.stats.near_duplicates += 1
+
+                if kept_hash is not None:
+                    self.stats.characters_saved += len(chunk.page_content)
+                    if url:
+                        self.duplicate_sources[kept_hash].add(url)
+
+            if kept_hash is not None:
+                if self.count_tokens is not None:
+                    tokens = self.count_tokens(chunk)
+                    with self._lock:
+                        self.stats.tokens_saved += tokens
+                continue
+
+            chunk.metadata["chunk_hash"] = chunk_hash
+            chunk.metadata["urls"] = [url] if url else []
+
+            yield chunk
+
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Lowercase a text and collapse its whitespace."""
+
+        return WHITESPACE_PATTERN.sub(" ", text).strip().lower()
+
+
+    def signature(self, normalized: str) -> np.ndarray:
+        """Compute the MinHash signature of a normalized text.
+
+        Args:
+            normalized: Text returned by ``normalize``.
+
+        Returns:
+            np.ndarray: Signature of ``num_perm`` 32-bit values.
+        """
+
+        words = normalized.split(" ")
+        shingles = {
+            " ".join(words[i:i + self.shingle_size])
+            for i in range(max(1, len(words) - self.shingle_size + 1))
+        }
+
+        hashes = np.array(
+            [
+                int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=4).digest(), "little")
+                for shingle in shingles
+            ],
+            dtype=np.uint64,
+        )
+
+        permuted = np.bitwise_and(
+            (np.outer(hashes, self._a) + self._b) % _MERSENNE_PRIME, _MAX_HASH
+        )
+
+        return permuted.min(axis=0)
+
+
+    def _find_duplicate(self, chunk_hash: str, signature: np.ndarray | None) -> str | None:
+        """Get the hash of the kept chunk duplicated by a chunk, if any."""
+
+        if chunk_hash in self._hashes:
+            return chunk_hash
+
+        if signature is None:
+            return None
+
+        candidates = {
+            candidate
+            for band, key in enumerate(self._band_keys(signature))
+            for candidate in self._buckets[band].get(key, ())
+        }
+
+        best_hash, best_similarity = None, self.threshold
+        for candidate in candidates:
+            similarity = float(np.mean(self._signatures[candidate] == signature))
+            if similarity >= best_similarity:
+                best_hash, best_similarity = candidate, similarity
+
+        return best_hash
+
+
+    def _add(self, chunk_hash: str, signature: np.ndarray | None) -> None:
+        """Index a kept chunk."""
+
+        self._hashes.add(chunk_hash)
+
+        if signature is None:
+            return
+
+        self._signatures[chunk_hash] = signature
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band][key].append(chunk_hash)
+
+
+    def _band_keys(self, signature: np.ndarray) -> list[bytes]:
+        """Split a signature into one hashable key per LSH band."""
+
+        return [
+            signature[band * self._rows:(band + 1) * self._rows].tobytes()
+            for band in range(self.bands)
+        ]
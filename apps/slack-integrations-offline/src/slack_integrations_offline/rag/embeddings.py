@@ -1,16 +1,74 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from langchain_core.embeddings import Embeddings
 from langchain_openai import OpenAIEmbeddings
 
 from src.slack_integrations_offline.config import settings
 
 
+EmbeddingProvider = Callable[[str], Embeddings]
+
+EMBEDDING_PROVIDERS: dict[str, EmbeddingProvider] = {}
+
+DEFAULT_EMBEDDING_PROVIDER = "openai"
+
+
+def register_embedding_provider(name: str) -> Callable[[EmbeddingProvider], EmbeddingProvider]:
+    """Register a factory building an embedding model from a model name.
+
+    Args:
+        name: Provider prefix used in embedding model ids, as in "<name>:<model>".
+
+    Returns:
+        Callable: Decorator registering the factory.
+    """
+
+    def decorator(factory: EmbeddingProvider) -> EmbeddingProvider:
+        EMBEDDING_PROVIDERS[name] = factory
+        return factory
+
+    return decorator
+
+
+def get_embedding_model(model_id: str) -> Embeddings:
+    """Create the embedding model identified by a "<provider>:<model>" id.
+
+    Ids without a provider prefix, such as "text-embedding-3-small", use the OpenAI provider.
+
+    Args:
+        model_id: Identifier of the embedding model, e.g. "openai:text-embedding-3-small" or
+            "local:sentence-transformers/all-MiniLM-L6-v2".
+
+    Returns:
+        Embeddings: Configured embedding model instance.
+
+    Raises:
+        ValueError: If the provider is not registered.
+    """
+
+    provider, separator, model_name = model_id.partition(":")
+    if not separator:
+        provider, model_name = DEFAULT_EMBEDDING_PROVIDER, model_id
+
+    if provider not in EMBEDDING_PROVIDERS:
+        raise ValueError(
+            f"Unknown embedding provider: {provider}. "
+            f"Expected one of {', '.join(sorted(EMBEDDING_PROVIDERS))}."
+        )
+
+    return EMBEDDING_PROVIDERS[provider](model_name)
+
+
+@register_embedding_provider("openai")
 def get_openai_embedding_model(
     model_id: str
 ) -> OpenAIEmbeddings:
     """Create and configure an OpenAI embeddings model instance.
-    
+
     Args:
         model_id: Identifier for the OpenAI embedding model to use.
-    
+
     Returns:
         OpenAIEmbeddings: Configured OpenAI embeddings model instance.
     """
@@ -18,4 +76,91 @@ def get_openai_embedding_model(
         api_key=settings.OPENAI_API_KEY,
         model=model_id,
         allowed_special={"<|endoftext|>"},
-    )
\ No newline at end of file
+    )
+
+
+@register_embedding_provider("local")
+def get_local_embedding_model(model_id: str) -> "LocalEmbeddings":
+    """Create a sentence-transformers model running on the local CPU with PyTorch."""
+
+    return LocalEmbeddings(model_name=model_id, backend="torch")
+
+
+@register_embedding_provider("onnx")
+def get_onnx_embedding_model(model_id: str) -> "LocalEmbeddings":
+    """Create a sentence-transformers model running on the local CPU with ONNX Runtime."""
+
+    return LocalEmbeddings(model_name=model_id, backend="onnx")
+
+
+class LocalEmbeddings(Embeddings):
+    """Sentence-transformers embedding model running on the local CPU.
+
+    Texts are encoded in batches, and the batches are fanned out over a thread pool. PyTorch and
+    ONNX Runtime release the GIL during inference, so the batches run in parallel. Embeddings are
+    L2-normalized, so they can be compared with the dot product like the OpenAI embeddings.
+
+    Requires the optional ``local`` dependencies: ``uv sync --extra local``.
+
+    Attributes:
+        model_name: Hugging Face id or local path of the sentence-transformers model.
+        backend: Inference backend: "torch" or "onnx".
+        batch_size: Number of texts encoded per forward pass.
+        max_workers: Number of batches encoded concurrently.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        backend: str = "torch",
+        batch_size: int = 64,
+        max_workers: int = 4,
+    ) -> None:
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "Local embeddings require sentence-transformers. "
+                "Install the optional dependencies with `uv sync --extra local`."
+            ) from e
+
+        self.model_name = model_name
+        self.backend = backend
+        self.batch_size = batch_size
+        self.max_workers = max_workers
+
+        self.model = SentenceTransformer(model_name, device="cpu", backend=backend)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="local-embeddings"
+        )
+
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+
+        if len(batches) <= 1:
+            return [embedding for batch in batches for embedding in self._encode(batch)]
+
+        return [
+            embedding
+            for batch_embeddings in self._executor.map(self._encode, batches)
+            for embedding in batch_embeddings
+        ]
+
+
+    def embed_query(self, text: str) -> list[float]:
+        return self._encode([text])[0]
+
+
+    def _encode(self, texts: list[str]) -> list[list[float]]:
+        """Encode a single batch of texts into normalized embeddings."""
+
+        embeddings = self.model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+
+        return embeddings.tolist()
@@ -1,47 +1,59 @@
-from langchain_openai import OpenAIEmbeddings
+from langchain_core.embeddings import Embeddings
 
 from langchain_mongodb import MongoDBAtlasVectorSearch
 from langchain_mongodb.retrievers.hybrid_search import MongoDBAtlasHybridSearchRetriever
 
-from src.slack_integrations_offline.rag.embeddings import get_openai_embedding_model
+from src.slack_integrations_offline.rag.embeddings import get_embedding_model
+from src.slack_integrations_offline.rag.embedding_storage import with_embedding_storage
+from src.slack_integrations_offline.infrastructure.mongodb.client import get_mongo_client
 from src.slack_integrations_offline.config import settings
 
 
 def get_retriever(
-    embedding_model_id: str, k: int = 3
+    embedding_model_id: str,
+    k: int = 3,
+    embedding_storage: str = "array",
+    embedding_storage_dim: int = 0,
 ) -> MongoDBAtlasHybridSearchRetriever:
     """Create a MongoDB Atlas hybrid search retriever with specified embedding model.
     
     Args:
-        embedding_model_id: Identifier for the OpenAI embedding model to use.
+        embedding_model_id: Identifier of the embedding model, as "<provider>:<model>".
         k: Number of top results to retrieve. Defaults to 3.
+        embedding_storage: How embeddings are stored: "array", "float32" or "int8".
+        embedding_storage_dim: Number of embedding dimensions kept. 0 keeps the full embedding.
     
     Returns:
         MongoDBAtlasHybridSearchRetriever: Configured hybrid search retriever instance.
     """
-    embedding_model = get_openai_embedding_model(model_id=embedding_model_id)
+    embedding_model = with_embedding_storage(
+        get_embedding_model(model_id=embedding_model_id),
+        storage=embedding_storage,
+        dimensions=embedding_storage_dim,
+    )
 
     return get_hybrid_search_retriever(embedding_model=embedding_model, k=k)
 
 
 
 def get_hybrid_search_retriever(
-    embedding_model: OpenAIEmbeddings, k: int = 3
+    embedding_model: Embeddings, k: int = 3
 ) -> MongoDBAtlasHybridSearchRetriever:
     """Create a MongoDB Atlas hybrid search retriever combining vector and full-text search.
     
     Args:
-        embedding_model: OpenAI embeddings model instance for vector search.
+        embedding_model: Embeddings model instance for vector search.
         k: Number of top results to retrieve. Defaults to 3.
     
     Returns:
         MongoDBAtlasHybridSearchRetriever: Configured retriever with balanced vector and full-text penalties.
     """
     
-    vectorstore = MongoDBAtlasVectorSearch.from_connection_string(
-        connection_string=settings.MONGODB_URI,
+    collection = get_mongo_client(settings.MONGODB_URI)[settings.MONGODB_DATABASE_NAME]["rag"]
+
+    vectorstore = MongoDBAtlasVectorSearch(
+        collection=collection,
         embedding=embedding_model,
-        namespace=f"{settings.MONGODB_DATABASE_NAME}.rag",
         text_key="chunk",
         embedding_key="embedding",
         relevance_score_fn="dotProduct"
@@ -1,28 +1,694 @@
+import multiprocessing
+import os
+import re
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+import tiktoken
 from loguru import logger
 
-from langchain_text_splitters import RecursiveCharacterTextSplitter
+from langchain_core.documents import Document as LangChainDocument
+from langchain_text_splitters import RecursiveCharacterTextSplitter, TextSplitter
+
+
+SEPARATORS = ["```\n", "\n\n", "\n", " ", ""] # in this order
+
+# Metadata key of the chunk token count, measured in the splitter workers so the pipeline
+# threads never encode a chunk again
+TOKEN_COUNT_KEY = "token_count"
+
+# Pieces whose offset based length is within this many tokens of the chunk size are re-encoded,
+# as tokens merged across the piece boundaries make the estimate drift by a few tokens.
+LENGTH_MARGIN = 16
 
 
 def get_splitter(
-    chunk_size: int
-) -> RecursiveCharacterTextSplitter:
-    """Create a recursive character text splitter with tiktoken encoding.
+    chunk_size: int,
+    splitter_type: str = "recursive",
+) -> TextSplitter:
+    """Create a token based text splitter with hierarchical separators and 15% overlap.
     
     Args:
         chunk_size: Maximum size of each text chunk in tokens.
+        splitter_type: Either "recursive" for LangChain's recursive character splitter,
+            "token" for the single-pass OffsetTokenTextSplitter or "markdown" for the
+            section aware MarkdownSectionSplitter. Defaults to "recursive".
     
     Returns:
-        RecursiveCharacterTextSplitter: Configured text splitter with 15% overlap and hierarchical separators.
+        TextSplitter: Configured text splitter with 15% overlap and hierarchical separators.
+
+    Raises:
+        ValueError: If the splitter type is not supported.
     """
     chunk_overlap = int(0.15 * chunk_size)
 
     logger.info(
-        f"Getting splitter with chunk size: {chunk_size} and overlap: {chunk_overlap}"
+        f"Getting {splitter_type} splitter with chunk size: {chunk_size} and overlap: {chunk_overlap}"
     )
-    
-    return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
-        encoding_name="cl100k_base",
-        chunk_size = chunk_size,
-        chunk_overlap = chunk_overlap,
-        separators=["```\n", "\n\n", "\n", " ", ""] # in this order
-    )
\ No newline at end of file
+
+    if splitter_type == "recursive":
+        return RecursiveCharacterTextSplitter.from_tiktoken_encoder(
+            encoding_name="cl100k_base",
+            chunk_size = chunk_size,
+            chunk_overlap = chunk_overlap,
+            separators=SEPARATORS,
+        )
+
+    if splitter_type == "token":
+        return OffsetTokenTextSplitter(
+            encoding_name="cl100k_base",
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            separators=SEPARATORS,
+        )
+
+    if splitter_type == "markdown":
+        return MarkdownSectionSplitter(
+            encoding_name="cl100k_base",
+            chunk_size=chunk_size,
+            chunk_overlap=chunk_overlap,
+            separators=SEPARATORS,
+        )
+
+    raise ValueError(f"Unsupported splitter type: {splitter_type}")
+
+
+class OffsetTokenTextSplitter(TextSplitter):
+    """Single-pass token splitter following the same separator hierarchy as the recursive splitter.
+
+    ``RecursiveCharacterTextSplitter.from_tiktoken_encoder`` re-encodes every candidate piece at
+    every separator level. This splitter encodes each text once, keeps the character offset of
+    every token and estimates any span of the text with two bisections on those offsets. Spans
+    clearly above ``chunk_size`` are split further without being encoded; the others are encoded
+    once, so chunks are identical to the recursive splitter's. Pieces are handled as
+    ``(start, end)`` character ranges, so a chunk is copied out of the text only once, when it
+    is emitted.
+
+    Attributes:
+        separators: Separators ordered from the most to the least preferred split point.
+    """
+
+    def __init__(
+        self,
+        encoding_name: str = "cl100k_base",
+        separators: list[str] | None = None,
+        **kwargs,
+    ) -> None:
+        self._encoding = tiktoken.get_encoding(encoding_name)
+        self.separators = separators or SEPARATORS
+
+        super().__init__(length_function=self._count_tokens, **kwargs)
+
+
+    def _count_tokens(self, text: str) -> int:
+        """Count the tokens of a text with the splitter encoding."""
+
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+    def split_text(self, text: str) -> list[str]:
+        """Split a text into chunks of at most ``chunk_size`` tokens.
+
+        Args:
+            text: Text to split.
+
+        Returns:
+            list[str]: Chunks of the text, whitespace stripped.
+        """
+
+        offsets = self._token_offsets(text)
+
+        return [
+            chunk
+            for start, end in self._split_range(text, offsets, 0, len(text), self.separators)
+            if (chunk := text[start:end].strip())
+        ]
+
+
+    def _token_offsets(self, text: str) -> list[int]:
+        """Character offset of the first character of every token of a text.
+
+        Offsets are a cumulative sum of the token byte lengths, mapped from bytes to characters
+        for non ASCII texts. A token starting inside a multi-byte character gets the offset of
+        that character, as with ``Encoding.decode_with_offsets``.
+        """
+
+        tokens = self._encoding.encode(text, disallowed_special=())
+        lengths = _token_byte_lengths(self._encoding.name)[np.asarray(tokens, dtype=np.int64)]
+        offsets = np.cumsum(lengths) - lengths
+
+        if not text.isascii():
+            data = np.frombuffer(text.encode("utf-8"), dtype=np.uint8)
+            char_indexes = np.cumsum((data & 0xC0) != 0x80) - 1
+            offsets = char_indexes[offsets]
+
+        return offsets.tolist()
+
+
+    @staticmethod
+    def _length(offsets: list[int], start: int, end: int) -> int:
+        """Number of tokens overlapping the ``[start, end)`` character range."""
+
+        if end <= start:
+            return 0
+
+        first = bisect_right(offsets, start) - 1
+        last = bisect_right(offsets, end - 1) - 1
+
+        return last - first + 1
+
+
+    def _range_length(self, text: str, offsets: list[int], start: int, end: int) -> int | None:
+        """Exact token count of a range, or None when it is clearly at least ``chunk_size``.
+
+        Only ranges whose offset based estimate is close to or below the limit are re-encoded,
+        so lengths match the ones ``RecursiveCharacterTextSplitter`` computes piece by piece.
+        """
+
+        if self._length(offsets, start, end) >= self._chunk_size + LENGTH_MARGIN:
+            return None
+
+        return self._count_tokens(text[start:end])
+
+
+    def _split_range(
+        self, text: str, offsets: list[int], start: int, end: int, separators: list[str],
+    ) -> list[tuple[int, int]]:
+        """Recursively split a character range, mirroring ``RecursiveCharacterTextSplitter``.
+
+        Args:
+            text: Text being split.
+            offsets: Character offset of every token of the text.
+            start: Start offset of the range.
+            end: End offset of the range.
+            separators: Separators still available at this recursion level.
+
+        Returns:
+            list[tuple[int, int]]: Character ranges of the chunks.
+        """
+
+        separator, next_separators = separators[-1], []
+        for i, candidate in enumerate(separators):
+            if candidate == "":
+                separator = candidate
+                break
+
+            if text.find(candidate, start, end) != -1:
+                separator, next_separators = candidate, separators[i + 1:]
+                break
+
+        chunks: list[tuple[int, int]] = []
+        good_splits: list[tuple[int, int, int]] = []
+
+        for split_start, split_end in self._split_on(text, start, end, separator):
+            length = self._range_length(text, offsets, split_start, split_end)
+
+            if length is not None and length < self._chunk_size:
+                good_splits.append((split_start, split_end, length))
+                continue
+
+            if good_splits:
+                chunks.extend(self._merge_ranges(good_splits))
+                good_splits = []
+
+            if not next_separators:
+                chunks.append((split_start, split_end))
+            else:
+                chunks.extend(
+                    self._split_range(text, offsets, split_start, split_end, next_separators)
+                )
+
+        if good_splits:
+            chunks.extend(self._merge_ranges(good_splits))
+
+        return chunks
+
+
+    @staticmethod
+    def _split_on(text: str, start: int, end: int, separator: str) -> list[tuple[int, int]]:
+        """Split a range before every occurrence of ``separator``, keeping it at the piece start."""
+
+        if separator == "":
+            return [(i, i + 1) for i in range(start, end)]
+
+        boundaries = [start]
+        position = text.find(separator, start, end)
+        while position != -1:
+            if position > boundaries[-1]:
+                boundaries.append(position)
+            position = text.find(separator, position + len(separator), end)
+        boundaries.append(end)
+
+        return list(zip(boundaries, boundaries[1:]))
+
+
+    def _merge_ranges(self, splits: list[tuple[int, int, int]]) -> list[tuple[int, int]]:
+        """Merge contiguous pieces into chunks with overlap, mirroring ``TextSplitter._merge_splits``.
+
+        Args:
+            splits: Contiguous ``(start, end, length)`` pieces, each shorter than ``chunk_size``.
+
+        Returns:
+            list[tuple[int, int]]: Character ranges of the merged chunks.
+        """
+
+        chunks: list[tuple[int, int]] = []
+        first = 0
+        total = 0
+
+        for i, (_, split_end, length) in enumerate(splits):
+            if total + length > self._chunk_size and i > first:
+                chunks.append((splits[first][0], splits[i - 1][1]))
+
+                while total > self._chunk_overlap or (
+                    total + length > self._chunk_size and total > 0
+                ):
+                    total -= splits[first][2]
+                    first += 1
+
+            total += length
+
+        if first < len(splits):
+            chunks.append((splits[first][0], splits[-1][1]))
+
+        return chunks
+
+
+class MarkdownSectionSplitter(OffsetTokenTextSplitter):
+    """Markdown aware splitter keeping code blocks and tables intact and tracking sections.
+
+    The text is parsed into headings, fenced code blocks, tables and paragraphs. Blocks of the
+    same section are merged up to ``chunk_size`` tokens, so a chunk never spans two sections.
+    Code blocks and tables are kept whole up to ``MAX_BLOCK_TOKENS``; larger ones are split at
+    line boundaries, every piece repeating the fence or the table header. An oversized paragraph
+    falls back to the offset token splitter. Every chunk carries its section path (e.g.
+    ``## Install > ### Docker``) and the character offsets of the chunk in the source document.
+    """
+
+    # The crawler renders the docs "Copy" button right before opening fences.
+    FENCE_PATTERN = re.compile(r"^\s*(?:Copy)?(```|~~~)")
+    HEADING_PATTERN = re.compile(r"^(#{1,6})(?:\s+(.*?))?\s*$")
+    TABLE_DELIMITER_PATTERN = re.compile(r"^\s*\|?\s*:?-+:?\s*(?:\|\s*:?-+:?\s*)*\|?\s*$")
+
+    # Hard cap on intact code blocks and tables, leaving room for the contextual prefix within
+    # the 8191 token input limit of the embedding models.
+    MAX_BLOCK_TOKENS = 4000
+
+
+    def create_documents(
+        self, texts: list[str], metadatas: list[dict] | None = None,
+    ) -> list[LangChainDocument]:
+        """Split texts into chunks carrying section and offset metadata.
+
+        Args:
+            texts: Texts to split.
+            metadatas: Optional metadata of every text, copied into its chunks.
+
+        Returns:
+            list[LangChainDocument]: Chunks with ``section``, ``start_index`` and ``end_index`` metadata.
+        """
+
+        metadatas = metadatas or [{}] * len(texts)
+        documents = []
+
+        for text, metadata in zip(texts, metadatas):
+            for section, start, end, content in self.split_sections(text):
+                documents.append(
+                    LangChainDocument(
+                        page_content=content,
+                        metadata={
+                            **metadata,
+                            "section": section,
+                            "start_index": start,
+                            "end_index": end,
+                        },
+                    )
+                )
+
+        return documents
+
+
+    def split_text(self, text: str) -> list[str]:
+        """Split a markdown text into chunks of at most ``chunk_size`` tokens.
+
+        Args:
+            text: Markdown text to split.
+
+        Returns:
+            list[str]: Chunks of the text.
+        """
+
+        return [content for _, _, _, content in self.split_sections(text)]
+
+
+    def split_sections(self, text: str) -> list[tuple[str, int, int, str]]:
+        """Split a markdown text into section-bound chunks.
+
+        Args:
+            text: Markdown text to split.
+
+        Returns:
+            list[tuple[str, int, int, str]]: Section path, start and end offsets and content of
+                every chunk, with surrounding whitespace excluded. The content is the text between
+                the offsets, plus the repeated fence or table header of split blocks.
+        """
+
+        offsets = self._token_offsets(text)
+
+        chunks = []
+        for section, blocks in self._parse_sections(text):
+            for start, end, prefix, suffix in self._pack_blocks(text, offsets, blocks):
+                stripped = text[start:end]
+                if not prefix:
+                    start += len(stripped) - len(stripped.lstrip())
+                if not suffix:
+                    end -= len(stripped) - len(stripped.rstrip())
+
+                if end > start:
+                    chunks.append((section, start, end, f"{prefix}{text[start:end]}{suffix}"))
+
+        return chunks
+
+
+    def _parse_sections(self, text: str) -> list[tuple[str, list[tuple[str, int, int]]]]:
+        """Parse markdown into sections made of ``(kind, start, end)`` blocks.
+
+        Kinds are ``heading``, ``code``, ``table`` and ``text``. Headings emitted by the crawler
+        are often empty with the title on the next non-empty line, which is then used as title
+        and kept in the heading block. Sections holding nothing but their heading are dropped.
+
+        The online ``parse_headings`` (application/rag/single_document_retriever.py) mirrors the
+        heading and fence handling to find stored section paths, keep both in sync.
+        """
+
+        lines = text.splitlines(keepends=True)
+        line_starts = [0]
+        for line in lines:
+            line_starts.append(line_starts[-1] + len(line))
+
+        sections: list[tuple[str, list[tuple[str, int, int]]]] = [("", [])]
+        headings: list[tuple[int, str]] = []
+        fence: str | None = None
+        block_kind: str | None = None
+        block_start = 0
+
+        def close_block(end: int) -> None:
+            nonlocal block_kind
+            if block_kind is not None and end > block_start:
+                sections[-1][1].append((block_kind, block_start, end))
+            block_kind = None
+
+        for i, line in enumerate(lines):
+            start, end = line_starts[i], line_starts[i + 1]
+            stripped = line.strip()
+            fence_match = self.FENCE_PATTERN.match(line)
+
+            if fence is not None:
+                if fence_match and fence_match.group(1) == fence:
+                    fence = None
+                    sections[-1][1].append(("code", block_start, end))
+                    block_kind = None
+                continue
+
+            if block_kind == "heading" and stripped:
+                block_kind = None
+                sections[-1][1].append(("heading", block_start, end))
+                continue
+
+            if fence_match:
+                close_block(start)
+                fence, block_start = fence_match.group(1), start
+                continue
+
+            heading_match = self.HEADING_PATTERN.match(stripped)
+            if heading_match:
+                close_block(start)
+
+                level = len(heading_match.group(1))
+                title = heading_match.group(2) or next(
+                    (following.strip() for following in lines[i + 1:] if following.strip()), ""
+                )
+                while headings and headings[-1][0] >= level:
+                    headings.pop()
+                headings.append((level, f"{heading_match.group(1)} {title}".strip()))
+
+                sections.append((" > ".join(heading for _, heading in headings), []))
+                if heading_match.group(2):
+                    sections[-1][1].append(("heading", start, end))
+                else:
+                    block_kind, block_start = "heading", start
+                continue
+
+            kind = "table" if stripped.startswith("|") else "text" if stripped else None
+            if kind != block_kind:
+                if kind is None and block_kind in ("text", "heading"):
+                    continue
+                close_block(start)
+                if kind is not None:
+                    block_kind, block_start = kind, start
+
+        if fence is not None:
+            sections[-1][1].append(("code", block_start, len(text)))
+        else:
+            close_block(len(text))
+
+        return [
+            (section, blocks)
+            for section, blocks in sections
+            if any(kind != "heading" for kind, _, _ in blocks)
+        ]
+
+
+    def _pack_blocks(
+        self, text: str, offsets: list[int], blocks: list[tuple[str, int, int]],
+    ) -> list[tuple[int, int, str, str]]:
+        """Merge the blocks of a single section into chunks of at most ``chunk_size`` tokens.
+
+        Returns:
+            list[tuple[int, int, str, str]]: Start and end offsets of every chunk, with the text
+                to prepend and append to it, empty unless the chunk is a piece of a split block.
+        """
+
+        chunks: list[tuple[int, int, str, str]] = []
+        good_blocks: list[tuple[int, int, int]] = []
+        max_block_tokens = max(self._chunk_size, self.MAX_BLOCK_TOKENS)
+
+        for kind, start, end in blocks:
+            length = self._length(offsets, start, end)
+
+            if length < self._chunk_size:
+                good_blocks.append((start, end, length))
+                continue
+
+            if good_blocks:
+                chunks.extend((s, e, "", "") for s, e in self._merge_ranges(good_blocks))
+                good_blocks = []
+
+            if kind in ("code", "table") and length <= max_block_tokens:
+                logger.debug(f"Keeping {length} token {kind} block intact")
+                chunks.append((start, end, "", ""))
+            elif kind in ("code", "table"):
+                logger.debug(f"Splitting {length} token {kind} block at line boundaries")
+                chunks.extend(self._split_block(text, offsets, kind, start, end))
+            else:
+                chunks.extend(
+                    (s, e, "", "") for s, e in self._split_range(text, offsets, start, end, self.separators)
+                )
+
+        if good_blocks:
+            chunks.extend((s, e, "", "") for s, e in self._merge_ranges(good_blocks))
+
+        return chunks
+
+
+    def _split_block(
+        self, text: str, offsets: list[int], kind: str, start: int, end: int,
+    ) -> list[tuple[int, int, str, str]]:
+        """Split an oversized code block or table into pieces of about ``chunk_size`` tokens.
+
+        Pieces are cut at line boundaries. Code pieces are wrapped in the opening and closing
+        fences of the block and table pieces after the first repeat the header rows, so every
+        piece stays valid markdown on its own.
+
+        Returns:
+            list[tuple[int, int, str, str]]: Start and end offsets of every piece, with the text
+                to prepend and append to it.
+        """
+
+        lines = text[start:end].splitlines(keepends=True)
+        line_starts = [start]
+        for line in lines:
+            line_starts.append(line_starts[-1] + len(line))
+
+        if kind == "code":
+            fence_match = self.FENCE_PATTERN.match(lines[0])
+            opening = lines[0][fence_match.start(1):]
+            opening = opening if opening.endswith("\n") else f"{opening}\n"
+            closing = fence_match.group(1)
+
+            closing_match = self.FENCE_PATTERN.match(lines[-1]) if len(lines) > 1 else None
+            closed = closing_match is not None and closing_match.group(1) == fence_match.group(1)
+            header_lines, body_lines = 1, len(lines) - 1 - closed
+        else:
+            has_delimiter = len(lines) > 1 and self.TABLE_DELIMITER_PATTERN.match(lines[1])
+            header_lines = 2 if has_delimiter else 1
+            body_lines = len(lines) - header_lines
+            opening, closing = text[start:line_starts[header_lines]], ""
+
+        budget = self._chunk_size - self._count_tokens(opening) - self._count_tokens(closing)
+        pieces: list[tuple[int, int]] = []
+        total = 0
+
+        for i in range(header_lines, header_lines + body_lines):
+            length = self._length(offsets, line_starts[i], line_starts[i + 1])
+
+            if pieces and total + length <= budget:
+                pieces[-1] = (pieces[-1][0], line_starts[i + 1])
+                total += length
+            else:
+                pieces.append((line_starts[i], line_starts[i + 1]))
+                total = length
+
+        if not pieces:
+            return [(start, end, "", "")]
+
+        # The first piece keeps the original opening lines, the last one the closing fence
+        pieces[0] = (start, pieces[0][1])
+        pieces[-1] = (pieces[-1][0], end)
+
+        return [
+            (piece_start, piece_end, opening if i > 0 else "", closing if i < len(pieces) - 1 else "")
+            for i, (piece_start, piece_end) in enumerate(pieces)
+        ]
+
+
+@lru_cache
+def _token_byte_lengths(encoding_name: str) -> np.ndarray:
+    """Byte length of every ordinary token of an encoding, indexed by token id."""
+
+    encoding = tiktoken.get_encoding(encoding_name)
+    lengths = np.zeros(encoding.max_token_value + 1, dtype=np.int64)
+
+    for token in range(encoding.max_token_value + 1):
+        try:
+            lengths[token] = len(encoding.decode_single_token_bytes(token))
+        except KeyError:
+            continue
+
+    return lengths
+
+
+_worker_splitter: TextSplitter | None = None
+_worker_encoding: tiktoken.Encoding | None = None
+
+
+def _init_splitter_worker(chunk_size: int, splitter_type: str) -> None:
+    """Build the splitter, and its tiktoken encoder, once per worker process.
+
+    Args:
+        chunk_size: Maximum size of each text chunk in tokens.
+        splitter_type: Type of splitter to build, see ``get_splitter``.
+    """
+    global _worker_splitter, _worker_encoding
+
+    _worker_splitter = get_splitter(chunk_size=chunk_size, splitter_type=splitter_type)
+    _worker_encoding = tiktoken.get_encoding("cl100k_base")
+
+
+def _split_in_worker(document: LangChainDocument) -> list[LangChainDocument]:
+    """Split a single document with the splitter owned by the current worker process.
+
+    Args:
+        document: Document to split.
+
+    Returns:
+        list[LangChainDocument]: Chunks carrying the metadata of the source document and their
+            ``token_count``.
+    """
+
+    chunks = _worker_splitter.split_documents([document])
+
+    for chunk in chunks:
+        chunk.metadata[TOKEN_COUNT_KEY] = len(
+            _worker_encoding.encode(chunk.page_content, disallowed_special=())
+        )
+
+    return chunks
+
+
+class ProcessPoolSplitter:
+    """Split documents in a pool of worker processes, each owning its own tokenizer.
+
+    Tokenization is CPU bound and holds the GIL, so running it in processes lets chunking scale
+    with the number of cores while threads in the parent process are left with network I/O only.
+    Use it as a context manager to start and shut down the pool.
+
+    Attributes:
+        chunk_size: Maximum size of each text chunk in tokens.
+        splitter_type: Type of splitter built in every worker, see ``get_splitter``.
+        max_workers: Number of worker processes.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int,
+        splitter_type: str = "recursive",
+        max_workers: int | None = None,
+    ) -> None:
+        self.chunk_size = chunk_size
+        self.splitter_type = splitter_type
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+        self._executor: ProcessPoolExecutor | None = None
+
+
+    def __enter__(self) -> "ProcessPoolSplitter":
+        """Start the worker processes.
+
+        Returns:
+            ProcessPoolSplitter: The splitter instance for use in context.
+        """
+
+        # Spawn rather than fork: the parent already holds MongoDB and HTTP client threads.
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_splitter_worker,
+            initargs=(self.chunk_size, self.splitter_type),
+        )
+        logger.info(f"Started {self.max_workers} splitter worker processes")
+
+        return self
+
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Shut down the worker processes."""
+
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+
+    def split_documents(self, documents: list[LangChainDocument]) -> list[LangChainDocument]:
+        """Split documents in the worker processes.
+
+        Blocks the calling thread, without holding the GIL, until every document is split.
+
+        Args:
+            documents: Documents to split.
+
+        Returns:
+            list[LangChainDocument]: Chunks of all documents, in input order.
+
+        Raises:
+            RuntimeError: If the pool was not started with a ``with`` block.
+        """
+
+        if self._executor is None:
+            raise RuntimeError("ProcessPoolSplitter must be used as a context manager.")
+
+        futures = [self._executor.submit(_split_in_worker, document) for document in documents]
+
+        return [chunk for future in futures for chunk in future.result()]
@@ -1,5 +1,11 @@
-import string
 import random
+import string
+import time
+from typing import Callable, TypeVar
+
+from loguru import logger
+
+T = TypeVar("T")
 
 
 def generate_random_hex(length: int) -> str:
@@ -13,4 +19,41 @@ def generate_random_hex(length: int) -> str:
     """
     
     hex_chars = string.hexdigits.lower()
-    return "".join(random.choice(hex_chars) for _ in range(length))
\ No newline at end of file
+    return "".join(random.choice(hex_chars) for _ in range(length))
+
+
+def retry_with_backoff(
+    fn: Callable[[], T],
+    max_attempts: int = 5,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+) -> tuple[T, int]:
+    """Call a function, retrying failures with exponential backoff and jitter.
+    
+    Args:
+        fn: Zero-argument callable to run.
+        max_attempts: Maximum number of calls, including the first one.
+        base_delay: Delay in seconds before the first retry, doubled on every retry.
+        max_delay: Upper bound of the delay between two attempts.
+    
+    Returns:
+        tuple[T, int]: Result of the function and the number of attempts it took.
+    
+    Raises:
+        Exception: The last error raised by the function once every attempt failed.
+    """
+    
+    for attempt in range(1, max_attempts + 1):
+        try:
+            return fn(), attempt
+
+        except Exception as e:
+            if attempt == max_attempts:
+                raise
+
+            delay = min(max_delay, base_delay * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+            logger.warning(
+                f"Attempt {attempt}/{max_attempts} failed with {type(e).__name__}: {e}. "
+                f"Retrying in {delay:.1f}s"
+            )
+            time.sleep(delay)
@@ -1,162 +1,629 @@
-from typing import Any, Generator
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterator
 
 from loguru import logger
-from tqdm import tqdm
-from zenml import step
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from typing_extensions import Annotated
+from zenml import get_step_context, step
 
 from langchain_core.documents import Document as LangChainDocument
-from langchain_text_splitters import RecursiveCharacterTextSplitter
 
-from src.slack_integrations_offline.rag.splitters import get_splitter
+from src.slack_integrations_offline.rag.splitters import ProcessPoolSplitter
 from src.slack_integrations_offline.rag.retrievers import get_retriever
+from src.slack_integrations_offline.rag.batching import EmbeddingUsage, TokenBudgetBatcher, TokenRateLimiter
+from src.slack_integrations_offline.rag.dedup import ChunkDeduplicator
 
 from src.slack_integrations_offline.infrastructure.mongodb.service import MongoDBService
 from src.slack_integrations_offline.infrastructure.mongodb.indexes import MongodbIndex
+from src.slack_integrations_offline.infrastructure.mongodb.dead_letter import DeadLetterQueue
+from src.slack_integrations_offline.infrastructure.mongodb.client import get_pool_stats
+
+from src.slack_integrations_offline.applications.ingestion.streaming import Stage, StreamingPipeline
 
 from src.slack_integrations_offline.domain.document import Document
+from src.slack_integrations_offline.domain.dead_letter import DeadLetterBatch
+
+from src.slack_integrations_offline.utils import retry_with_backoff
 
 
 
 @step
 def chunk_embed_load(
-    documents: list[Document],
+    extract_collection_name: str,
     collection_name: str,
-    embedding_model_id: str, 
+    embedding_model_id: str,
     embedding_model_dim: int,
-    retriever_type: str, 
+    retriever_type: str,
     chunk_size: int,
     top_k: int,
-    processing_batch_size: int,
-    processing_max_workers: int,
-) -> None:
-    
-    """Chunk documents, generate embeddings, and load them into MongoDB with vector index.
-    
+    splitter_type: str = "recursive",
+    embedding_request_max_tokens: int = 32000,
+    embedding_tpm_limit: int = 1_000_000,
+    split_workers: int = 2,
+    embed_workers: int = 2,
+    insert_workers: int = 1,
+    queue_size: int = 32,
+    limit: int = 0,
+    embedding_max_attempts: int = 5,
+    embedding_retry_base_delay: float = 1.0,
+    drain_dead_letter: bool = False,
+    embedding_storage: str = "array",
+    embedding_storage_dim: int = 0,
+    deduplicate: bool = True,
+    near_duplicate_threshold: float = 0.85,
+) -> Annotated[int, "output"]:
+
+    """Stream documents from MongoDB, chunk and embed them, and load them into MongoDB with vector index.
+
+    Documents are read through a MongoDB cursor and pushed through a split -> embed -> insert
+    streaming pipeline connected by bounded queues, so memory usage does not grow with the corpus.
+
+    Failed embedding requests are retried with exponential backoff. Batches that fail every
+    attempt are stored in the ``<collection_name>_dead_letter`` collection instead of failing the
+    run, and a later run with ``drain_dead_letter`` set only re-embeds those batches.
+
     Args:
-        documents: List of documents to process.
+        extract_collection_name: Name of the MongoDB collection to read the raw documents from.
         collection_name: Name of the MongoDB collection to store documents.
-        embedding_model_id: Identifier for the embedding model to use.
+        embedding_model_id: Identifier of the embedding model, as "<provider>:<model>" (e.g.
+            "local:sentence-transformers/all-MiniLM-L6-v2"). Ids without a prefix use OpenAI.
         embedding_model_dim: Dimensionality of the embedding vectors.
         retriever_type: Type of retriever to use for vector search.
         chunk_size: Size of text chunks for splitting documents.
         top_k: Number of top results to retrieve in searches.
-        processing_batch_size: Number of documents to process in each batch.
-        processing_max_workers: Maximum number of concurrent workers for processing.
+        splitter_type: Type of text splitter: "recursive", "token" or "markdown".
+        embedding_request_max_tokens: Maximum number of tokens packed into a single embedding request.
+        embedding_tpm_limit: Maximum number of tokens sent to the embedding model per minute.
+        split_workers: Number of worker processes splitting documents into chunks.
+        embed_workers: Number of workers calling the embedding model.
+        insert_workers: Number of workers inserting embedded chunks into MongoDB.
+        queue_size: Maximum number of items buffered between two stages.
+        limit: Maximum number of documents to read. 0 for no limit.
+        embedding_max_attempts: Maximum number of attempts for a single embedding request.
+        embedding_retry_base_delay: Delay in seconds before the first retry, doubled on every retry.
+        drain_dead_letter: Only re-embed the dead-lettered batches of a previous run, keeping
+            the existing chunks and index.
+        embedding_storage: How embeddings are stored: "array" of doubles, packed "float32"
+            binData or scalar quantized "int8" binData.
+        embedding_storage_dim: Number of embedding dimensions kept (Matryoshka truncation).
+            0 keeps the full embedding.
+        deduplicate: Whether to drop exact and near-duplicate chunks before embedding them.
+        near_duplicate_threshold: Minimum estimated Jaccard similarity for two chunks to be
+            near duplicates. 0 only drops exact duplicates.
+
+    Returns:
+        int: Count of chunks in the collection after loading.
     """
-    
-    splitter = get_splitter(chunk_size=chunk_size)
 
-    retriever = get_retriever(embedding_model_id=embedding_model_id, k=top_k)
+    retriever = get_retriever(
+        embedding_model_id=embedding_model_id,
+        k=top_k,
+        embedding_storage=embedding_storage,
+        embedding_storage_dim=embedding_storage_dim,
+    )
 
     with MongoDBService(
         model=Document, collection_name=collection_name
-    ) as mongodb_client:
-        
-        mongodb_client.clear_collection()
+    ) as mongodb_client, DeadLetterQueue(collection_name=collection_name) as dead_letters:
+
+        if drain_dead_letter:
+            stats = drain_dead_letters(
+                dead_letters=dead_letters,
+                retriever=retriever,
+                tokens_per_minute=embedding_tpm_limit,
+                embed_workers=embed_workers,
+                max_attempts=embedding_max_attempts,
+                retry_base_delay=embedding_retry_base_delay,
+            )
+
+        else:
+            mongodb_client.clear_collection()
+            dead_letters.clear()
 
-        docs = [
-            LangChainDocument(
-                page_content=doc.content, metadata=doc.metadata.model_dump()
+            index = MongodbIndex(
+                retriever=retriever,
+                mongodb_client=mongodb_client,
+                raw_collection_name=extract_collection_name,
             )
-            for doc in documents
-            if doc
-        ]
-
-        process_docs(
-            docs=docs,
-            retriever=retriever,
-            splitter=splitter,
-            batch_size=processing_batch_size,
-            max_workers=processing_max_workers,
-        )
 
-        index = MongodbIndex(
-            retriever=retriever,
-            mongodb_client=mongodb_client
-        )
+            # Built before loading, so the duplicate source merges match on an indexed chunk_hash
+            index_reports = index.create_btree_indexes()
+
+            with ProcessPoolSplitter(
+                chunk_size=chunk_size, splitter_type=splitter_type, max_workers=split_workers
+            ) as splitter, MongoDBService(
+                model=Document, collection_name=extract_collection_name
+            ) as source_client:
+
+                stats = process_docs(
+                    source_client=source_client,
+                    retriever=retriever,
+                    splitter=splitter,
+                    dead_letters=dead_letters,
+                    max_tokens_per_request=embedding_request_max_tokens,
+                    tokens_per_minute=embedding_tpm_limit,
+                    split_workers=split_workers,
+                    embed_workers=embed_workers,
+                    insert_workers=insert_workers,
+                    queue_size=queue_size,
+                    limit=limit,
+                    max_attempts=embedding_max_attempts,
+                    retry_base_delay=embedding_retry_base_delay,
+                    deduplicate=deduplicate,
+                    near_duplicate_threshold=near_duplicate_threshold,
+                )
+
+            index_reports += index.create_search_indexes(
+                embedding_dims=embedding_model_dim,
+                is_hybrid=retriever_type == "contextual",
+            )
+            stats["indexes"] = [report.to_metadata() for report in index_reports]
 
-        index.create(
-            embedding_dims=embedding_model_dim,
-            is_hybrid=retriever_type == "contextual",
-        )
+        count = mongodb_client.get_collection_count()
+        dead_letter_count = dead_letters.count()
+        version = mongodb_client.bump_version()
+
+    step_context = get_step_context()
+    step_context.add_output_metadata(
+        output_name="output",
+        metadata={
+            "count": count,
+            "version": version,
+            **stats,
+            "dead_letter": {
+                "collection": dead_letters.collection_name,
+                "pending_batches": dead_letter_count,
+            },
+            "mongo_pool": get_pool_stats(),
+        }
+    )
+
+    return count
 
 
 
 def process_docs(
-    docs: LangChainDocument,
+    source_client: MongoDBService,
     retriever: Any,
-    splitter: RecursiveCharacterTextSplitter,
-    batch_size: int = 4,
-    max_workers: int = 2,
-) -> None:
-    """Process documents in parallel batches by splitting and embedding them.
-    
+    splitter: ProcessPoolSplitter,
+    dead_letters: DeadLetterQueue,
+    max_tokens_per_request: int = 32000,
+    tokens_per_minute: int = 1_000_000,
+    split_workers: int = 2,
+    embed_workers: int = 2,
+    insert_workers: int = 1,
+    queue_size: int = 32,
+    limit: int = 0,
+    max_attempts: int = 5,
+    retry_base_delay: float = 1.0,
+    deduplicate: bool = True,
+    near_duplicate_threshold: float = 0.85,
+) -> dict[str, dict]:
+    """Stream documents through the split, dedup, embed and insert stages.
+
+    Chunking runs in the splitter worker processes, so the pipeline threads only wait on
+    network I/O. Embedding workers pack chunks by token count and share a single
+    tokens-per-minute limiter, so requests run concurrently without exceeding the rate limit.
+
     Args:
-        docs: List of LangChain documents to process.
+        source_client: MongoDBService connected to the collection holding the raw documents.
         retriever: Retriever instance for generating and storing embeddings.
-        splitter: Text splitter for chunking documents.
-        batch_size: Number of documents to process in each batch.
-        max_workers: Maximum number of concurrent workers.
+        splitter: Process pool splitter for chunking documents.
+        dead_letters: Queue receiving the batches that failed every embedding attempt.
+        max_tokens_per_request: Maximum number of tokens packed into a single embedding request.
+        tokens_per_minute: Maximum number of tokens sent to the embedding model per minute.
+        split_workers: Number of threads feeding documents to the splitter processes.
+        embed_workers: Number of workers calling the embedding model.
+        insert_workers: Number of workers inserting embedded chunks into MongoDB.
+        queue_size: Maximum number of items buffered between two stages.
+        limit: Maximum number of documents to read. 0 for no limit.
+        max_attempts: Maximum number of attempts for a single embedding request.
+        retry_base_delay: Delay in seconds before the first retry, doubled on every retry.
+        deduplicate: Whether to drop exact and near-duplicate chunks before embedding them.
+        near_duplicate_threshold: Minimum estimated Jaccard similarity for two chunks to be
+            near duplicates. 0 only drops exact duplicates.
+
+    Returns:
+        dict[str, dict]: Throughput stats for every stage, dedup savings and embedding request usage.
+    """
+    vectorstore = retriever.vectorstore
+    batcher = TokenBudgetBatcher(max_tokens=max_tokens_per_request)
+    rate_limiter = TokenRateLimiter(tokens_per_minute=tokens_per_minute)
+    usage = EmbeddingUsage()
+    deduplicator = ChunkDeduplicator(
+        threshold=near_duplicate_threshold, count_tokens=batcher.chunk_tokens
+    )
+
+    stages = [
+        Stage(
+            name="split",
+            fn=lambda docs: split_documents(docs, splitter=splitter),
+            workers=split_workers,
+        ),
+    ]
+
+    if deduplicate:
+        stages.append(Stage(name="dedup", fn=deduplicator, workers=1))
+
+    pipeline = StreamingPipeline(
+        source=lambda: read_documents(source_client=source_client, limit=limit),
+        stages=[
+            *stages,
+            Stage(
+                name="embed",
+                fn=lambda chunks: embed_chunks(
+                    chunks,
+                    vectorstore=vectorstore,
+                    batcher=batcher,
+                    rate_limiter=rate_limiter,
+                    usage=usage,
+                    dead_letters=dead_letters,
+                    max_attempts=max_attempts,
+                    retry_base_delay=retry_base_delay,
+                ),
+                workers=embed_workers,
+                size=len,
+            ),
+            Stage(
+                name="insert",
+                fn=lambda batches: insert_batches(batches, vectorstore=vectorstore),
+                workers=insert_workers,
+                size=len,
+            ),
+        ],
+        queue_size=queue_size,
+    )
+
+    stats = {stage_stats.name: stage_stats for stage_stats in pipeline.run()}
+
+    merge_duplicate_sources(vectorstore.collection, deduplicator.duplicate_sources)
+
+    if usage.failed_chunks:
+        dead_letters.merge_duplicate_sources(deduplicator.duplicate_sources)
+
+    logger.info(
+        f"Embedded {usage.chunks} chunks in {usage.requests} requests ({usage.tokens} tokens), "
+        f"{usage.retried_chunks} retried, {usage.failed_chunks} dead-lettered, "
+        f"{deduplicator.stats.exact_duplicates + deduplicator.stats.near_duplicates} duplicates skipped."
+    )
+
+    return {
+        "stages": {name: stage_stats.to_metadata() for name, stage_stats in stats.items()},
+        "embedding": usage.to_metadata(seconds=stats["embed"].seconds),
+        "dedup": deduplicator.stats.to_metadata(),
+    }
+
+
+
+def read_documents(
+    source_client: MongoDBService, limit: int = 0, batch_size: int = 100,
+) -> Iterator[LangChainDocument]:
+    """Stream raw documents from MongoDB as LangChain documents.
+
+    Args:
+        source_client: MongoDBService connected to the collection holding the raw documents.
+        limit: Maximum number of documents to read. 0 for no limit.
+        batch_size: Number of documents fetched per cursor round trip.
+
+    Yields:
+        LangChainDocument: Document with the raw content and its metadata.
+    """
+    docs = source_client.iter_documents(
+        projection=["content", "metadata"], batch_size=batch_size, limit=limit, raw=True,
+    )
+
+    for doc in docs:
+        if not doc.get("content"):
+            continue
+
+        yield LangChainDocument(page_content=doc["content"], metadata=doc["metadata"])
+
+
+
+def split_documents(
+    docs: Iterator[LangChainDocument],
+    splitter: ProcessPoolSplitter,
+) -> Iterator[LangChainDocument]:
+    """Split every incoming document into chunks in the splitter worker processes.
+
+    Args:
+        docs: Iterator over the documents to split.
+        splitter: Process pool splitter for chunking documents.
+
+    Yields:
+        LangChainDocument: Chunks carrying the metadata of their source document and their
+            ``chunk_index`` ordinal within it.
+    """
+    for doc in docs:
+        for chunk_index, chunk in enumerate(splitter.split_documents([doc])):
+            chunk.metadata["chunk_index"] = chunk_index
+            yield chunk
+
+
+
+def embed_chunks(
+    chunks: Iterator[LangChainDocument],
+    vectorstore: Any,
+    batcher: TokenBudgetBatcher,
+    rate_limiter: TokenRateLimiter,
+    usage: EmbeddingUsage,
+    dead_letters: DeadLetterQueue,
+    max_attempts: int = 5,
+    retry_base_delay: float = 1.0,
+) -> Iterator[list[dict]]:
+    """Embed token-budgeted batches of chunks and turn them into vector store records.
+
+    Batches failing every attempt are dead-lettered and skipped, so a single bad request does
+    not abort the run.
+
+    Args:
+        chunks: Iterator over the chunks to embed.
+        vectorstore: Vector store holding the embedding model and the field names.
+        batcher: Batcher packing chunks into requests by token count.
+        rate_limiter: Tokens-per-minute limiter shared by all embedding workers.
+        usage: Counters collecting the embedding request usage.
+        dead_letters: Queue receiving the batches that failed every attempt.
+        max_attempts: Maximum number of attempts for a single embedding request.
+        retry_base_delay: Delay in seconds before the first retry, doubled on every retry.
+
+    Yields:
+        list[dict]: Records ready to be inserted into the vector store collection.
+    """
+    for batch, tokens in batcher(chunks):
+        texts = [chunk.page_content for chunk in batch]
+
+        try:
+            embeddings, attempts, throttled_seconds = embed_texts(
+                texts,
+                tokens=tokens,
+                vectorstore=vectorstore,
+                rate_limiter=rate_limiter,
+                max_attempts=max_attempts,
+                retry_base_delay=retry_base_delay,
+            )
+
+        except Exception as e:
+            dead_letters.put(chunks=batch, tokens=tokens, error=e, attempts=max_attempts)
+            usage.record_failure(chunks=len(batch))
+            continue
+
+        usage.record(
+            tokens=tokens,
+            chunks=len(batch),
+            throttled_seconds=throttled_seconds,
+            attempts=attempts,
+        )
+
+        yield to_records(texts, embeddings, [chunk.metadata for chunk in batch], vectorstore)
+
+
+
+def embed_texts(
+    texts: list[str],
+    tokens: int,
+    vectorstore: Any,
+    rate_limiter: TokenRateLimiter,
+    max_attempts: int = 5,
+    retry_base_delay: float = 1.0,
+) -> tuple[list[list[float]], int, float]:
+    """Embed a single request, retrying failures with exponential backoff.
+
+    The rate limiter is acquired on every attempt, so retries are accounted against the
+    tokens-per-minute budget as well.
+
+    Args:
+        texts: Texts of the request.
+        tokens: Number of tokens of the request.
+        vectorstore: Vector store holding the embedding model.
+        rate_limiter: Tokens-per-minute limiter shared by all embedding workers.
+        max_attempts: Maximum number of attempts for the request.
+        retry_base_delay: Delay in seconds before the first retry, doubled on every retry.
+
+    Returns:
+        tuple[list[list[float]], int, float]: Embeddings, number of attempts and seconds spent
+            waiting on the rate limiter.
+
+    Raises:
+        Exception: The last error raised by the embedding model once every attempt failed.
     """
-    batches = list(get_batches(docs=docs, batch_size=batch_size))
-    results = []
+    throttled_seconds = 0.0
 
-    total_docs = len(docs)
+    def request() -> list[list[float]]:
+        nonlocal throttled_seconds
+        throttled_seconds += rate_limiter.acquire(tokens)
 
+        return vectorstore.embeddings.embed_documents(texts)
 
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+    embeddings, attempts = retry_with_backoff(
+        request, max_attempts=max_attempts, base_delay=retry_base_delay
+    )
 
-        futures = [
-            executor.submit(process_batch, splitter, batch, retriever)
-            for batch in batches
-        ]
+    return embeddings, attempts, throttled_seconds
 
-        with tqdm(total=total_docs, desc="Processing documents") as pbar:
-            for future in as_completed(futures):
-                result = future.result()
-                results.append(result)
-                pbar.update(batch_size)
 
-    return results
+
+def to_records(
+    texts: list[str],
+    embeddings: list[list[float]],
+    metadatas: list[dict],
+    vectorstore: Any,
+) -> list[dict]:
+    """Build vector store records from embedded texts.
+
+    Args:
+        texts: Texts of the chunks.
+        embeddings: Embedding of every text.
+        metadatas: Metadata of every chunk.
+        vectorstore: Vector store holding the field names.
+
+    Returns:
+        list[dict]: Records ready to be inserted into the vector store collection.
+    """
+    return [
+        {
+            vectorstore._text_key: text,
+            vectorstore._embedding_key: embedding,
+            **metadata,
+        }
+        for text, embedding, metadata in zip(texts, embeddings, metadatas)
+    ]
 
 
 
+def insert_batches(
+    batches: Iterator[list[dict]],
+    vectorstore: Any,
+) -> Iterator[list[dict]]:
+    """Insert batches of embedded records into the vector store collection.
+
+    Inserts are unordered, so documents rejected by the server (e.g. too large, or invalid)
+    are logged and skipped without failing the rest of their batch or the run.
 
-def get_batches(
-    docs: list[LangChainDocument], batch_size: int
-) -> Generator[list[LangChainDocument], None, None]:
-    """Generate batches of documents for parallel processing.
-    
     Args:
-        docs: List of LangChain documents to batch.
-        batch_size: Number of documents per batch.
-    
+        batches: Iterator over batches of records to insert.
+        vectorstore: Vector store whose collection receives the records.
+
     Yields:
-        Generator[list[LangChainDocument], None, None]: Batches of documents.
+        list[dict]: The records of the batch that were persisted.
+    """
+    for batch in batches:
+        try:
+            vectorstore.collection.insert_many(batch, ordered=False)
+            logger.debug(f"Inserted {len(batch)} chunks.")
+
+        except BulkWriteError as e:
+            write_errors = e.details.get("writeErrors", [])
+            rejected = {error["index"] for error in write_errors}
+
+            logger.warning(
+                f"Insert rejected {len(rejected)}/{len(batch)} chunks: "
+                f"{write_errors[0].get('errmsg', e) if write_errors else e}"
+            )
+
+            batch = [record for i, record in enumerate(batch) if i not in rejected]
+
+        yield batch
+
+
+
+def merge_duplicate_sources(
+    collection: Any, duplicate_sources: dict[str, set[str]], batch_size: int = 1000,
+) -> int:
+    """Add the URLs of dropped duplicate chunks to the ``urls`` of the chunk that was kept.
+
+    Updates match on ``chunk_hash``, indexed by ``MongodbIndex.create_btree_indexes`` before
+    the chunks are loaded. Kept chunks that were dead-lettered are not in the collection yet,
+    their entries receive the URLs through ``DeadLetterQueue.merge_duplicate_sources``.
+
+    Args:
+        collection: Vector store collection holding the kept chunks.
+        duplicate_sources: URLs of the dropped duplicates, keyed by the hash of the kept chunk.
+        batch_size: Number of updates sent per bulk write.
+
+    Returns:
+        int: Number of chunks updated.
     """
-    for i in range(0, len(docs), batch_size):
-        yield docs[i : i + batch_size]
+    if not duplicate_sources:
+        return 0
+
+    updates = [
+        UpdateOne({"chunk_hash": chunk_hash}, {"$addToSet": {"urls": {"$each": sorted(urls)}}})
+        for chunk_hash, urls in duplicate_sources.items()
+    ]
 
+    modified = 0
+    for i in range(0, len(updates), batch_size):
+        result = collection.bulk_write(updates[i:i + batch_size], ordered=False)
+        modified += result.modified_count
 
+    logger.info(f"Merged the source URLs of duplicates into {modified} chunks.")
 
-def process_batch(
-    splitter: RecursiveCharacterTextSplitter,
-    batch: list[LangChainDocument],
+    return modified
+
+
+
+def drain_dead_letters(
+    dead_letters: DeadLetterQueue,
     retriever: Any,
-) -> None:
-    """Process a single batch of documents by splitting and adding to vector store.
-    
+    tokens_per_minute: int = 1_000_000,
+    embed_workers: int = 2,
+    max_attempts: int = 5,
+    retry_base_delay: float = 1.0,
+) -> dict[str, dict]:
+    """Re-embed the dead-lettered batches of a previous run and insert their chunks.
+
+    Entries are removed once their chunks are stored. Entries failing again stay in the queue
+    with their error and attempt count updated.
+
     Args:
-        splitter: Text splitter for chunking documents.
-        batch: Batch of LangChain documents to process.
-        retriever: Retriever instance containing the vector store.
+        dead_letters: Queue holding the failed batches.
+        retriever: Retriever instance for generating and storing embeddings.
+        tokens_per_minute: Maximum number of tokens sent to the embedding model per minute.
+        embed_workers: Number of threads draining entries concurrently.
+        max_attempts: Maximum number of attempts for a single embedding request.
+        retry_base_delay: Delay in seconds before the first retry, doubled on every retry.
+
+    Returns:
+        dict[str, dict]: Drain stats and embedding request usage.
     """
-    try:
-        split_docs = splitter.split_documents(batch)
-        retriever.vectorstore.add_documents(split_docs)
+    vectorstore = retriever.vectorstore
+    rate_limiter = TokenRateLimiter(tokens_per_minute=tokens_per_minute)
+    usage = EmbeddingUsage()
+
+    entries = dead_letters.entries()
+    logger.info(f"Draining {len(entries)} dead-lettered batches from '{dead_letters.collection_name}'.")
+
+    def drain(entry: DeadLetterBatch) -> None:
+        texts = [chunk.text for chunk in entry.chunks]
+
+        try:
+            embeddings, attempts, throttled_seconds = embed_texts(
+                texts,
+                tokens=entry.tokens,
+                vectorstore=vectorstore,
+                rate_limiter=rate_limiter,
+                max_attempts=max_attempts,
+                retry_base_delay=retry_base_delay,
+            )
 
-        logger.info(f"Successfully processed {len(batch)} documents.")
+        except Exception as e:
+            dead_letters.fail(entry, error=e, attempts=max_attempts)
+            usage.record_failure(chunks=len(entry.chunks))
+            logger.warning(f"Dead-lettered batch {entry.id} failed again: {type(e).__name__}: {e}")
+            return
+
+        records = to_records(texts, embeddings, [chunk.metadata for chunk in entry.chunks], vectorstore)
+        vectorstore.collection.insert_many(records, ordered=False)
+        dead_letters.ack(entry)
+
+        usage.record(
+            tokens=entry.tokens,
+            chunks=len(entry.chunks),
+            throttled_seconds=throttled_seconds,
+            attempts=entry.attempts + attempts,
+        )
 
-    except Exception as e:
-        logger.warning(f"Error processing batch of {len(batch)} documents: {str(e)}")
\ No newline at end of file
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, embed_workers)) as executor:
+        list(executor.map(drain, entries))
+    seconds = time.perf_counter() - start
+
+    logger.info(
+        f"Drained {usage.chunks} chunks from {usage.requests} batches, "
+        f"{usage.failed_chunks} chunks still dead-lettered."
+    )
+
+    return {
+        "stages": {
+            "drain": {
+                "workers": embed_workers,
+                "items_in": len(entries),
+                "items_out": usage.chunks,
+                "seconds": round(seconds, 3),
+                "throughput_per_second": round(usage.chunks / seconds, 3) if seconds else 0.0,
+            },
+        },
+        "embedding": usage.to_metadata(seconds=seconds),
+    }
@@ -6,6 +6,7 @@ from typing_extensions import Annotated
 from zenml import get_step_context, step
 
 from src.slack_integrations_offline.infrastructure.mongodb.service import MongoDBService
+from src.slack_integrations_offline.infrastructure.mongodb.client import get_pool_stats
 from src.slack_integrations_offline.domain.document import Document
 
 
@@ -13,14 +14,22 @@ from src.slack_integrations_offline.domain.document import Document
 def ingest_to_mongodb(
     models: list[BaseModel], 
     collection_name: str, 
-    clear_collection: bool = True
+    clear_collection: bool = True,
+    upsert_key: str | None = None,
+    writers: int = 1,
 ) -> Annotated[int, "output"]:
     """Ingest documents into a MongoDB collection.
+
+    Documents are written in size-bounded, unordered bulk writes, so a rejected document does
+    not abort the rest of the ingestion.
     
     Args:
         models: List of BaseModel instances to ingest into the collection.
         collection_name: Name of the MongoDB collection to ingest documents into.
         clear_collection: Whether to clear existing documents before ingestion. Defaults to True.
+        upsert_key: Dotted field path identifying a document (e.g. "metadata.url"). When set,
+            documents replace the existing ones with the same key instead of being appended.
+        writers: Number of bulk writes running in parallel. Defaults to 1.
     
     Returns:
         int: Count of documents in the collection after ingestion.
@@ -42,9 +51,10 @@ def ingest_to_mongodb(
             )
             service.clear_collection()
 
-        service.ingest_documents(models)
+        results = service.bulk_ingest(models, upsert_key=upsert_key, writers=writers)
 
         count = service.get_collection_count()
+        version = service.bump_version()
 
         logger.info(
             f"Successfully ingested {count} documents into MongoDB collection '{collection_name}'"
@@ -55,7 +65,14 @@ def ingest_to_mongodb(
     step_context.add_output_metadata(
         output_name="output",
         metadata={
-            "count": count
+            "count": count,
+            "version": version,
+            "inserted": sum(result.inserted for result in results),
+            "upserted": sum(result.upserted for result in results),
+            "modified": sum(result.modified for result in results),
+            "errors": sum(result.errors for result in results),
+            "chunks": [result.to_metadata() for result in results],
+            "mongo_pool": get_pool_stats(),
         }
     )
 
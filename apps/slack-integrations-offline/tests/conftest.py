@@ -0,0 +1,57 @@
+import random
+
+import pytest
+import tiktoken
+
+
+@pytest.fixture(scope="session")
+def cl100k() -> tiktoken.Encoding:
+    """The cl100k_base encoding, skipping the test when it cannot be downloaded or read from the
+    ``TIKTOKEN_CACHE_DIR`` cache."""
+
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        pytest.skip(f"cl100k_base encoding unavailable: {e}")
+
+
+@pytest.fixture(scope="session")
+def markdown_page() -> str:
+    """Markdown page shaped like the crawled docs: sections, code blocks and a table."""
+
+    words = random.Random(7).choices(
+        ["pipeline", "step", "stack", "artifact", "deploy", "the", "a", "with", "ZenML", "run"], k=3000
+    )
+
+    def paragraph(start: int, size: int) -> str:
+        return " ".join(words[start:start + size]) + "."
+
+    return "\n".join(
+        [
+            "# Guide",
+            "",
+            paragraph(0, 60),
+            "",
+            "## Install",
+            "",
+            paragraph(60, 200),
+            "",
+            "Copy```bash",
+            "# not a heading",
+            "pip install zenml",
+            "```",
+            "",
+            "### Docker",
+            "",
+            paragraph(260, 900),
+            "",
+            "| Flag | Meaning |",
+            "| --- | --- |",
+            *(f"| --flag-{i} | {paragraph(1200 + i * 8, 8)} |" for i in range(20)),
+            "",
+            "## Usage",
+            "",
+            paragraph(1400, 1200),
+            "",
+        ]
+    )
@@ -0,0 +1,104 @@
+from types import SimpleNamespace
+
+import pytest
+from langchain_core.documents import Document as LangChainDocument
+
+from src.slack_integrations_offline.rag import batching
+from src.slack_integrations_offline.rag.batching import EmbeddingUsage, TokenBudgetBatcher, TokenRateLimiter
+from src.slack_integrations_offline.rag.splitters import TOKEN_COUNT_KEY
+
+
+def chunk(tokens: int) -> LangChainDocument:
+    return LangChainDocument(page_content="text", metadata={TOKEN_COUNT_KEY: tokens})
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Fake clock for the rate limiter, sleeping advances the time instantly."""
+
+    state = SimpleNamespace(now=0.0, sleeps=[])
+
+    def sleep(seconds: float) -> None:
+        state.sleeps.append(seconds)
+        state.now += seconds
+
+    monkeypatch.setattr(batching, "time", SimpleNamespace(monotonic=lambda: state.now, sleep=sleep))
+
+    return state
+
+
+def test_batcher_packs_chunks_within_the_token_budget(cl100k):
+    batcher = TokenBudgetBatcher(max_tokens=100)
+
+    batches = list(batcher([chunk(40), chunk(40), chunk(30), chunk(100), chunk(10)]))
+
+    assert [(len(batch), tokens) for batch, tokens in batches] == [(2, 80), (1, 30), (1, 100), (1, 10)]
+
+
+def test_batcher_emits_oversized_chunks_alone(cl100k):
+    batcher = TokenBudgetBatcher(max_tokens=100)
+
+    batches = list(batcher([chunk(10), chunk(500), chunk(10)]))
+
+    assert [tokens for _, tokens in batches] == [10, 500, 10]
+
+
+def test_batcher_respects_the_input_limit(cl100k):
+    batcher = TokenBudgetBatcher(max_tokens=1000, max_inputs=3)
+
+    batches = list(batcher(chunk(1) for _ in range(7)))
+
+    assert [len(batch) for batch, _ in batches] == [3, 3, 1]
+
+
+def test_batcher_counts_chunks_without_token_count(cl100k):
+    batcher = TokenBudgetBatcher(max_tokens=1000)
+    text = "Deploy a ZenML pipeline on Kubernetes."
+
+    assert batcher.chunk_tokens(chunk(7)) == 7
+    assert batcher.chunk_tokens(LangChainDocument(page_content=text)) == len(cl100k.encode(text))
+
+
+def test_rate_limiter_spends_the_initial_budget_without_waiting(clock):
+    limiter = TokenRateLimiter(tokens_per_minute=600)
+
+    assert limiter.acquire(400) == 0.0
+    assert limiter.acquire(200) == 0.0
+    assert clock.sleeps == []
+
+
+def test_rate_limiter_waits_for_the_bucket_to_refill(clock):
+    limiter = TokenRateLimiter(tokens_per_minute=600)
+    limiter.acquire(600)
+
+    waited = limiter.acquire(100)
+
+    # 600 tokens per minute refill 10 tokens per second
+    assert waited == pytest.approx(10.0)
+    assert clock.now == pytest.approx(10.0)
+
+
+def test_rate_limiter_caps_requests_larger_than_the_limit(clock):
+    limiter = TokenRateLimiter(tokens_per_minute=600)
+
+    assert limiter.acquire(5000) == 0.0
+    assert limiter.acquire(600) == pytest.approx(60.0)
+
+
+def test_embedding_usage_counts_retries_and_failures():
+    usage = EmbeddingUsage()
+
+    usage.record(tokens=100, chunks=4)
+    usage.record(tokens=50, chunks=2, attempts=3, throttled_seconds=1.5)
+    usage.record_failure(chunks=5)
+
+    assert usage.to_metadata(seconds=2.0) == {
+        "requests": 2,
+        "tokens": 150,
+        "chunks": 6,
+        "retried_chunks": 2,
+        "failed_chunks": 5,
+        "avg_tokens_per_request": 75.0,
+        "throttled_seconds": 1.5,
+        "chunks_per_second": 3.0,
+    }
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+from langchain_core.documents import Document as LangChainDocument
+
+from src.slack_integrations_offline.rag.dedup import ChunkDeduplicator
+
+
+def words(seed: int, count: int = 200) -> list[str]:
+    vocabulary = [f"word{i}" for i in range(500)]
+
+    return random.Random(seed).choices(vocabulary, k=count)
+
+
+def chunk(text: str, url: str) -> LangChainDocument:
+    return LangChainDocument(page_content=text, metadata={"url": url})
+
+
+def test_exact_duplicates_are_dropped_and_their_urls_kept():
+    text = " ".join(words(1))
+    deduplicator = ChunkDeduplicator(threshold=0)
+
+    kept = list(
+        deduplicator(
+            [
+                chunk(text, "https://docs/a"),
+                chunk(f"  {text.upper()}\n", "https://docs/b"),
+                chunk(text, "https://docs/c"),
+            ]
+        )
+    )
+
+    assert len(kept) == 1
+    assert kept[0].metadata["urls"] == ["https://docs/a"]
+    assert deduplicator.duplicate_sources == {
+        kept[0].metadata["chunk_hash"]: {"https://docs/b", "https://docs/c"},
+    }
+    assert deduplicator.stats.exact_duplicates == 2
+    assert deduplicator.stats.near_duplicates == 0
+
+
+def test_near_duplicates_are_dropped():
+    original = words(2)
+    edited = [*original]
+    edited[100] = "changed"
+    deduplicator = ChunkDeduplicator(threshold=0.85)
+
+    kept = list(
+        deduplicator(
+            [
+                chunk(" ".join(original), "https://docs/a"),
+                chunk(" ".join(edited), "https://docs/b"),
+                chunk(" ".join(words(3)), "https://docs/c"),
+            ]
+        )
+    )
+
+    assert [document.metadata["url"] for document in kept] == ["https://docs/a", "https://docs/c"]
+    assert deduplicator.duplicate_sources[kept[0].metadata["chunk_hash"]] == {"https://docs/b"}
+    assert deduplicator.stats.near_duplicates == 1
+    assert deduplicator.stats.unique_chunks == 2
+
+
+def test_near_duplicate_detection_is_disabled_without_threshold():
+    original = words(2)
+    edited = [*original]
+    edited[100] = "changed"
+    deduplicator = ChunkDeduplicator(threshold=0)
+
+    kept = list(deduplicator([chunk(" ".join(original), "a"), chunk(" ".join(edited), "b")]))
+
+    assert len(kept) == 2
+
+
+def test_saved_tokens_are_counted_with_the_given_counter():
+    text = " ".join(words(4))
+    deduplicator = ChunkDeduplicator(count_tokens=lambda document: 7)
+
+    list(deduplicator([chunk(text, "a"), chunk(text, "b"), chunk(text, "c")]))
+
+    assert deduplicator.stats.tokens_saved == 14
+    assert deduplicator.stats.characters_saved == 2 * len(text)
+    assert deduplicator.stats.to_metadata()["saved_ratio"] == round(2 / 3, 4)
+
+
+def test_signature_similarity_estimates_jaccard():
+    deduplicator = ChunkDeduplicator()
+    first = deduplicator.signature(" ".join(words(5)))
+    second = deduplicator.signature(" ".join(words(6)))
+
+    assert (first == deduplicator.signature(" ".join(words(5)))).all()
+    assert (first == second).mean() < 0.1
+
+
+def test_bands_must_divide_permutations():
+    with pytest.raises(ValueError):
+        ChunkDeduplicator(num_perm=100, bands=16)
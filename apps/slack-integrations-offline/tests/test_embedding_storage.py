@@ -0,0 +1,94 @@
+import numpy as np
+import pytest
+from bson.binary import Binary
+from langchain_core.embeddings import Embeddings
+
+from src.slack_integrations_offline.rag.embedding_storage import (
+    EmbeddingCodec,
+    EncodedEmbeddings,
+    with_embedding_storage,
+)
+
+
+def unit_vector(seed: int, dim: int = 1536) -> list[float]:
+    vector = np.random.default_rng(seed).normal(size=dim)
+
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class FixedEmbeddings(Embeddings):
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [unit_vector(len(text)) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return unit_vector(len(text))
+
+
+def test_array_storage_is_the_identity():
+    codec = EmbeddingCodec()
+    embedding = unit_vector(0)
+
+    assert codec.is_identity
+    assert codec.encode(embedding) is embedding
+    assert np.allclose(codec.decode(embedding), embedding)
+
+
+def test_float32_round_trip():
+    codec = EmbeddingCodec(storage="float32")
+    embedding = unit_vector(1)
+
+    encoded = codec.encode(embedding)
+
+    assert isinstance(encoded, Binary)
+    assert np.array_equal(codec.decode(encoded), np.asarray(embedding, dtype=np.float32))
+
+
+def test_int8_round_trip_keeps_the_direction():
+    codec = EmbeddingCodec(storage="int8")
+    embedding = np.asarray(unit_vector(2))
+
+    decoded = codec.decode(codec.encode(embedding.tolist()))
+
+    assert decoded.shape == embedding.shape
+    assert decoded @ embedding / np.linalg.norm(decoded) > 0.99
+
+
+def test_int8_preserves_the_ranking_of_documents():
+    codec = EmbeddingCodec(storage="int8")
+    query = np.asarray(unit_vector(3))
+    documents = [np.asarray(unit_vector(seed)) for seed in range(10, 30)]
+    documents = [query * weight + document for weight, document in zip(np.linspace(0, 2, 20), documents)]
+    documents = [document / np.linalg.norm(document) for document in documents]
+
+    exact = np.argsort([document @ query for document in documents])
+    decoded_query = codec.decode(codec.encode(query.tolist()))
+    quantized = np.argsort(
+        [codec.decode(codec.encode(document.tolist())) @ decoded_query for document in documents]
+    )
+
+    assert (exact[-5:] == quantized[-5:]).all()
+
+
+def test_truncation_renormalizes_and_sets_the_index_dimensions():
+    codec = EmbeddingCodec(storage="float32", dimensions=256)
+
+    decoded = codec.decode(codec.encode(unit_vector(4)))
+
+    assert decoded.shape == (256,)
+    assert np.linalg.norm(decoded) == pytest.approx(1.0, abs=1e-5)
+    assert codec.index_dimensions(1536) == 256
+    assert codec.index_dimensions(128) == 128
+    assert EmbeddingCodec().index_dimensions(1536) == 1536
+
+
+def test_unknown_storage_is_rejected():
+    with pytest.raises(ValueError):
+        EmbeddingCodec(storage="float16")
+
+
+def test_wrapped_model_encodes_documents_and_queries_alike():
+    embeddings = with_embedding_storage(FixedEmbeddings(), storage="int8", dimensions=512)
+
+    assert isinstance(embeddings, EncodedEmbeddings)
+    assert embeddings.embed_documents(["hello"]) == [embeddings.embed_query("hello")]
+    assert with_embedding_storage(FixedEmbeddings()).__class__ is FixedEmbeddings
@@ -0,0 +1,114 @@
+import pytest
+from langchain_core.documents import Document as LangChainDocument
+
+from src.slack_integrations_offline.rag.splitters import (
+    TOKEN_COUNT_KEY,
+    MarkdownSectionSplitter,
+    ProcessPoolSplitter,
+    get_splitter,
+)
+
+
+@pytest.mark.parametrize("chunk_size", [16, 64, 100, 256, 512])
+def test_token_splitter_matches_recursive_splitter(cl100k, markdown_page, chunk_size):
+    texts = [
+        markdown_page,
+        "x" * 5000,
+        "naïve café 🚀 " * 300,
+        "line\n" * 400 + "```\ncode\n```\n" * 50,
+    ]
+
+    recursive = get_splitter(chunk_size=chunk_size, splitter_type="recursive")
+    token = get_splitter(chunk_size=chunk_size, splitter_type="token")
+
+    for text in texts:
+        assert token.split_text(text) == recursive.split_text(text)
+
+
+def test_markdown_chunks_point_at_their_source_text(cl100k, markdown_page):
+    splitter = get_splitter(chunk_size=256, splitter_type="markdown")
+
+    chunks = splitter.split_sections(markdown_page)
+
+    assert chunks
+    for _, start, end, content in chunks:
+        assert content == markdown_page[start:end]
+        assert content == content.strip()
+
+
+def test_markdown_chunks_track_section_paths(cl100k, markdown_page):
+    splitter = get_splitter(chunk_size=256, splitter_type="markdown")
+
+    sections = [section for section, _, _, _ in splitter.split_sections(markdown_page)]
+
+    # The comment inside the bash block is not a heading
+    assert list(dict.fromkeys(sections)) == [
+        "# Guide",
+        "# Guide > ## Install",
+        "# Guide > ## Install > ### Docker",
+        "# Guide > ## Usage",
+    ]
+
+
+def test_markdown_chunks_keep_code_blocks_and_tables_whole(cl100k, markdown_page):
+    splitter = get_splitter(chunk_size=256, splitter_type="markdown")
+
+    contents = [content for _, _, _, content in splitter.split_sections(markdown_page)]
+
+    assert any("Copy```bash\n# not a heading\npip install zenml\n```" in content for content in contents)
+    table = [content for content in contents if "| Flag | Meaning |" in content]
+    assert len(table) == 1 and "--flag-19" in table[0]
+    for content in contents:
+        if "| Flag |" not in content:
+            assert splitter._count_tokens(content) <= 256
+
+
+def test_markdown_oversized_code_block_repeats_its_fence(cl100k):
+    code = "```python\n" + "".join(f"value_{i} = compute({i})\n" for i in range(1500)) + "```"
+    splitter = get_splitter(chunk_size=256, splitter_type="markdown")
+
+    chunks = splitter.split_sections(f"## Code\n\n{code}\n")
+    pieces = [content for _, _, _, content in chunks if "value_" in content]
+
+    assert len(pieces) > 1
+    for content in pieces:
+        assert content.startswith("```python\n")
+        assert content.endswith("```")
+        assert splitter._count_tokens(content) <= MarkdownSectionSplitter.MAX_BLOCK_TOKENS + 8
+
+
+def test_markdown_documents_carry_offsets_and_metadata(cl100k, markdown_page):
+    splitter = get_splitter(chunk_size=256, splitter_type="markdown")
+
+    documents = splitter.create_documents([markdown_page], metadatas=[{"url": "https://docs/guide"}])
+
+    for document in documents:
+        start, end = document.metadata["start_index"], document.metadata["end_index"]
+        assert document.page_content == markdown_page[start:end]
+        assert document.metadata["url"] == "https://docs/guide"
+        assert document.metadata["section"]
+
+
+def test_process_pool_splitter_counts_chunk_tokens(cl100k, markdown_page):
+    documents = [
+        LangChainDocument(page_content=markdown_page, metadata={"url": "https://docs/a"}),
+        LangChainDocument(page_content=markdown_page[:3000], metadata={"url": "https://docs/b"}),
+    ]
+    expected = get_splitter(chunk_size=128, splitter_type="token").split_documents(documents)
+
+    with ProcessPoolSplitter(chunk_size=128, splitter_type="token", max_workers=2) as splitter:
+        chunks = splitter.split_documents(documents)
+
+    assert [chunk.page_content for chunk in chunks] == [chunk.page_content for chunk in expected]
+    for chunk in chunks:
+        assert chunk.metadata[TOKEN_COUNT_KEY] == len(cl100k.encode(chunk.page_content, disallowed_special=()))
+
+
+def test_process_pool_splitter_requires_context_manager():
+    with pytest.raises(RuntimeError):
+        ProcessPoolSplitter(chunk_size=128).split_documents([])
+
+
+def test_get_splitter_rejects_unknown_type():
+    with pytest.raises(ValueError):
+        get_splitter(chunk_size=128, splitter_type="semantic")
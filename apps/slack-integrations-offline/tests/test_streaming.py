@@ -0,0 +1,120 @@
+import threading
+import time
+
+import pytest
+
+from src.slack_integrations_offline.applications.ingestion.streaming import Stage, StreamingPipeline
+
+
+def test_items_flow_through_every_stage_in_order():
+    outputs = []
+    pipeline = StreamingPipeline(
+        source=lambda: range(100),
+        stages=[
+            Stage(name="double", fn=lambda items: (item * 2 for item in items)),
+            Stage(name="pair", fn=lambda items: ([item, item] for item in items), size=len),
+            Stage(name="sink", fn=lambda items: outputs.extend(items) or []),
+        ],
+        queue_size=4,
+        poll_interval=0.01,
+    )
+
+    stats = pipeline.run()
+
+    assert outputs == [[item * 2, item * 2] for item in range(100)]
+    assert [stage.name for stage in stats] == ["source", "double", "pair", "sink"]
+    assert stats[1].items_in == 100 and stats[1].items_out == 100
+    assert stats[2].items_out == 200
+
+
+def test_every_worker_of_a_stage_receives_the_end_of_stream():
+    outputs = []
+    lock = threading.Lock()
+
+    def sink(items):
+        for item in items:
+            with lock:
+                outputs.append(item)
+        return []
+
+    pipeline = StreamingPipeline(
+        source=lambda: range(1000),
+        stages=[
+            Stage(name="square", fn=lambda items: (item * item for item in items), workers=4),
+            Stage(name="sink", fn=sink, workers=3),
+        ],
+        queue_size=8,
+        poll_interval=0.01,
+    )
+
+    stats = pipeline.run()
+
+    assert sorted(outputs) == [item * item for item in range(1000)]
+    assert stats[1].workers == 4 and stats[1].items_in == 1000
+
+
+def test_bounded_queues_apply_backpressure_to_the_source():
+    produced = 0
+    release = threading.Event()
+
+    def source():
+        nonlocal produced
+        for item in range(100):
+            produced += 1
+            yield item
+
+    def slow_sink(items):
+        for _ in items:
+            release.wait()
+        return []
+
+    pipeline = StreamingPipeline(
+        source=source,
+        stages=[Stage(name="sink", fn=slow_sink)],
+        queue_size=2,
+        poll_interval=0.01,
+    )
+    runner = threading.Thread(target=pipeline.run)
+    runner.start()
+
+    time.sleep(0.3)
+    # One item held by the sink, two queued and one blocked in the source put
+    assert produced <= 4
+
+    release.set()
+    runner.join(timeout=5)
+    assert not runner.is_alive()
+    assert produced == 100
+
+
+def test_stage_errors_stop_the_pipeline_and_are_raised():
+    produced = 0
+
+    def source():
+        nonlocal produced
+        for item in range(100_000):
+            produced += 1
+            yield item
+
+    def failing(items):
+        for item in items:
+            if item == 10:
+                raise RuntimeError("embedding failed")
+            yield item
+
+    pipeline = StreamingPipeline(
+        source=source,
+        stages=[Stage(name="fail", fn=failing), Stage(name="sink", fn=lambda items: list(items) and [])],
+        queue_size=4,
+        poll_interval=0.01,
+    )
+
+    with pytest.raises(RuntimeError, match="embedding failed"):
+        pipeline.run()
+
+    assert produced < 100_000
+
+
+def test_pipeline_needs_a_stage():
+    with pytest.raises(ValueError):
+        StreamingPipeline(source=lambda: [], stages=[])
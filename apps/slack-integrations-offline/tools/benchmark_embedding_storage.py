@@ -0,0 +1,182 @@
+import random
+import time
+from pathlib import Path
+
+import bson
+import click
+import numpy as np
+from langchain_core.documents import Document as LangChainDocument
+from loguru import logger
+
+from src.slack_integrations_offline.domain.document import Document
+from src.slack_integrations_offline.infrastructure.mongodb.service import MongoDBService
+from src.slack_integrations_offline.rag.embedding_storage import EmbeddingCodec
+from src.slack_integrations_offline.rag.embeddings import get_embedding_model
+from src.slack_integrations_offline.rag.splitters import get_splitter
+
+
+@click.command(
+    help="""
+    Compare the storage size, insert throughput and recall of the embedding storage modes."""
+)
+@click.option(
+    "--data-dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=Path("data/crawled"),
+    help="Directory containing the crawled JSON documents.",
+)
+@click.option(
+    "--embedding-model-id",
+    default="text-embedding-3-small",
+    help="Embedding model used to embed the chunks, e.g. 'local:sentence-transformers/all-MiniLM-L6-v2'.",
+)
+@click.option(
+    "--chunk-size",
+    type=int,
+    default=2000,
+    help="Maximum size of each text chunk in tokens.",
+)
+@click.option(
+    "--max-chunks",
+    type=int,
+    default=2000,
+    help="Maximum number of chunks to embed.",
+)
+@click.option(
+    "--queries",
+    type=int,
+    default=100,
+    help="Number of held-out chunks used as queries for the recall measure.",
+)
+@click.option(
+    "--top-k",
+    type=int,
+    default=10,
+    help="Number of neighbours compared for the recall measure.",
+)
+@click.option(
+    "--dims",
+    default="512,256",
+    help="Comma separated Matryoshka truncation dimensions to benchmark.",
+)
+@click.option(
+    "--insert/--no-insert",
+    default=True,
+    help="Whether to measure insert throughput and collection size in MongoDB.",
+)
+def main(
+    data_dir: Path,
+    embedding_model_id: str,
+    chunk_size: int,
+    max_chunks: int,
+    queries: int,
+    top_k: int,
+    dims: str,
+    insert: bool,
+) -> None:
+
+    splitter = get_splitter(chunk_size=chunk_size, splitter_type="markdown")
+
+    documents = [Document.from_file(path) for path in sorted(data_dir.glob("*.json"))]
+    chunks = splitter.split_documents(
+        [
+            LangChainDocument(page_content=document.content, metadata={"url": document.metadata.url})
+            for document in documents
+            if document.content
+        ]
+    )
+    random.Random(0).shuffle(chunks)
+    chunks = chunks[:max_chunks + queries]
+
+    logger.info(f"Embedding {len(chunks)} chunks from {len(documents)} documents with '{embedding_model_id}'")
+
+    embedding_model = get_embedding_model(model_id=embedding_model_id)
+    embeddings = np.asarray(
+        embedding_model.embed_documents([chunk.page_content for chunk in chunks]), dtype=np.float32
+    )
+
+    query_embeddings, corpus_embeddings = embeddings[:queries], embeddings[queries:]
+    corpus_chunks = chunks[queries:]
+    exact_top_k = top_k_indices(query_embeddings, corpus_embeddings, top_k)
+
+    configurations = [("array", 0), ("float32", 0), ("int8", 0)]
+    for dim in (int(value) for value in dims.split(",") if value.strip()):
+        configurations += [("float32", dim), ("int8", dim)]
+
+    print(
+        f"{'storage':>8} {'dim':>5} | {'bytes/vector':>12} | {'vs array':>8} | "
+        f"{'recall@' + str(top_k):>9} | {'inserts/s':>9} | {'storage MB':>10}"
+    )
+
+    baseline_bytes = None
+
+    for storage, dim in configurations:
+        codec = EmbeddingCodec(storage=storage, dimensions=dim)
+
+        encoded = [codec.encode(embedding.tolist()) for embedding in corpus_embeddings]
+        vector_bytes = np.mean([len(bson.encode({"embedding": value})) for value in encoded])
+        baseline_bytes = baseline_bytes or vector_bytes
+
+        decoded_corpus = np.stack([codec.decode(value) for value in encoded])
+        decoded_queries = np.stack(
+            [codec.decode(codec.encode(embedding.tolist())) for embedding in query_embeddings]
+        )
+        approx_top_k = top_k_indices(decoded_queries, decoded_corpus, top_k)
+        recall = np.mean(
+            [len(set(exact) & set(approx)) / top_k for exact, approx in zip(exact_top_k, approx_top_k)]
+        )
+
+        inserts_per_second, storage_mb = (
+            measure_insert(corpus_chunks, encoded) if insert else (0.0, 0.0)
+        )
+
+        print(
+            f"{storage:>8} {dim or embeddings.shape[1]:>5} | {vector_bytes:>12.0f} | "
+            f"{vector_bytes / baseline_bytes:>8.2f} | {recall:>9.3f} | "
+            f"{inserts_per_second:>9.1f} | {storage_mb:>10.2f}"
+        )
+
+
+
+def top_k_indices(queries: np.ndarray, corpus: np.ndarray, k: int) -> np.ndarray:
+    """Get the indices of the ``k`` corpus vectors with the highest dot product for each query."""
+
+    scores = queries @ corpus.T
+    top = np.argpartition(-scores, kth=min(k, corpus.shape[0] - 1), axis=1)[:, :k]
+
+    return np.take_along_axis(
+        top, np.argsort(-np.take_along_axis(scores, top, axis=1), axis=1), axis=1
+    )
+
+
+
+def measure_insert(
+    chunks: list[LangChainDocument], encoded: list, collection_name: str = "rag_storage_benchmark",
+) -> tuple[float, float]:
+    """Insert the encoded chunks into a scratch collection and measure throughput and size.
+
+    Returns:
+        tuple[float, float]: Inserted chunks per second and collection storage size in MB.
+    """
+
+    records = [
+        {"chunk": chunk.page_content, "embedding": value, **chunk.metadata}
+        for chunk, value in zip(chunks, encoded)
+    ]
+
+    with MongoDBService(model=Document, collection_name=collection_name) as service:
+        service.collection.drop()
+
+        start = time.perf_counter()
+        for i in range(0, len(records), 500):
+            service.collection.insert_many(records[i:i + 500], ordered=False)
+        seconds = time.perf_counter() - start
+
+        stats = service.database.command("collStats", collection_name)
+        service.collection.drop()
+
+    return len(records) / seconds if seconds else 0.0, stats.get("storageSize", 0) / 1e6
+
+
+if __name__ == "__main__":
+    main()
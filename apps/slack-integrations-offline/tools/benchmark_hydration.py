@@ -0,0 +1,108 @@
+import time
+
+import bson
+import click
+from bson import ObjectId
+
+from src.slack_integrations_offline.domain.document import Document
+from src.slack_integrations_offline.infrastructure.mongodb.hydration import (
+    OBJECT_ID_AS_STR_CODEC_OPTIONS,
+    ModelHydrator,
+)
+
+
+@click.command(
+    help="""
+    Compare per-document and bulk hydration of MongoDB documents into Document models."""
+)
+@click.option(
+    "--documents",
+    type=int,
+    default=100_000,
+    help="Number of synthetic documents to hydrate.",
+)
+@click.option(
+    "--content-size",
+    type=int,
+    default=2000,
+    help="Number of characters of every document content.",
+)
+@click.option(
+    "--repeat",
+    type=int,
+    default=3,
+    help="Number of timed passes for each hydration path.",
+)
+def main(documents: int, content_size: int, repeat: int) -> None:
+
+    payload = b"".join(
+        bson.encode(
+            {
+                "_id": ObjectId(),
+                "id": f"{i:032x}",
+                "metadata": {
+                    "id": f"{i:032x}",
+                    "url": f"https://docs.example.com/page-{i}",
+                    "title": f"Page {i}",
+                    "properties": {"description": "Synthetic page", "source": "benchmark"},
+                },
+                "content": "x" * content_size,
+                "summary": None,
+                "content_quality_score": 0.5,
+                "child_urls": [f"https://docs.example.com/page-{i}/child-{j}" for j in range(5)],
+            }
+        )
+        for i in range(documents)
+    )
+
+    hydrator = ModelHydrator(Document)
+
+    def decode_default() -> list[dict]:
+        return bson.decode_all(payload)
+
+    def decode_with_codec() -> list[dict]:
+        return bson.decode_all(payload, codec_options=OBJECT_ID_AS_STR_CODEC_OPTIONS)
+
+    def per_document(docs: list[dict]) -> list[Document]:
+        parsed = []
+        for doc in docs:
+            for key, value in doc.items():
+                if isinstance(value, ObjectId):
+                    doc[key] = str(value)
+
+            doc["id"] = doc.pop("_id", None)
+            parsed.append(Document.model_validate(doc))
+
+        return parsed
+
+    print(f"{'path':>28}: {'decode':>8} | {'hydrate':>8} | {'total':>8} | {'docs/s':>10} | speedup")
+
+    baseline = None
+    for name, decode, hydrate in (
+        ("per-document model_validate", decode_default, per_document),
+        ("TypeAdapter(list[Document])", decode_with_codec, hydrator.hydrate),
+        ("trusted model_construct", decode_with_codec, lambda docs: hydrator.hydrate(docs, trusted=True)),
+    ):
+        decode_timings, hydrate_timings = [], []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            docs = decode()
+            decoded_at = time.perf_counter()
+            models = hydrate(docs)
+            decode_timings.append(decoded_at - start)
+            hydrate_timings.append(time.perf_counter() - decoded_at)
+
+        assert len(models) == documents and models[-1].metadata.url.endswith(f"page-{documents - 1}")
+
+        decode_seconds, hydrate_seconds = min(decode_timings), min(hydrate_timings)
+        total = decode_seconds + hydrate_seconds
+        baseline = baseline or total
+
+        print(
+            f"{name:>28}: {decode_seconds:7.3f}s | {hydrate_seconds:7.3f}s | {total:7.3f}s | "
+            f"{documents / total:10.0f} | {baseline / total:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
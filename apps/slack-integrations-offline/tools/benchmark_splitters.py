@@ -0,0 +1,73 @@
+import time
+from pathlib import Path
+
+import click
+from loguru import logger
+
+from src.slack_integrations_offline.domain.document import Document
+from src.slack_integrations_offline.rag.splitters import get_splitter
+
+
+@click.command(
+    help="""
+    Compare the recursive and the offset-based token splitters on crawled documents."""
+)
+@click.option(
+    "--data-dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=Path("data/crawled"),
+    help="Directory containing the crawled JSON documents.",
+)
+@click.option(
+    "--chunk-size",
+    type=int,
+    default=2000,
+    help="Maximum size of each text chunk in tokens.",
+)
+@click.option(
+    "--repeat",
+    type=int,
+    default=3,
+    help="Number of timed passes over the corpus for each splitter.",
+)
+def main(data_dir: Path, chunk_size: int, repeat: int) -> None:
+
+    documents = [Document.from_file(path) for path in sorted(data_dir.glob("*.json"))]
+    texts = [document.content for document in documents if document.content]
+    total_chars = sum(len(text) for text in texts)
+
+    logger.info(f"Loaded {len(texts)} documents ({total_chars} characters) from '{data_dir}'")
+
+    results: dict[str, list[list[str]]] = {}
+
+    for splitter_type in ("recursive", "token"):
+        splitter = get_splitter(chunk_size=chunk_size, splitter_type=splitter_type)
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            chunks = [splitter.split_text(text) for text in texts]
+            timings.append(time.perf_counter() - start)
+
+        results[splitter_type] = chunks
+        best = min(timings)
+        chunk_count = sum(len(doc_chunks) for doc_chunks in chunks)
+
+        print(
+            f"{splitter_type:>10}: {best:8.3f}s best of {repeat} | "
+            f"{len(texts) / best:8.1f} docs/s | {total_chars / best / 1e6:6.2f} MB/s | "
+            f"{chunk_count} chunks"
+        )
+
+    recursive_chunks = [chunk for doc_chunks in results["recursive"] for chunk in doc_chunks]
+    token_chunks = {chunk for doc_chunks in results["token"] for chunk in doc_chunks}
+    identical = sum(chunk in token_chunks for chunk in recursive_chunks)
+
+    print(
+        f"Identical chunks: {identical}/{len(recursive_chunks)} "
+        f"({100 * identical / max(len(recursive_chunks), 1):.1f}%)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,32 @@
+import asyncio
 import os
 import json
 import warnings
+from dataclasses import dataclass
+from typing import AsyncIterator
 
 from loguru import logger
 
 from langgraph.graph import StateGraph, MessagesState, START, END
 from langgraph.prebuilt import ToolNode, tools_condition
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
 
-from src.slack_integrations_online.application.agents.tools.memory_tools import search_memory, add_to_memory
-from src.slack_integrations_online.application.agents.tools.mongodb_retriever_tools import mongodb_retriever_tool, get_complete_docs_with_url
+from src.slack_integrations_online.application.agents.answer_cache import SemanticAnswerCache
+from src.slack_integrations_online.application.rag.retrievers import get_cached_embedding_model
+from src.slack_integrations_online.config import settings
+from src.slack_integrations_online.application.agents.tools.memory_tools import (
+    SHARES_QUERY_EMBEDDING,
+    search_memory,
+    add_to_memory,
+    aadd_to_memory,
+    asearch_memory,
+)
+from src.slack_integrations_online.application.agents.tools.mongodb_retriever_tools import (
+    mongodb_retriever_tool,
+    get_complete_docs_with_url,
+    asearch_documents,
+)
 
 warnings.filterwarnings("ignore", category=DeprecationWarning)
 
@@ -39,31 +55,79 @@ Determine if the user is asking about their previous memories/conversations or a
 - If information is not found, say "I don't have enough information to answer this question"
 - Always cite document URLs in your final answer at the end, when using information from documents
 - Only use get_complete_docs_with_url when chunks are relevant to the query but lack sufficient detail or context
+- When the missing detail belongs to a single section, pass the chunk's <section> to get_complete_docs_with_url instead of fetching the whole page
 """
 
 
+PREFETCH_INSTRUCTIONS = """
+**Prefetched context:**
+search_memory and mongodb_retriever_tool were already called with the user's question, their results are in the conversation.
+Do NOT call them again with the same query. Call mongodb_retriever_tool again only if you need to search with a different query.
+"""
+
 
 model = ChatOpenAI(model="gpt-4o-mini")
 tools = [search_memory, mongodb_retriever_tool, get_complete_docs_with_url, add_to_memory]
 
 
-def create_agent_graph():
-    """Create a LangGraph agent with tools using StateGraph."""
+def create_agent_graph(prefetch: bool = settings.AGENT_PREFETCH):
+    """Create a LangGraph agent with tools using StateGraph.
+
+    Args:
+        prefetch: Whether to run the memory search and the document search for the question
+            concurrently before the first model call, so most questions are answered in one
+            model turn instead of two tool round trips.
+    """
     
     # Bind tools to model
     model_with_tools = model.bind_tools(tools)
     logger.info(f"📦 Model bound with {len(tools)} tools: {[t.name for t in tools]}")
+
+    instructions = INSTRUCTIONS + PREFETCH_INSTRUCTIONS if prefetch else INSTRUCTIONS
+
+    # Deterministic first step: call both search tools concurrently for the question
+    async def prefetch_context(state: MessagesState):
+        query = next(
+            (msg.content for msg in reversed(state["messages"]) if isinstance(msg, HumanMessage)), ""
+        )
+
+        logger.info(f"🔎 Prefetching memory and documents for: '{query}'")
+
+        # Embed the question once for both searches. With the answer cache on, the embedding
+        # model's query cache already holds it.
+        query_embedding = None
+        if SHARES_QUERY_EMBEDDING:
+            query_embedding = await get_cached_embedding_model(settings.EMBEDDING_MODEL_ID).aembed_query(query)
+
+        memory_result, documents_result = await asyncio.gather(
+            asearch_memory(query, query_embedding=query_embedding),
+            asearch_documents(query, query_embedding=query_embedding),
+        )
+
+        # Injected as a tool call turn, so the model sees them like results of its own calls
+        tool_calls = [
+            {"name": search_memory.name, "args": {"query": query}, "id": "prefetch_search_memory"},
+            {"name": mongodb_retriever_tool.name, "args": {"query": query}, "id": "prefetch_retriever"},
+        ]
+
+        return {
+            "messages": [
+                AIMessage(content="", tool_calls=tool_calls),
+                ToolMessage(content=memory_result, tool_call_id="prefetch_search_memory"),
+                ToolMessage(content=documents_result, tool_call_id="prefetch_retriever"),
+            ]
+        }
     
     # Define the function that calls the model
-    def call_model(state: MessagesState):
+    async def call_model(state: MessagesState):
         messages = state["messages"]
         
         # Add system message if not present or if it's the first message
         if not messages or not any(isinstance(msg, SystemMessage) for msg in messages):
-            messages = [SystemMessage(content=INSTRUCTIONS)] + messages
+            messages = [SystemMessage(content=instructions)] + messages
         
         logger.info(f"🤖 Agent processing {len(messages)} messages")
-        response = model_with_tools.invoke(messages)
+        response = await model_with_tools.ainvoke(messages)
         
         # Check if agent wants to use tools
         if hasattr(response, 'tool_calls') and response.tool_calls:
@@ -83,7 +147,12 @@ def create_agent_graph():
     workflow.add_node("tools", ToolNode(tools))
     
     # Add edges
-    workflow.add_edge(START, "agent")
+    if prefetch:
+        workflow.add_node("prefetch", prefetch_context)
+        workflow.add_edge(START, "prefetch")
+        workflow.add_edge("prefetch", "agent")
+    else:
+        workflow.add_edge(START, "agent")
     workflow.add_conditional_edges(
         "agent",
         tools_condition,
@@ -101,16 +170,71 @@ for tool in tools:
     logger.info(f"   🔧 {tool.name}: {tool.description[:100]}...")
 
 
+_answer_cache = None
+
+# Keeps the memory writes of cached answers referenced until they finish
+_background_tasks: set[asyncio.Task] = set()
+
+
+def get_answer_cache() -> SemanticAnswerCache | None:
+    """Get the process-wide semantic answer cache, or None if it is disabled."""
+
+    global _answer_cache
+
+    if _answer_cache is None and settings.ANSWER_CACHE_SIZE > 0:
+        _answer_cache = SemanticAnswerCache(
+            embeddings=get_cached_embedding_model(settings.EMBEDDING_MODEL_ID),
+            threshold=settings.ANSWER_CACHE_SIMILARITY_THRESHOLD,
+            ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+            max_size=settings.ANSWER_CACHE_SIZE,
+            version_check_seconds=settings.ANSWER_CACHE_VERSION_CHECK_SECONDS,
+        )
+
+    return _answer_cache
+
+
+TOOL_PROGRESS = {
+    "search_memory": "Checking past conversations…",
+    "mongodb_retriever_tool": "Searching docs…",
+    "get_complete_docs_with_url": "Reading the full page…",
+    "add_to_memory": "Saving this conversation…",
+    "prefetch": "Searching docs and past conversations…",
+}
+
+
+@dataclass
+class AgentEvent:
+    """Event streamed while the agent answers.
+
+    Attributes:
+        kind: "progress" when a tool or the prefetch node starts, "token" when the answer grows, and "answer" once,
+            with the final answer, when the run ends.
+        text: Progress line for "progress" events, the answer so far otherwise.
+    """
+
+    kind: str
+    text: str
+
+
 class SupportAgentsManager():
-    """Manager for running support agents with memory context and trace logging."""
+    """Manager for running support agents with memory context and trace logging.
+
+    Answers are served from the semantic answer cache when a near-duplicate query of the same
+    user was answered recently.
+    """
     
     def __init__(self) -> None:
-        pass
+        self.answer_cache = get_answer_cache()
 
     async def run(self, query: str, user_id: str = "default_user") -> str:
         try:
             logger.info(f"🎬 Starting agent for user: {user_id}")
             logger.info(f"   📝 Query: '{query}'")
+
+            cached, embedding = await self._lookup_cache(query, user_id)
+            if cached is not None:
+                await self._remember(query, cached)
+                return cached
             
             inputs = {"messages": [HumanMessage(content=query)]}  # Simplified message
             config = {"configurable": {"user_id": user_id}}
@@ -124,6 +248,9 @@ class SupportAgentsManager():
                 logger.info("✅ Agent successfully answered using MongoDB documents!")
             else:
                 logger.info(f"✅ Agent response generated")
+
+            if embedding is not None and final_output:
+                self.answer_cache.store(query, user_id, embedding, final_output)
             
             return final_output
 
@@ -131,4 +258,99 @@ class SupportAgentsManager():
             logger.error(f"❌ Error: {str(e)}")
             import traceback
             traceback.print_exc()
-            return f"I encountered an error: {str(e)}"
\ No newline at end of file
+            return f"I encountered an error: {str(e)}"
+
+    async def stream(self, query: str, user_id: str = "default_user") -> AsyncIterator[AgentEvent]:
+        """Run the agent and stream its progress and answer tokens from the LangGraph event stream.
+
+        Model turns ending with tool calls are not part of the answer, so the answer restarts
+        from scratch with every model turn. Errors are reported as the answer, like ``run``.
+
+        Args:
+            query: User query.
+            user_id: User the answer is generated for.
+
+        Yields:
+            AgentEvent: Progress lines, the growing answer, then the final answer.
+        """
+
+        try:
+            logger.info(f"🎬 Streaming agent for user: {user_id}")
+            logger.info(f"   📝 Query: '{query}'")
+
+            cached, embedding = await self._lookup_cache(query, user_id)
+            if cached is not None:
+                # Recorded in the background, so the answer is not held back by the memory write
+                task = asyncio.create_task(self._remember(query, cached))
+                _background_tasks.add(task)
+                task.add_done_callback(_background_tasks.discard)
+
+                yield AgentEvent("answer", cached)
+                return
+
+            inputs = {"messages": [HumanMessage(content=query)]}
+            config = {"configurable": {"user_id": user_id}}
+
+            answer = ""
+            async for event in agent_graph.astream_events(inputs, config=config, version="v2"):
+                kind = event["event"]
+
+                if kind == "on_chat_model_start":
+                    answer = ""
+
+                elif kind == "on_chat_model_stream":
+                    content = event["data"]["chunk"].content
+                    if isinstance(content, str) and content:
+                        answer += content
+                        yield AgentEvent("token", answer)
+
+                elif kind == "on_chat_model_end":
+                    if getattr(event["data"].get("output"), "tool_calls", None):
+                        answer = ""
+
+                elif kind in ("on_tool_start", "on_chain_start") and event["name"] in TOOL_PROGRESS:
+                    yield AgentEvent("progress", TOOL_PROGRESS[event["name"]])
+
+            logger.info(f"✅ Agent response streamed")
+
+            if embedding is not None and answer:
+                self.answer_cache.store(query, user_id, embedding, answer)
+
+            yield AgentEvent("answer", answer)
+
+        except Exception as e:
+            logger.error(f"❌ Error: {str(e)}")
+            yield AgentEvent("answer", f"I encountered an error: {str(e)}")
+
+    async def _lookup_cache(self, query: str, user_id: str) -> tuple[str | None, object]:
+        """Look the query up in the answer cache.
+
+        Returns:
+            tuple: The cached answer or None, and the query embedding to cache the new answer
+                with, or None if the cache is disabled or failed.
+        """
+
+        if self.answer_cache is None:
+            return None, None
+
+        try:
+            embedding = await self.answer_cache.embed(query)
+            cached = await self.answer_cache.lookup(query, user_id, embedding)
+            if cached is not None:
+                logger.info("✅ Answer served from cache")
+                return cached.answer, None
+
+            return None, embedding
+
+        except Exception as e:
+            logger.warning(f"Answer cache lookup failed: {str(e)}")
+            return None, None
+
+    async def _remember(self, query: str, answer: str) -> None:
+        """Store a cached exchange in memory, as the agent does with ``add_to_memory`` on a miss.
+
+        Memories are written for the same user as the ``add_to_memory`` tool, so the memory
+        searches of later runs find them.
+        """
+
+        await aadd_to_memory(f"User asked: {query}\nAssistant answered: {answer}", "default_user")
@@ -0,0 +1,228 @@
+import asyncio
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from loguru import logger
+from pydantic import BaseModel
+
+from src.slack_integrations_online.infrastructure.mongodb.service import AsyncMongoDBService
+
+
+@dataclass
+class CachedAnswer:
+    """Answer of the agent to a query, as stored in the answer cache.
+
+    Attributes:
+        query: Query the answer was generated for.
+        answer: Final answer of the agent, with the document URLs it cites.
+        created_at: Monotonic time the answer was cached at.
+    """
+
+    query: str
+    answer: str
+    created_at: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class AnswerCacheStats:
+    """Counters of the semantic answer cache.
+
+    Attributes:
+        hits: Queries answered from the cache.
+        misses: Queries without a similar enough cached answer.
+        expirations: Entries dropped because their TTL elapsed.
+        evictions: Entries dropped to respect the size limit.
+        invalidations: Times the cache was cleared because the rag collection changed.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    expirations: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+    def to_metadata(self) -> dict:
+        """Serialize the counters and the hit rate into a JSON friendly dictionary."""
+
+        lookups = self.hits + self.misses
+
+        return {**asdict(self), "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0}
+
+
+class SemanticAnswerCache:
+    """Cache of agent answers looked up by query embedding similarity.
+
+    A query hits the cache when the cosine similarity between its embedding and the embedding
+    of a cached query of the same user is at least ``threshold``. Entries expire after
+    ``ttl_seconds``, the least recently used entries are evicted beyond ``max_size``, and the
+    whole cache is cleared when the version of the ``rag`` collection, bumped by every offline
+    compute_rag run, changes.
+
+    Attributes:
+        embeddings: Embedding model used to embed the queries.
+        threshold: Minimum cosine similarity for a cached answer to be reused.
+        ttl_seconds: Lifetime of a cached answer.
+        max_size: Maximum number of cached answers.
+        version_check_seconds: Minimum interval between two checks of the rag collection version.
+        stats: Hit, miss and eviction counters.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        threshold: float = 0.95,
+        ttl_seconds: float = 3600.0,
+        max_size: int = 512,
+        version_check_seconds: float = 30.0,
+        collection_name: str = "rag",
+    ) -> None:
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self.version_check_seconds = version_check_seconds
+        self.collection_name = collection_name
+        self.stats = AnswerCacheStats()
+
+        self._entries: OrderedDict[int, tuple[str, np.ndarray, CachedAnswer]] = OrderedDict()
+        self._next_key = 0
+        self._matrix: np.ndarray | None = None
+        self._matrix_keys: list[int] = []
+        self._version: int | None = None
+        self._version_checked_at = float("-inf")
+        self._version_lock = asyncio.Lock()
+
+
+    async def embed(self, query: str) -> np.ndarray:
+        """Embed a query into a unit vector."""
+
+        embedding = np.asarray(await self.embeddings.aembed_query(query), dtype=np.float32)
+        norm = np.linalg.norm(embedding)
+
+        return embedding / norm if norm else embedding
+
+
+    async def lookup(self, query: str, user_id: str, embedding: np.ndarray) -> CachedAnswer | None:
+        """Find the cached answer of the most similar query of a user.
+
+        Args:
+            query: User query.
+            user_id: User the answer was generated for.
+            embedding: Unit embedding of the query, from ``embed``.
+
+        Returns:
+            CachedAnswer | None: The cached answer, or None if no cached query is similar enough.
+        """
+
+        await self._check_version()
+        self._expire()
+
+        if self._entries:
+            if self._matrix is None:
+                self._matrix_keys = list(self._entries)
+                self._matrix = np.stack([self._entries[key][1] for key in self._matrix_keys])
+
+            similarities = self._matrix @ embedding
+
+            for index in np.argsort(similarities)[::-1]:
+                if similarities[index] < self.threshold:
+                    break
+
+                key = self._matrix_keys[index]
+                owner, _, answer = self._entries[key]
+                if owner != user_id:
+                    continue
+
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                logger.info(
+                    f"Answer cache hit (similarity {similarities[index]:.3f}) "
+                    f"for '{query}' with cached '{answer.query}'"
+                )
+
+                return answer
+
+        self.stats.misses += 1
+
+        return None
+
+
+    def store(self, query: str, user_id: str, embedding: np.ndarray, answer: str) -> CachedAnswer:
+        """Cache the answer to a query, evicting the least recently used answers if full.
+
+        Args:
+            query: User query.
+            user_id: User the answer was generated for.
+            embedding: Unit embedding of the query, from ``embed``.
+            answer: Final answer of the agent.
+
+        Returns:
+            CachedAnswer: The cached entry.
+        """
+
+        cached = CachedAnswer(query=query, answer=answer)
+
+        self._entries[self._next_key] = (user_id, embedding, cached)
+        self._next_key += 1
+        self._matrix = None
+
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+        return cached
+
+
+    def clear(self) -> None:
+        """Drop every cached answer."""
+
+        self._entries.clear()
+        self._matrix = None
+
+
+    def _expire(self) -> None:
+        """Drop the answers older than the TTL."""
+
+        deadline = time.monotonic() - self.ttl_seconds
+        expired = [key for key, (_, _, answer) in self._entries.items() if answer.created_at < deadline]
+
+        for key in expired:
+            del self._entries[key]
+
+        if expired:
+            self._matrix = None
+            self.stats.expirations += len(expired)
+
+
+    async def _check_version(self) -> None:
+        """Clear the cache if the rag collection version changed since the last check."""
+
+        if time.monotonic() - self._version_checked_at < self.version_check_seconds:
+            return
+
+        async with self._version_lock:
+            if time.monotonic() - self._version_checked_at < self.version_check_seconds:
+                return
+
+            try:
+                version = await AsyncMongoDBService(BaseModel, self.collection_name).get_version()
+
+            except Exception as e:
+                logger.warning(f"Could not read the '{self.collection_name}' collection version: {e}")
+                return
+
+            self._version_checked_at = time.monotonic()
+
+            if self._version is not None and version != self._version:
+                logger.info(
+                    f"Collection '{self.collection_name}' changed from version {self._version} "
+                    f"to {version}, clearing {len(self._entries)} cached answers"
+                )
+                self.clear()
+                self.stats.invalidations += 1
+
+            self._version = version
@@ -1,11 +1,13 @@
 import os
+from contextvars import ContextVar
+
 from mem0 import AsyncMemory
 from mem0.configs.base import MemoryConfig, EmbedderConfig, VectorStoreConfig, LlmConfig
 
 from langchain.tools import tool
 from loguru import logger
-import asyncio
 
+from src.slack_integrations_online.application.rag.retrievers import get_cached_embedding_model
 from src.slack_integrations_online.config import settings
 
 # ------------------------------------------------------------------
@@ -13,15 +15,58 @@ from src.slack_integrations_online.config import settings
 # ------------------------------------------------------------------
 os.environ["OPENAI_API_KEY"] = settings.OPENAI_API_KEY
 
+# ------------------------------------------------------------------
+# SHARED QUERY EMBEDDING
+# ------------------------------------------------------------------
+MEMORY_EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Memories and rag chunks are embedded with the same model, so one query vector serves both
+SHARES_QUERY_EMBEDDING = settings.EMBEDDING_MODEL_ID.removeprefix("openai:") == MEMORY_EMBEDDING_MODEL
+
+_query_embedding: ContextVar[tuple[str, list[float]] | None] = ContextVar("query_embedding", default=None)
+
+
+class SharedQueryEmbedding:
+    """mem0 embedder reusing the query embedding already computed for the agent run.
+
+    mem0 embeds search queries itself, in a worker thread. When ``asearch_memory`` is given the
+    query embedding, it is published in a context variable, which ``asyncio.to_thread`` copies
+    into that thread, and returned instead of embedding the query again. Other searches go
+    through the shared query embedding model, so they hit its query cache when the retriever
+    embedded the same text. Memories themselves are embedded by the wrapped embedder.
+
+    Attributes:
+        embedder: mem0 embedder used for memories.
+        query_embeddings: Shared LangChain embedding model used for searches.
+    """
+
+    def __init__(self, embedder, query_embeddings) -> None:
+        self.embedder = embedder
+        self.query_embeddings = query_embeddings
+
+    def __getattr__(self, name: str):
+        return getattr(self.embedder, name)
+
+    def embed(self, text, memory_action=None):
+        shared = _query_embedding.get()
+        if memory_action == "search" and shared is not None and shared[0] == text:
+            return shared[1]
+
+        if memory_action == "search":
+            return self.query_embeddings.embed_query(text)
+
+        return self.embedder.embed(text, memory_action)
+
+
 # ------------------------------------------------------------------
 # MEM0 CONFIG with error handling
 # ------------------------------------------------------------------
-memory = {}
+memory = None
 try:
     memory_config = MemoryConfig(
         embedder=EmbedderConfig(
             provider="openai",
-            config={"model": "text-embedding-3-small"},
+            config={"model": MEMORY_EMBEDDING_MODEL},
         ),
         llm=LlmConfig(
             provider="openai",
@@ -39,6 +84,10 @@ try:
     )
     
     memory = AsyncMemory(config=memory_config)
+    if SHARES_QUERY_EMBEDDING:
+        memory.embedding_model = SharedQueryEmbedding(
+            memory.embedding_model, get_cached_embedding_model(settings.EMBEDDING_MODEL_ID)
+        )
     logger.info("Memory system initialized successfully")
     
 except Exception as e:
@@ -46,31 +95,35 @@ except Exception as e:
     logger.info("ℹContinuing without memory functionality")
 
 # ------------------------------------------------------------------
-# SYNC TOOLS (for LangGraph)
+# ASYNC TOOLS (for LangGraph)
 # ------------------------------------------------------------------
 
 @tool
-def search_memory(query: str) -> str:
+async def search_memory(query: str) -> str:
     """
     Search conversational memory.
     Returns 'No previous conversations found.' if nothing is found.
     """
-    try:
-        if memory is None:
-            logger.info("ℹ Memory system not available")
-            return "Memory system not available."
-        
-        # Run async function in sync context
-        return asyncio.run(_search_memory_async(query, "default_user"))
-    except Exception as e:
-        logger.error(f"Memory search failed: {str(e)}")
-        return "No previous conversations found."
+    return await asearch_memory(query, "default_user")
+
 
+async def asearch_memory(
+    query: str, user_id: str = "default_user", query_embedding: list[float] | None = None
+) -> str:
+    """Search the memories of a user and format them for the agent.
 
-async def _search_memory_async(query: str, user_id: str = "default_user") -> str:
-    """Async implementation."""
+    Used by the ``search_memory`` tool and by the prefetch node of the agent graph.
+
+    Args:
+        query: Query to search the memories with.
+        user_id: User whose memories are searched.
+        query_embedding: Embedding of the query with ``MEMORY_EMBEDDING_MODEL``, reused instead
+            of embedding the query again.
+    """
+    token = _query_embedding.set((query, query_embedding)) if query_embedding is not None else None
     try:
         if memory is None:
+            logger.info("ℹ Memory system not available")
             return "Memory system not available."
             
         logger.info(f"Searching memory for user: {user_id}")
@@ -93,29 +146,27 @@ async def _search_memory_async(query: str, user_id: str = "default_user") -> str
     except Exception as e:
         logger.error(f"Memory search failed: {str(e)}")
         return "No previous conversations found."
+    finally:
+        if token is not None:
+            _query_embedding.reset(token)
 
 
 @tool
-def add_to_memory(content: str) -> str:
+async def add_to_memory(content: str) -> str:
     """
     Store content into long-term memory.
     """
-    try:
-        if memory is None:
-            logger.info("ℹMemory system not available")
-            return "Memory system not available."
-            
-        # Run async function in sync context
-        return asyncio.run(_add_to_memory_async(content, "default_user"))
-    except Exception as e:
-        logger.error(f"Failed to store memory: {str(e)}")
-        return f"Error storing memory: {str(e)}"
+    return await aadd_to_memory(content, "default_user")
+
 
+async def aadd_to_memory(content: str, user_id: str = "default_user") -> str:
+    """Store content into the memories of a user.
 
-async def _add_to_memory_async(content: str, user_id: str = "default_user") -> str:
-    """Async implementation."""
+    Used by the ``add_to_memory`` tool and by the agent manager for answers served from cache.
+    """
     try:
         if memory is None:
+            logger.info("ℹMemory system not available")
             return "Memory system not available."
             
         logger.info(f" Storing memory for user: {user_id}")
@@ -128,4 +179,4 @@ async def _add_to_memory_async(content: str, user_id: str = "default_user") -> s
         return "Memory stored successfully."
     except Exception as e:
         logger.error(f"Failed to store memory: {str(e)}")
-        return f"Error storing memory: {str(e)}"
\ No newline at end of file
+        return f"Error storing memory: {str(e)}"
@@ -1,50 +1,56 @@
 from langchain.tools import tool
 from loguru import logger
-import asyncio
 
-from src.slack_integrations_online.application.rag.retrievers import get_retriever
+from src.slack_integrations_online.application.rag.embedding_storage import EncodedEmbeddings
+from src.slack_integrations_online.application.rag.retrievers import ahybrid_search, get_cached_retriever
+from src.slack_integrations_online.config import settings
 from src.slack_integrations_online.application.rag.single_document_retriever import (
-    get_single_document,
+    aget_single_document,
 )
 
 
 # ---------------------------------------------------------
-# SYNC TOOLS (for LangGraph)
+# ASYNC TOOLS (for LangGraph)
 # ---------------------------------------------------------
 
 @tool
-def mongodb_retriever_tool(query: str) -> str:
+async def mongodb_retriever_tool(query: str) -> str:
     """
     Retrieve relevant documents from MongoDB using vector search.
     Returns '__NO_CONTEXT__' if no relevant documents are found.
     """
     logger.info(f"mongodb_retriever_tool called with query: '{query}'")
-    try:
-        # Run async function in sync context
-        result = asyncio.run(_mongodb_retriever_tool_async(query))
-        logger.info(f"mongodb_retriever_tool returned {len(result)} characters")
-        return result
-    except Exception as e:
-        logger.error(f"MongoDB retriever tool failed: {str(e)}")
-        import traceback
-        traceback.print_exc()
-        return "__NO_CONTEXT__"
+
+    return await asearch_documents(query)
 
 
-async def _mongodb_retriever_tool_async(query: str) -> str:
-    """Async implementation."""
-    logger.info(f"Starting MongoDB search for: '{query}'")
+async def asearch_documents(query: str, query_embedding: list[float] | None = None) -> str:
+    """Search the rag collection and format the results for the agent.
+
+    Used by the ``mongodb_retriever_tool`` tool and by the prefetch node of the agent graph.
+
+    Args:
+        query: Query to search the documents with.
+        query_embedding: Full precision embedding of the query with ``EMBEDDING_MODEL_ID``,
+            reused instead of embedding the query again.
+    """
     try:
-        retriever = get_retriever(
-            embedding_model_id="text-embedding-3-small",
+        retriever = get_cached_retriever(
+            embedding_model_id=settings.EMBEDDING_MODEL_ID,
             k=3,
         )
-        logger.info(f"Retriever created successfully")
 
-        # Run the synchronous invoke in a thread pool
-        loop = asyncio.get_event_loop()
+        query_vector = None
+        if query_embedding is not None:
+            embeddings = retriever.vectorstore.embeddings
+            query_vector = (
+                embeddings.codec.encode(query_embedding)
+                if isinstance(embeddings, EncodedEmbeddings)
+                else query_embedding
+            )
+
         logger.info(f"Invoking retriever...")
-        docs = await loop.run_in_executor(None, retriever.invoke, query)
+        docs = await ahybrid_search(retriever, query, query_vector=query_vector)
         logger.info(f"Retriever returned {len(docs)} documents")
 
         if not docs:
@@ -56,15 +62,17 @@ async def _mongodb_retriever_tool_async(query: str) -> str:
         for i, doc in enumerate(docs, start=1):
             title = doc.metadata.get("title", "Untitled")
             url = doc.metadata.get("url", "UNKNOWN_URL")
+            section = doc.metadata.get("section", "")
             content = doc.page_content.strip()
             
-            logger.info(f"Document {i}: {title} | URL: {url} | Content: {len(content)} chars")
+            logger.info(f"Document {i}: {title} | URL: {url} | Section: {section} | Content: {len(content)} chars")
 
             formatted_docs.append(
                 f"""
 <document id="{i}">
 <title>{title}</title>
 <url>{url}</url>
+<section>{section}</section>
 <content>
 {content}
 </content>
@@ -83,7 +91,7 @@ INSTRUCTIONS:
 - Always cite the document URL when using information
 """.strip()
         
-        logger.info(f"MongoDB search completed successfully")
+        logger.info(f"MongoDB search completed successfully, returned {len(final_output)} characters")
         return final_output
 
     except Exception as e:
@@ -92,26 +100,14 @@ INSTRUCTIONS:
 
 
 @tool
-def get_complete_docs_with_url(url: str) -> str:
+async def get_complete_docs_with_url(url: str, section: str = "") -> str:
     """
     Fetch the complete raw document using its URL.
+    Pass the <section> of a search result to fetch only that section of the page.
     """
-    logger.info(f" get_complete_docs_with_url called with URL: '{url}'")
-    try:
-        # Run async function in sync context
-        result = asyncio.run(_get_complete_docs_with_url_async(url))
-        return result
-    except Exception as e:
-        logger.error(f" Failed to fetch full document: {str(e)}")
-        return "__NO_CONTEXT__"
-
-
-async def _get_complete_docs_with_url_async(url: str) -> str:
-    """Async implementation."""
+    logger.info(f" get_complete_docs_with_url called with URL: '{url}' section: '{section}'")
     try:
-        # Run the synchronous function in a thread pool
-        loop = asyncio.get_event_loop()
-        document = await loop.run_in_executor(None, get_single_document, url)
+        document = await aget_single_document(url, section)
 
         if not document or "<error>" in document:
             logger.warning(f" No document found for URL: {url}")
@@ -0,0 +1,192 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Hashable
+
+from loguru import logger
+
+
+@dataclass
+class DispatcherStats:
+    """Counters of a keyed dispatcher.
+
+    Attributes:
+        submitted: Items accepted by the dispatcher.
+        rejected: Items refused because the queue was full.
+        processed: Items handled successfully.
+        failed: Items whose handler raised.
+        max_depth: Highest number of items waiting at the same time.
+        total_wait_seconds: Sum of the times items waited before being handled.
+        max_wait_seconds: Longest time an item waited before being handled.
+    """
+
+    submitted: int = 0
+    rejected: int = 0
+    processed: int = 0
+    failed: int = 0
+    max_depth: int = 0
+    total_wait_seconds: float = 0.0
+    max_wait_seconds: float = 0.0
+
+
+    def to_metadata(self, depth: int = 0) -> dict:
+        """Serialize the counters, the current depth and the average wait time."""
+
+        started = self.processed + self.failed
+
+        return {
+            **asdict(self),
+            "depth": depth,
+            "total_wait_seconds": round(self.total_wait_seconds, 3),
+            "max_wait_seconds": round(self.max_wait_seconds, 3),
+            "avg_wait_seconds": round(self.total_wait_seconds / started, 3) if started else 0.0,
+        }
+
+
+class KeyedDispatcher:
+    """Bounded asyncio work queue processed by a fixed pool of worker tasks.
+
+    Items sharing a key are handled one at a time in submission order, so the follow-ups of a
+    Slack thread are answered in order, while items of different keys run concurrently on up
+    to ``workers`` tasks. When ``max_queue_size`` items are waiting, ``submit`` refuses new
+    items so callers can reply that the bot is busy instead of queueing without bound.
+
+    Attributes:
+        handler: Coroutine function handling a single item.
+        workers: Number of worker tasks.
+        max_queue_size: Maximum number of items waiting to be handled.
+        metrics_interval: Seconds between two metrics log lines. 0 disables them.
+        stats: Queue depth, wait time and outcome counters.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[Any], Awaitable[None]],
+        workers: int = 4,
+        max_queue_size: int = 100,
+        metrics_interval: float = 60.0,
+    ) -> None:
+        self.handler = handler
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.metrics_interval = metrics_interval
+        self.stats = DispatcherStats()
+
+        self._queue: asyncio.Queue[tuple[Hashable, Any, float]] = asyncio.Queue()
+        self._waiting: dict[Hashable, deque[tuple[Any, float]]] = {}
+        self._active: set[Hashable] = set()
+        self._tasks: list[asyncio.Task] = []
+
+
+    @property
+    def depth(self) -> int:
+        """Number of items waiting to be handled."""
+
+        return self._queue.qsize() + sum(len(items) for items in self._waiting.values())
+
+
+    def start(self) -> None:
+        """Start the worker tasks, and the metrics reporter, on the running event loop."""
+
+        self._tasks = [
+            asyncio.create_task(self._work(), name=f"dispatcher-worker-{i}")
+            for i in range(self.workers)
+        ]
+
+        if self.metrics_interval > 0:
+            self._tasks.append(asyncio.create_task(self._report(), name="dispatcher-metrics"))
+
+        logger.info(f"Started dispatcher with {self.workers} workers (max queue size: {self.max_queue_size})")
+
+
+    async def stop(self) -> None:
+        """Cancel the worker tasks, dropping the items still waiting."""
+
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+    def submit(self, key: Hashable, item: Any) -> bool:
+        """Queue an item, unless the queue is full.
+
+        Must be called from the event loop thread.
+
+        Args:
+            key: Ordering key. Items with the same key are handled sequentially.
+            item: Item passed to the handler.
+
+        Returns:
+            bool: Whether the item was queued.
+        """
+
+        depth = self.depth
+        if depth >= self.max_queue_size:
+            self.stats.rejected += 1
+            logger.warning(f"Dispatcher queue full ({depth} items waiting), rejecting item for {key}")
+            return False
+
+        self._queue.put_nowait((key, item, time.monotonic()))
+        self.stats.submitted += 1
+        self.stats.max_depth = max(self.stats.max_depth, depth + 1)
+
+        return True
+
+
+    async def _work(self) -> None:
+        """Handle queued items, draining the follow-ups of a key before taking the next item."""
+
+        while True:
+            key, item, submitted_at = await self._queue.get()
+
+            try:
+                if key in self._active:
+                    # Another worker handles this key, it will handle the item after the current one
+                    self._waiting.setdefault(key, deque()).append((item, submitted_at))
+                    continue
+
+                self._active.add(key)
+
+                try:
+                    while True:
+                        await self._handle(key, item, submitted_at)
+
+                        waiting = self._waiting.get(key)
+                        if not waiting:
+                            break
+
+                        item, submitted_at = waiting.popleft()
+
+                finally:
+                    self._active.discard(key)
+                    self._waiting.pop(key, None)
+
+            finally:
+                self._queue.task_done()
+
+
+    async def _handle(self, key: Hashable, item: Any, submitted_at: float) -> None:
+        """Run the handler on an item and record its wait time and outcome."""
+
+        wait_seconds = time.monotonic() - submitted_at
+        self.stats.total_wait_seconds += wait_seconds
+        self.stats.max_wait_seconds = max(self.stats.max_wait_seconds, wait_seconds)
+
+        try:
+            await self.handler(item)
+            self.stats.processed += 1
+
+        except Exception as e:
+            self.stats.failed += 1
+            logger.error(f"Dispatcher handler failed for {key}: {e}")
+
+
+    async def _report(self) -> None:
+        """Periodically log the queue depth and wait time metrics."""
+
+        while True:
+            await asyncio.sleep(self.metrics_interval)
+            logger.info(f"Dispatcher metrics: {self.stats.to_metadata(depth=self.depth)}")
@@ -0,0 +1,134 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+
+
+@dataclass
+class DocumentCacheStats:
+    """Counters of the full document cache.
+
+    Attributes:
+        hits: Lookups served from the cache.
+        misses: Lookups that had to query MongoDB.
+        evictions: Documents evicted to respect the byte budget.
+        invalidations: Times the cache was cleared because an ingestion changed the documents.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+
+    def to_metadata(self) -> dict:
+        """Serialize the counters and the hit rate into a JSON friendly dictionary."""
+
+        lookups = self.hits + self.misses
+
+        return {**asdict(self), "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0}
+
+
+class DocumentCache:
+    """Thread-safe LRU of full documents by URL, bounded by the size of their content.
+
+    The cache is tied to the versions of the collections the documents are read from. Callers
+    read the versions at most every ``version_check_seconds`` and pass them to ``validate``,
+    which clears the cache when an ingestion bumped one of them.
+
+    Attributes:
+        max_bytes: Maximum total size of the cached contents, in UTF-8 bytes.
+        version_check_seconds: Minimum interval between two version checks.
+        stats: Hit, miss and eviction counters.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, version_check_seconds: float = 30.0) -> None:
+        self.max_bytes = max_bytes
+        self.version_check_seconds = version_check_seconds
+        self.stats = DocumentCacheStats()
+
+        self._documents: OrderedDict[str, tuple[dict, int]] = OrderedDict()
+        self._bytes = 0
+        self._versions: tuple | None = None
+        self._version_checked_at = float("-inf")
+        self._lock = threading.Lock()
+
+
+    @property
+    def size_bytes(self) -> int:
+        """Total size of the cached contents, in bytes."""
+
+        return self._bytes
+
+
+    def needs_version_check(self) -> bool:
+        """Whether the collection versions should be read again before the next lookup."""
+
+        return time.monotonic() - self._version_checked_at >= self.version_check_seconds
+
+
+    def validate(self, versions: tuple) -> None:
+        """Record the current collection versions, clearing the cache if they changed.
+
+        Args:
+            versions: Current versions of the collections the documents are read from.
+        """
+
+        with self._lock:
+            if self._versions is not None and versions != self._versions:
+                self._documents.clear()
+                self._bytes = 0
+                self.stats.invalidations += 1
+
+            self._versions = versions
+            self._version_checked_at = time.monotonic()
+
+
+    def get(self, url: str) -> dict | None:
+        """Get the cached document of a URL.
+
+        Args:
+            url: URL of the document.
+
+        Returns:
+            dict | None: The cached document, or None if it is not cached.
+        """
+
+        with self._lock:
+            entry = self._documents.get(url)
+            if entry is None:
+                self.stats.misses += 1
+                return None
+
+            self._documents.move_to_end(url)
+            self.stats.hits += 1
+
+            return entry[0]
+
+
+    def put(self, url: str, document: dict, size: int) -> None:
+        """Cache the document of a URL, evicting the least recently used ones beyond the budget.
+
+        Documents larger than the whole budget are not cached.
+
+        Args:
+            url: URL of the document.
+            document: Projected document.
+            size: Size of the document content, in bytes.
+        """
+
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._documents.pop(url, None)
+            if previous is not None:
+                self._bytes -= previous[1]
+
+            self._documents[url] = (document, size)
+            self._bytes += size
+
+            while self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._documents.popitem(last=False)
+                self._bytes -= evicted_size
+                self.stats.evictions += 1
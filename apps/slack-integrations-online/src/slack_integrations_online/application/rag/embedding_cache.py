@@ -0,0 +1,257 @@
+import asyncio
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+from loguru import logger
+
+
+@dataclass
+class EmbeddingCacheStats:
+    """Counters of a query embedding cache.
+
+    Attributes:
+        hits: Queries answered from the in-memory LRU.
+        disk_hits: Queries answered from the on-disk store.
+        misses: Queries embedded by the wrapped model.
+        evictions: Entries evicted from the in-memory LRU.
+    """
+
+    hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of queries served without calling the embedding model."""
+
+        lookups = self.hits + self.disk_hits + self.misses
+
+        return (self.hits + self.disk_hits) / lookups if lookups else 0.0
+
+
+    def to_metadata(self) -> dict:
+        """Serialize the counters and the hit rate into a JSON friendly dictionary."""
+
+        return {**asdict(self), "hit_rate": round(self.hit_rate, 3)}
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper caching query embeddings by their normalized text.
+
+    Query embeddings are kept in an in-memory LRU and, when a path is given, in a SQLite store
+    so they survive restarts. Queries are normalized by case folding and collapsing whitespace,
+    so "How do I  deploy?" and "how do i deploy?" share one entry. Document embeddings are not
+    cached and go straight to the wrapped model. The async path reads and writes the SQLite store
+    in a worker thread, so disk I/O never blocks the event loop.
+
+    Attributes:
+        embeddings: Wrapped embedding model.
+        model_id: Identifier of the wrapped model, part of every on-disk key.
+        max_size: Maximum number of embeddings kept in memory.
+        path: Path of the SQLite store, or None to keep the cache in memory only.
+        stats: Hit and miss counters.
+    """
+
+    def __init__(
+        self,
+        embeddings: Embeddings,
+        model_id: str,
+        max_size: int = 1024,
+        path: str | Path | None = None,
+    ) -> None:
+        self.embeddings = embeddings
+        self.model_id = model_id
+        self.max_size = max_size
+        self.path = Path(path) if path else None
+        self.stats = EmbeddingCacheStats()
+
+        self._cache: OrderedDict[str, list[float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._db = None
+
+        if self.path:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings "
+                "(model TEXT, query TEXT, vector BLOB, PRIMARY KEY (model, query))"
+            )
+            self._db.commit()
+
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Normalize a query into its cache key."""
+
+        return " ".join(text.casefold().split())
+
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return self.embeddings.embed_documents(texts)
+
+
+    def embed_query(self, text: str) -> list[float]:
+        key = self.normalize(text)
+
+        embedding = self.get(key)
+        if embedding is None and self._db is not None:
+            embedding = self.load(key)
+
+        if embedding is None:
+            embedding = self.embeddings.embed_query(text)
+            self.put(key, embedding)
+            if self._db is not None:
+                self.save(key, embedding)
+
+        return embedding
+
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float]]:
+        return await self.embeddings.aembed_documents(texts)
+
+
+    async def aembed_query(self, text: str) -> list[float]:
+        key = self.normalize(text)
+
+        embedding = self.get(key)
+        if embedding is None and self._db is not None:
+            embedding = await asyncio.to_thread(self.load, key)
+
+        if embedding is None:
+            embedding = await self.embeddings.aembed_query(text)
+            self.put(key, embedding)
+            if self._db is not None:
+                await asyncio.to_thread(self.save, key, embedding)
+
+        return embedding
+
+
+    def get(self, key: str) -> list[float] | None:
+        """Look a normalized query up in the in-memory LRU."""
+
+        with self._lock:
+            embedding = self._cache.get(key)
+            if embedding is not None:
+                self._cache.move_to_end(key)
+                self.stats.hits += 1
+
+            return embedding
+
+
+    def put(self, key: str, embedding: list[float]) -> None:
+        """Store the embedding the wrapped model computed for a missed query in the in-memory LRU."""
+
+        with self._lock:
+            self._remember(key, embedding)
+            self.stats.misses += 1
+
+
+    def load(self, key: str) -> list[float] | None:
+        """Look a normalized query up in the SQLite store, keeping a hit in memory. Blocking."""
+
+        with self._db_lock:
+            row = self._db.execute(
+                "SELECT vector FROM embeddings WHERE model = ? AND query = ?",
+                (self.model_id, key),
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        embedding = np.frombuffer(row[0], dtype=np.float64).tolist()
+
+        with self._lock:
+            self._remember(key, embedding)
+            self.stats.disk_hits += 1
+
+        return embedding
+
+
+    def save(self, key: str, embedding: list[float]) -> None:
+        """Persist the embedding of a normalized query in the SQLite store. Blocking."""
+
+        with self._db_lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO embeddings (model, query, vector) VALUES (?, ?, ?)",
+                (self.model_id, key, np.asarray(embedding, dtype=np.float64).tobytes()),
+            )
+            self._db.commit()
+
+
+    def _remember(self, key: str, embedding: list[float]) -> None:
+        """Insert an entry in the LRU, evicting the least recently used ones. Requires the lock."""
+
+        self._cache[key] = embedding
+        self._cache.move_to_end(key)
+
+        while len(self._cache) > self.max_size:
+            self._cache.popitem(last=False)
+            self.stats.evictions += 1
+
+
+
+_caches: dict[str, CachedEmbeddings] = {}
+_caches_lock = threading.Lock()
+
+
+def with_embedding_cache(
+    embeddings: Embeddings, model_id: str, max_size: int = 1024, path: str | Path | None = None,
+) -> Embeddings:
+    """Wrap an embedding model so query embeddings are cached.
+
+    There is a single cache per model id: later calls for the same model id return the cache
+    created by the first one, with its entries, counters and SQLite connection.
+
+    Args:
+        embeddings: Embedding model to wrap.
+        model_id: Identifier of the model, used to keep the on-disk entries of models apart.
+        max_size: Maximum number of embeddings kept in memory. 0 disables the cache.
+        path: Path of the SQLite store. None keeps the cache in memory only.
+
+    Returns:
+        Embeddings: The model itself if the cache is disabled, the cache of the model otherwise.
+    """
+
+    if max_size <= 0:
+        return embeddings
+
+    with _caches_lock:
+        cache = _caches.get(model_id)
+        if cache is None:
+            cache = CachedEmbeddings(embeddings, model_id=model_id, max_size=max_size, path=path)
+            _caches[model_id] = cache
+
+    return cache
+
+
+def get_embedding_cache_stats() -> dict[str, dict]:
+    """Get the counters and hit rate of every query embedding cache, keyed by model id."""
+
+    return {model_id: cache.stats.to_metadata() for model_id, cache in _caches.items()}
+
+
+def log_embedding_cache_stats() -> None:
+    """Log the counters and hit rate of every query embedding cache."""
+
+    for model_id, stats in get_embedding_cache_stats().items():
+        logger.info(f"Embedding cache metrics for {model_id}: {stats}")
+
+
+async def report_embedding_cache_stats(interval: float) -> None:
+    """Periodically log the counters and hit rate of every query embedding cache.
+
+    Args:
+        interval: Seconds between two metrics log lines.
+    """
+
+    while True:
+        await asyncio.sleep(interval)
+        log_embedding_cache_stats()
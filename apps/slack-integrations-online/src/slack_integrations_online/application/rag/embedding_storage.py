@@ -0,0 +1,196 @@
+import math
+
+import numpy as np
+from bson.binary import Binary, BinaryVectorDtype
+from langchain_core.embeddings import Embeddings
+
+
+STORAGE_MODES = ("array", "float32", "int8")
+
+
+class EmbeddingCodec:
+    """Encode embeddings into the representation stored in the vector collection.
+
+    Supported storage modes:
+        - "array": BSON array of doubles, the langchain default.
+        - "float32": packed float32 BSON binData vector, half the size of a double array.
+        - "int8": scalar quantized int8 BSON binData vector, an eighth of a double array.
+
+    Embeddings can also be truncated to their first ``dimensions`` components and renormalized,
+    which is lossless in ranking terms for Matryoshka models such as text-embedding-3.
+
+    Int8 quantization uses a fixed scale derived from the dimension: the components of a unit
+    vector have a standard deviation close to ``1 / sqrt(dim)``, so the int8 range is mapped to
+    ``INT8_CLIP_SIGMAS`` standard deviations and the rare outliers are clipped. The same scale
+    applies to documents and queries, so dot products keep their ranking without calibration.
+
+    Attributes:
+        storage: Storage mode, one of ``STORAGE_MODES``.
+        dimensions: Number of dimensions kept. 0 keeps the full embedding.
+    """
+
+    INT8_CLIP_SIGMAS = 4.0
+
+    def __init__(self, storage: str = "array", dimensions: int = 0) -> None:
+        if storage not in STORAGE_MODES:
+            raise ValueError(
+                f"Unknown embedding storage: {storage}. Expected one of {', '.join(STORAGE_MODES)}."
+            )
+
+        self.storage = storage
+        self.dimensions = dimensions
+
+
+    @property
+    def is_identity(self) -> bool:
+        """Whether the codec stores embeddings unchanged."""
+
+        return self.storage == "array" and not self.dimensions
+
+
+    def index_dimensions(self, embedding_dims: int) -> int:
+        """Get the number of dimensions to declare in the vector search index.
+
+        Args:
+            embedding_dims: Dimensionality of the embedding model.
+
+        Returns:
+            int: Dimensionality of the stored vectors.
+        """
+
+        return min(self.dimensions, embedding_dims) if self.dimensions else embedding_dims
+
+
+    def truncate(self, embedding: list[float]) -> np.ndarray:
+        """Truncate an embedding to the configured dimensions and renormalize it.
+
+        Args:
+            embedding: Full embedding returned by the model.
+
+        Returns:
+            np.ndarray: Float32 vector of the stored dimensionality.
+        """
+
+        vector = np.asarray(embedding, dtype=np.float32)
+
+        if self.dimensions and self.dimensions < len(vector):
+            vector = vector[:self.dimensions]
+            norm = np.linalg.norm(vector)
+            if norm:
+                vector = vector / norm
+
+        return vector
+
+
+    def int8_scale(self, dim: int) -> float:
+        """Get the factor mapping unit vector components to the int8 range.
+
+        Args:
+            dim: Dimensionality of the stored vectors.
+
+        Returns:
+            float: Scale applied before rounding to int8.
+        """
+
+        return 127 * math.sqrt(dim) / self.INT8_CLIP_SIGMAS
+
+
+    def encode(self, embedding: list[float]) -> list[float] | Binary:
+        """Encode an embedding into its stored representation.
+
+        Args:
+            embedding: Full embedding returned by the model.
+
+        Returns:
+            list[float] | Binary: BSON array of doubles or binData vector.
+        """
+
+        if self.is_identity:
+            return embedding
+
+        vector = self.truncate(embedding)
+
+        if self.storage == "float32":
+            return Binary.from_vector(vector.tolist(), BinaryVectorDtype.FLOAT32)
+
+        if self.storage == "int8":
+            quantized = np.clip(np.rint(vector * self.int8_scale(len(vector))), -128, 127)
+            return Binary.from_vector(quantized.astype(np.int8).tolist(), BinaryVectorDtype.INT8)
+
+        return vector.tolist()
+
+
+    def decode(self, value: list[float] | Binary) -> np.ndarray:
+        """Decode a stored representation back into an approximate float vector.
+
+        Args:
+            value: BSON array of doubles or binData vector.
+
+        Returns:
+            np.ndarray: Float32 vector of the stored dimensionality.
+        """
+
+        if not isinstance(value, Binary):
+            return np.asarray(value, dtype=np.float32)
+
+        binary_vector = value.as_vector()
+        vector = np.asarray(binary_vector.data, dtype=np.float32)
+
+        if binary_vector.dtype == BinaryVectorDtype.INT8:
+            vector = vector / self.int8_scale(len(vector))
+
+        return vector
+
+
+class EncodedEmbeddings(Embeddings):
+    """Embeddings wrapper returning vectors in their stored representation.
+
+    Wrapping the model of the vector store makes documents and queries go through the same
+    codec, so inserts and ``$vectorSearch`` query vectors always match the indexed field.
+
+    Attributes:
+        embeddings: Wrapped embedding model.
+        codec: Codec applied to every embedding.
+    """
+
+    def __init__(self, embeddings: Embeddings, codec: EmbeddingCodec) -> None:
+        self.embeddings = embeddings
+        self.codec = codec
+
+
+    def embed_documents(self, texts: list[str]) -> list[list[float] | Binary]:
+        return [self.codec.encode(embedding) for embedding in self.embeddings.embed_documents(texts)]
+
+
+    def embed_query(self, text: str) -> list[float] | Binary:
+        return self.codec.encode(self.embeddings.embed_query(text))
+
+
+    async def aembed_documents(self, texts: list[str]) -> list[list[float] | Binary]:
+        embeddings = await self.embeddings.aembed_documents(texts)
+
+        return [self.codec.encode(embedding) for embedding in embeddings]
+
+
+    async def aembed_query(self, text: str) -> list[float] | Binary:
+        return self.codec.encode(await self.embeddings.aembed_query(text))
+
+
+
+def with_embedding_storage(
+    embeddings: Embeddings, storage: str = "array", dimensions: int = 0,
+) -> Embeddings:
+    """Wrap an embedding model so it returns vectors in the configured storage mode.
+
+    Args:
+        embeddings: Embedding model to wrap.
+        storage: Storage mode, one of ``STORAGE_MODES``.
+        dimensions: Number of dimensions kept. 0 keeps the full embedding.
+
+    Returns:
+        Embeddings: The model itself for the default storage, the wrapped model otherwise.
+    """
+
+    codec = EmbeddingCodec(storage=storage, dimensions=dimensions)
+
+    return embeddings if codec.is_identity else EncodedEmbeddings(embeddings, codec)
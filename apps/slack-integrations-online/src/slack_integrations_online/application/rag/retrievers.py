@@ -1,39 +1,242 @@
-from langchain_openai import OpenAIEmbeddings
+import threading
+
+from bson.binary import Binary
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
 from langchain_mongodb import MongoDBAtlasVectorSearch
+from langchain_mongodb.pipelines import (
+    combine_pipelines,
+    final_hybrid_stage,
+    reciprocal_rank_stage,
+    text_search_stage,
+    vector_search_stage,
+)
 from langchain_mongodb.retrievers.hybrid_search import MongoDBAtlasHybridSearchRetriever
+from langchain_mongodb.utils import make_serializable
 from loguru import logger
 
-from src.slack_integrations_online.application.rag.embeddings import get_openai_embedding_model
+from src.slack_integrations_online.application.rag.embeddings import get_embedding_model
+from src.slack_integrations_online.application.rag.embedding_storage import with_embedding_storage
 from src.slack_integrations_online.config import settings
+from src.slack_integrations_online.infrastructure.mongodb.service import (
+    get_async_mongo_client,
+    get_mongo_client,
+)
+
 
+_retrievers: dict[tuple[str, int], MongoDBAtlasHybridSearchRetriever] = {}
+_embedding_models: dict[str, Embeddings] = {}
+_registry_lock = threading.RLock()
 
-def get_retriever(
-    embedding_model_id: str, k: int = 3
+
+def get_cached_retriever(
+    embedding_model_id: str = settings.EMBEDDING_MODEL_ID, k: int = 3
 ) -> MongoDBAtlasHybridSearchRetriever:
-    """Create a MongoDB Atlas hybrid search retriever with specified embedding model."""
-    
-    try:
-        embedding_model = get_openai_embedding_model(model_id=embedding_model_id)
-        logger.info(f"Using embedding model: {embedding_model_id}")
-        
-        return get_hybrid_search_retriever(embedding_model=embedding_model, k=k)
-    except Exception as e:
-        logger.error(f"Failed to create retriever: {str(e)}")
-        raise
+    """Get the long-lived retriever of an embedding model and result count, building it once.
+
+    Retrievers, their embedding clients and their MongoDB connection pool are shared by every
+    query, so per-query latency is only the query embedding and the search. Retrievers with
+    the same embedding model share the client of ``get_cached_embedding_model``.
+
+    Args:
+        embedding_model_id: Identifier of the embedding model, as accepted by ``get_embedding_model``.
+        k: Number of documents to retrieve.
+
+    Returns:
+        MongoDBAtlasHybridSearchRetriever: The shared retriever.
+    """
+
+    key = (embedding_model_id, k)
+
+    retriever = _retrievers.get(key)
+    if retriever is not None:
+        return retriever
+
+    with _registry_lock:
+        retriever = _retrievers.get(key)
+        if retriever is None:
+            embedding_model = get_storage_embedding_model(
+                embedding_model_id, get_cached_embedding_model(embedding_model_id)
+            )
+            retriever = _retrievers[key] = get_hybrid_search_retriever(embedding_model=embedding_model, k=k)
+
+    return retriever
+
+
+async def ahybrid_search(
+    retriever: MongoDBAtlasHybridSearchRetriever,
+    query: str,
+    query_vector: list[float] | Binary | None = None,
+) -> list[Document]:
+    """Run the hybrid search of a retriever natively on the event loop.
+
+    ``MongoDBAtlasHybridSearchRetriever`` only has a blocking implementation, which ``ainvoke``
+    runs in the default thread pool. This builds the same aggregation pipeline with the public
+    stage builders of ``langchain_mongodb.pipelines``, embeds the query with the async embedding
+    client and runs the pipeline on the shared async MongoDB client.
+
+    The pipeline mirrors ``MongoDBAtlasHybridSearchRetriever._get_relevant_documents`` of the
+    langchain-mongodb versions allowed by pyproject.toml (0.9 to 0.12), and reads the private
+    ``_embedding_key``, ``_index_name`` and ``_text_key`` fields of the vector store, as it does.
+    ``pre_filter``, ``post_filter``, ``show_embeddings``, the penalties and the weights are
+    honored. Retrievers using ``$rerank`` (``rerank_path``, 0.12+) fall back to ``ainvoke``;
+    auto-embedding vector stores are not supported.
+
+    Args:
+        retriever: Retriever providing the vector store and the search settings.
+        query: Query text, searched as-is by the full-text search.
+        query_vector: Query embedding, in the stored representation. Defaults to embedding the
+            query with the retriever's embedding model.
+
+    Returns:
+        list[Document]: Documents ranked by reciprocal rank fusion of both searches.
+    """
+
+    vectorstore = retriever.vectorstore
+    collection = retriever.collection
+
+    if getattr(retriever, "rerank_path", None) is not None:
+        return await retriever.ainvoke(query)
+
+    if query_vector is None:
+        query_vector = await vectorstore.embeddings.aembed_query(query)
+
+    pipeline = []
+
+    vector_pipeline = [
+        vector_search_stage(
+            query_vector=query_vector,
+            search_field=vectorstore._embedding_key,
+            index_name=vectorstore._index_name,
+            top_k=retriever.k,
+            filter=retriever.pre_filter,
+            oversampling_factor=retriever.oversampling_factor,
+        )
+    ]
+    vector_pipeline += reciprocal_rank_stage(
+        score_field="vector_score", penalty=retriever.vector_penalty, weight=retriever.vector_weight,
+    )
+    combine_pipelines(pipeline, vector_pipeline, collection.name)
+
+    text_pipeline = text_search_stage(
+        query=query,
+        search_field=vectorstore._text_key,
+        index_name=retriever.search_index_name,
+        limit=retriever.k,
+        filter=retriever.pre_filter,
+    )
+    text_pipeline += reciprocal_rank_stage(
+        score_field="fulltext_score", penalty=retriever.fulltext_penalty, weight=retriever.fulltext_weight,
+    )
+    combine_pipelines(pipeline, text_pipeline, collection.name)
+
+    pipeline += final_hybrid_stage(scores_fields=["vector_score", "fulltext_score"], limit=retriever.k)
+
+    if not retriever.show_embeddings:
+        pipeline.append({"$project": {vectorstore._embedding_key: 0}})
+
+    if retriever.post_filter is not None:
+        pipeline += retriever.post_filter
+
+    async_collection = get_async_mongo_client()[collection.database.name][collection.name]
+    cursor = await async_collection.aggregate(pipeline)
+
+    documents = []
+    async for result in cursor:
+        text = result.pop(vectorstore._text_key)
+        make_serializable(result)
+        documents.append(Document(page_content=text, metadata=result))
+
+    return documents
+
+
+def get_cached_embedding_model(embedding_model_id: str = settings.EMBEDDING_MODEL_ID) -> Embeddings:
+    """Get the long-lived embedding model of an id, as used by the cached retrievers.
+
+    Other components embedding user queries use it too, so a query embedded once is served
+    from the query embedding cache afterwards.
+
+    Args:
+        embedding_model_id: Identifier of the embedding model.
+
+    Returns:
+        Embeddings: The shared embedding model, returning full precision vectors.
+    """
+
+    embedding_model = _embedding_models.get(embedding_model_id)
+    if embedding_model is not None:
+        return embedding_model
+
+    with _registry_lock:
+        embedding_model = _embedding_models.get(embedding_model_id)
+        if embedding_model is None:
+            embedding_model = _embedding_models[embedding_model_id] = get_embedding_model(
+                model_id=embedding_model_id
+            )
+
+    return embedding_model
+
+
+def warm_up_retrievers(
+    keys: list[tuple[str, int]] | None = None
+) -> list[MongoDBAtlasHybridSearchRetriever]:
+    """Build the retrievers used by the bot at startup and open their MongoDB connections.
+
+    Args:
+        keys: (embedding model id, k) pairs to build. Defaults to the retriever tool's.
+
+    Returns:
+        list[MongoDBAtlasHybridSearchRetriever]: The shared retrievers.
+    """
+
+    retrievers = [
+        get_cached_retriever(embedding_model_id, k)
+        for embedding_model_id, k in keys or [(settings.EMBEDDING_MODEL_ID, 3)]
+    ]
+
+    get_mongo_client().admin.command("ping")
+    logger.info(f"Warmed up {len(retrievers)} retriever(s)")
+
+    return retrievers
+
+
+def get_storage_embedding_model(
+    embedding_model_id: str, embedding_model: Embeddings | None = None
+) -> Embeddings:
+    """Create an embedding model encoding queries like the stored rag embeddings.
+
+    Args:
+        embedding_model_id: Identifier of the embedding model.
+        embedding_model: Existing instance of the model to wrap. Defaults to a new one.
+
+    Returns:
+        Embeddings: The model, wrapped by the configured storage codec.
+    """
+
+    embedding_model = with_embedding_storage(
+        embedding_model or get_embedding_model(model_id=embedding_model_id),
+        storage=settings.EMBEDDING_STORAGE,
+        dimensions=settings.EMBEDDING_STORAGE_DIM,
+    )
+    logger.info(
+        f"Using embedding model: {embedding_model_id} "
+        f"(storage: {settings.EMBEDDING_STORAGE}, dim: {settings.EMBEDDING_STORAGE_DIM or 'full'})"
+    )
+
+    return embedding_model
 
 
 def get_hybrid_search_retriever(
-    embedding_model: OpenAIEmbeddings, k: int = 3
+    embedding_model: Embeddings, k: int = 3
 ) -> MongoDBAtlasHybridSearchRetriever:
     """Create a MongoDB Atlas hybrid search retriever."""
     
     try:
         logger.info(f"Creating vector store for namespace: {settings.MONGODB_DATABASE_NAME}.rag")
         
-        vectorstore = MongoDBAtlasVectorSearch.from_connection_string(
-            connection_string=settings.MONGODB_URI,
+        vectorstore = MongoDBAtlasVectorSearch(
+            collection=get_mongo_client()[settings.MONGODB_DATABASE_NAME]["rag"],
             embedding=embedding_model,
-            namespace=f"{settings.MONGODB_DATABASE_NAME}.rag",
             text_key="chunk",
             embedding_key="embedding",
             relevance_score_fn="dotProduct"
@@ -44,7 +247,7 @@ def get_hybrid_search_retriever(
         retriever = MongoDBAtlasHybridSearchRetriever(
             vectorstore=vectorstore,
             search_index_name="chunk_text_search",
-            top_k=k,
+            k=k,
             vector_penalty=0,  # Changed from 50 to 0
             fulltext_penalty=0  # Changed from 50 to 0
         )
@@ -1,60 +1,211 @@
-from pymongo import MongoClient
+import asyncio
+import re
 
+from pydantic import BaseModel
+
+from src.slack_integrations_online.application.rag.document_cache import DocumentCache
 from src.slack_integrations_online.config import settings
+from src.slack_integrations_online.infrastructure.mongodb.service import AsyncMongoDBService
+
+
+# Same patterns as MarkdownSectionSplitter in the offline rag/splitters.py, the crawler renders
+# the docs "Copy" button right before opening fences. Keep both in sync.
+FENCE_PATTERN = re.compile(r"^\s*(?:Copy)?(```|~~~)")
+HEADING_PATTERN = re.compile(r"^(#{1,6})(?:\s+(.*?))?\s*$")
+
+RAW_COLLECTION_NAME = "raw"
+RAG_COLLECTION_NAME = "rag"
 
+# Only the fields format_document reads: the page content or chunk and its URL
+DOCUMENT_PROJECTION = {"_id": 0, "content": 1, "chunk": 1, "url": 1, "metadata.url": 1}
 
-def get_single_document(url: str) -> str:
+# The rag fallback returns the first chunk of the page, using the (url, chunk_index) index
+RAG_SORT = [("chunk_index", 1)]
+
+document_cache = DocumentCache(
+    max_bytes=settings.DOCUMENT_CACHE_MAX_BYTES,
+    version_check_seconds=settings.DOCUMENT_CACHE_VERSION_CHECK_SECONDS,
+)
+
+
+async def aget_single_document(url: str, section: str = "") -> str:
     """Retrieve a single document from MongoDB by URL and format as XML.
+
+    Documents are read with the shared async MongoDB client and cached by URL until the next
+    ingestion of the raw or rag collection.
     
     Args:
         url: URL of the document to retrieve from the database.
+        section: Optional section path (e.g. "## Install > ### Docker") to return instead of the whole page.
     
     Returns:
         str: XML-formatted document with URL and content.
     """
 
     try:
-        client = MongoClient(settings.MONGODB_URI)
-        db = client[settings.MONGODB_DATABASE_NAME]
-        
-        # Try raw collection first
-        collection = db['raw']
-        document = collection.find_one({"metadata.url": url})
-        
-        # If not found in raw, try rag collection
-        if not document:
-            collection = db['rag']
-            document = collection.find_one({"url": url})
-        
-        if not document:
-            return f"<error>No document found with URL: {url}</error>"
-
-        # Extract content from appropriate field
-        if 'content' in document:
-            content = document.get('content', '')
-        elif 'chunk' in document:
-            content = document.get('chunk', '')
-        else:
-            content = ''
-        
-        # Get URL
-        doc_url = document.get('url', url)
-        if not doc_url and 'metadata' in document:
-            doc_url = document.get('metadata', {}).get('url', url)
-
-        # Format the result in XML structure
-        result = f"""
+        raw = AsyncMongoDBService(BaseModel, RAW_COLLECTION_NAME)
+        rag = AsyncMongoDBService(BaseModel, RAG_COLLECTION_NAME)
+
+        if document_cache.needs_version_check():
+            document_cache.validate(tuple(await asyncio.gather(raw.get_version(), rag.get_version())))
+
+        document = document_cache.get(url)
+
+        if document is None:
+            document = await raw.fetch_one(
+                {"metadata.url": url}, projection=DOCUMENT_PROJECTION, raw=True
+            ) or await rag.fetch_one(
+                {"url": url}, projection=DOCUMENT_PROJECTION, sort=RAG_SORT, raw=True
+            )
+
+            if document:
+                document_cache.put(url, document, _content_size(document))
+
+        return format_document(document, url, section)
+
+    except Exception as e:
+        return f"<error>Error retrieving document: {str(e)}</error>"
+
+
+def _content_size(document: dict) -> int:
+    """Size in bytes of the content of a projected document."""
+
+    return len((document.get("content") or document.get("chunk") or "").encode("utf-8"))
+
+
+def format_document(document: dict | None, url: str, section: str = "") -> str:
+    """Format a raw or rag document as XML, optionally keeping a single section.
+
+    Args:
+        document: Raw MongoDB document, or None if no document was found.
+        url: URL the document was looked up with.
+        section: Optional section path to return instead of the whole page.
+
+    Returns:
+        str: XML-formatted document with URL and content.
+    """
+
+    if not document:
+        return f"<error>No document found with URL: {url}</error>"
+
+    # Extract content from appropriate field
+    if 'content' in document:
+        content = document.get('content', '')
+    elif 'chunk' in document:
+        content = document.get('chunk', '')
+    else:
+        content = ''
+    
+    if section:
+        content = extract_section(content, section)
+
+    # Get URL
+    doc_url = document.get('url', url)
+    if not doc_url and 'metadata' in document:
+        doc_url = document.get('metadata', {}).get('url', url)
+
+    # Format the result in XML structure
+    result = f"""
         <document>
         <url>{doc_url}</url>
         <content>{content.strip()}</content>
         </document>
         """
 
-        return result
+    return result
 
-    except Exception as e:
-        return f"<error>Error retrieving document: {str(e)}</error>"
-    
-    finally:
-        if 'client' in locals():
-            client.close()
\ No newline at end of file
+
+def extract_section(content: str, section: str) -> str:
+    """Extract a markdown section, with its subsections, from a document.
+
+    The section is identified by its full heading path, as produced by the offline markdown
+    splitter, falling back to the last heading of the path when no path matches. Empty headings
+    followed by their title on the next line are supported.
+
+    Args:
+        content: Markdown content of the full document.
+        section: Section path such as "## Install > ### Docker".
+
+    Returns:
+        str: The section content, or the full content if the section is not found.
+    """
+
+    target = section.split(" > ")[-1].strip()
+    target_level = len(target) - len(target.lstrip("#"))
+
+    headings = parse_headings(content)
+
+    path: list[tuple[int, str]] = []
+    candidates = []
+    for i, (_, level, heading) in enumerate(headings):
+        while path and path[-1][0] >= level:
+            path.pop()
+        path.append((level, heading))
+
+        if level == target_level and heading == target:
+            candidates.append((" > ".join(title for _, title in path) == section.strip(), i))
+
+    if not candidates:
+        return content
+
+    # Exact path matches first, then document order
+    _, i = min(candidates, key=lambda candidate: (not candidate[0], candidate[1]))
+    start, level, _ = headings[i]
+    end = next(
+        (next_start for next_start, next_level, _ in headings[i + 1:] if next_level <= level),
+        len(content),
+    )
+
+    return content[start:end]
+
+
+def parse_headings(content: str) -> list[tuple[int, int, str]]:
+    """Find the markdown headings of a document, skipping fenced code blocks.
+
+    Mirrors ``MarkdownSectionSplitter._parse_sections`` in the offline rag/splitters.py, so shell
+    comments inside code blocks are not taken for headings and section titles match the stored
+    section paths. Changes to either parser must be made to both.
+
+    Args:
+        content: Markdown content of the full document.
+
+    Returns:
+        list[tuple[int, int, str]]: Start offset, level and text (e.g. "## Install") of every heading.
+    """
+
+    lines = content.splitlines(keepends=True)
+    headings = []
+    fence = None
+    title_pending = False
+    start = 0
+
+    for i, line in enumerate(lines):
+        line_start, start = start, start + len(line)
+        stripped = line.strip()
+        fence_match = FENCE_PATTERN.match(line)
+
+        if fence is not None:
+            if fence_match and fence_match.group(1) == fence:
+                fence = None
+            continue
+
+        if title_pending and stripped:
+            # The title of an empty heading, already taken from this line
+            title_pending = False
+            continue
+
+        if fence_match:
+            fence = fence_match.group(1)
+            continue
+
+        heading_match = HEADING_PATTERN.match(stripped)
+        if heading_match:
+            title = heading_match.group(2) or next(
+                (following.strip() for following in lines[i + 1:] if following.strip()), ""
+            )
+            title_pending = not heading_match.group(2)
+            headings.append(
+                (line_start, len(heading_match.group(1)), f"{heading_match.group(1)} {title}".strip())
+            )
+
+    return headings
@@ -23,6 +23,32 @@ class Settings(BaseSettings):
         description="App token of Socket model for slack"
     )
 
+    SLACK_WORKERS: int = Field(
+        default=4,
+        description="Number of Slack mentions answered concurrently.",
+    )
+
+    SLACK_MAX_QUEUE_SIZE: int = Field(
+        default=100,
+        description="Maximum number of Slack mentions waiting for a worker before replying busy.",
+    )
+
+    SLACK_METRICS_INTERVAL_SECONDS: float = Field(
+        default=60.0,
+        description="Seconds between two logs of the Slack queue and embedding cache metrics. 0 disables them.",
+    )
+
+    SLACK_UPDATE_INTERVAL_SECONDS: float = Field(
+        default=1.0,
+        description="Minimum seconds between two edits of the same streamed answer.",
+    )
+
+    SLACK_UPDATES_PER_MINUTE: int = Field(
+        default=40,
+        description="Maximum streaming edits per minute across all workers, below the per-workspace "
+        "Tier 3 limit of chat.update to leave room for the final edits.",
+    )
+
     # --------------------------------------------------
     # MongoDB Configuration (SAFE DEFAULTS)
     # --------------------------------------------------
@@ -36,6 +62,74 @@ class Settings(BaseSettings):
         description="MongoDB connection URI. If unset, local no-auth MongoDB is used.",
     )
 
+    MONGODB_MAX_POOL_SIZE: int = Field(
+        default=50,
+        description="Maximum number of connections in the shared MongoDB client pool.",
+    )
+
+    # Embedding model and storage, must match the offline compute_rag configuration
+    EMBEDDING_MODEL_ID: str = Field(
+        default="text-embedding-3-small",
+        description="Embedding model id, as '<provider>:<model>'. Defaults to OpenAI without a prefix.",
+    )
+
+    EMBEDDING_STORAGE: str = Field(
+        default="array",
+        description="How rag embeddings are stored: 'array', 'float32' or 'int8'.",
+    )
+
+    EMBEDDING_STORAGE_DIM: int = Field(
+        default=0,
+        description="Number of stored embedding dimensions. 0 keeps the full embedding.",
+    )
+
+    EMBEDDING_CACHE_SIZE: int = Field(
+        default=1024,
+        description="Number of query embeddings cached in memory. 0 disables the cache.",
+    )
+
+    EMBEDDING_CACHE_PATH: str | None = Field(
+        default=None,
+        description="Path of the SQLite file persisting cached query embeddings across restarts.",
+    )
+
+    AGENT_PREFETCH: bool = Field(
+        default=True,
+        description="Search memory and documents concurrently before the agent's first model call.",
+    )
+
+    # Semantic answer cache of the agent
+    ANSWER_CACHE_SIZE: int = Field(
+        default=512,
+        description="Maximum number of cached agent answers. 0 disables the answer cache.",
+    )
+
+    ANSWER_CACHE_TTL_SECONDS: float = Field(
+        default=3600.0,
+        description="Number of seconds a cached agent answer is reused for.",
+    )
+
+    ANSWER_CACHE_SIMILARITY_THRESHOLD: float = Field(
+        default=0.95,
+        description="Minimum cosine similarity between two queries to reuse a cached answer.",
+    )
+
+    ANSWER_CACHE_VERSION_CHECK_SECONDS: float = Field(
+        default=30.0,
+        description="Minimum interval between two checks of the rag collection version.",
+    )
+
+    # Full document cache of get_complete_docs_with_url
+    DOCUMENT_CACHE_MAX_BYTES: int = Field(
+        default=64 * 1024 * 1024,
+        description="Maximum total size of the cached full documents, in bytes.",
+    )
+
+    DOCUMENT_CACHE_VERSION_CHECK_SECONDS: float = Field(
+        default=30.0,
+        description="Minimum interval between two checks of the raw and rag collection versions.",
+    )
+
     # Langsmith Configuration
     LANGCHAIN_TRACING_V2: bool = Field(
         description="Enable Langchain Tracing V2 if set to 'true'.",)
@@ -0,0 +1,343 @@
+import asyncio
+import threading
+import weakref
+from typing import AsyncIterator, Generic, Iterable, Type, TypeVar
+
+from bson import ObjectId
+from bson.codec_options import CodecOptions, TypeDecoder, TypeRegistry
+from loguru import logger
+from pydantic import BaseModel, TypeAdapter
+from pymongo import AsyncMongoClient, MongoClient, ReplaceOne, errors
+
+from src.slack_integrations_online.config import settings
+
+T = TypeVar("T", bound=BaseModel)
+
+VERSIONS_COLLECTION_NAME = "collection_versions"
+
+
+class ObjectIdAsStrDecoder(TypeDecoder):
+    """BSON type decoder turning every ObjectId into its hex string while decoding."""
+
+    bson_type = ObjectId
+
+    def transform_bson(self, value: ObjectId) -> str:
+        return str(value)
+
+
+OBJECT_ID_AS_STR_CODEC_OPTIONS = CodecOptions(type_registry=TypeRegistry([ObjectIdAsStrDecoder()]))
+
+
+_clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, AsyncMongoClient]] = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_async_mongo_client(mongodb_uri: str = settings.MONGODB_URI) -> AsyncMongoClient:
+    """Get the shared async MongoDB client of a URI for the running event loop.
+
+    Async clients are bound to the event loop they are first used on, so clients are shared
+    per (event loop, URI). The bot runs a single loop, so in practice there is one client per URI.
+
+    Args:
+        mongodb_uri: MongoDB connection URI.
+
+    Returns:
+        AsyncMongoClient: The shared client.
+    """
+
+    loop_clients = _clients.setdefault(asyncio.get_running_loop(), {})
+
+    client = loop_clients.get(mongodb_uri)
+    if client is None:
+        client = AsyncMongoClient(
+            mongodb_uri,
+            appname="slack_integrations_online",
+            maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+        )
+        loop_clients[mongodb_uri] = client
+
+    return client
+
+
+_sync_clients: dict[str, MongoClient] = {}
+_sync_clients_lock = threading.Lock()
+
+
+def get_mongo_client(mongodb_uri: str = settings.MONGODB_URI) -> MongoClient:
+    """Get the process-wide blocking MongoDB client of a URI, for libraries needing one.
+
+    LangChain's vector store only accepts a blocking collection. MongoClient is thread-safe
+    and pools its connections, so every vector store of the process shares one client per URI.
+
+    Args:
+        mongodb_uri: MongoDB connection URI.
+
+    Returns:
+        MongoClient: The shared client.
+    """
+
+    with _sync_clients_lock:
+        client = _sync_clients.get(mongodb_uri)
+        if client is None:
+            client = MongoClient(
+                mongodb_uri,
+                appname="slack_integrations_online",
+                maxPoolSize=settings.MONGODB_MAX_POOL_SIZE,
+            )
+            _sync_clients[mongodb_uri] = client
+
+        return client
+
+
+class AsyncMongoDBService(Generic[T]):
+    """Async counterpart of the offline MongoDBService, built on PyMongo's AsyncMongoClient.
+
+    Every call awaits the driver directly instead of running a blocking client in the default
+    thread pool. Documents are decoded with ObjectIds as strings and hydrated in batches with a
+    single ``TypeAdapter(list[T])`` validation.
+
+    Attributes:
+        model: Pydantic model type for document validation.
+        collection_name: Name of the MongoDB collection.
+        database_name: Name of the MongoDB database.
+        client: Shared AsyncMongoClient of the URI.
+        database: MongoDB database instance.
+        collection: MongoDB collection instance, decoding ObjectIds as strings.
+    """
+
+    def __init__(
+        self,
+        model: Type[T],
+        collection_name: str,
+        database_name: str = settings.MONGODB_DATABASE_NAME,
+        mongodb_uri: str = settings.MONGODB_URI,
+    ) -> None:
+
+        self.model = model
+        self.collection_name = collection_name
+        self.database_name = database_name
+
+        self.client = get_async_mongo_client(mongodb_uri)
+        self.database = self.client[database_name]
+        self.collection = self.database.get_collection(
+            collection_name, codec_options=OBJECT_ID_AS_STR_CODEC_OPTIONS
+        )
+
+        self._adapter = TypeAdapter(list[model])
+
+
+    async def __aenter__(self) -> "AsyncMongoDBService":
+        """Enter the async context manager and return the service instance.
+
+        Returns:
+            AsyncMongoDBService: The service instance for use in context.
+        """
+        return self
+
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        """Exit the async context manager. The shared client stays open."""
+
+
+    async def fetch_documents(self, limit: int | None = None, query: dict | None = None) -> list[T]:
+        """Fetch documents from the collection and parse them into Pydantic models.
+
+        Args:
+            limit: Maximum number of documents to fetch. None for no limit. Defaults to None.
+            query: MongoDB query filter dictionary. Defaults to None.
+
+        Returns:
+            list[T]: List of parsed Pydantic model instances.
+        """
+
+        try:
+            documents = await self.collection.find(query or {}).limit(limit or 0).to_list()
+            logger.debug(f"Fetched {len(documents)} documents with query: {query}")
+
+            return self.hydrate(documents)
+
+        except errors.PyMongoError as e:
+            logger.error(f"Error fetching documents: {e}")
+            raise
+
+
+    async def fetch_one(
+        self,
+        query: dict,
+        projection: dict | list[str] | None = None,
+        sort: list[tuple[str, int]] | None = None,
+        raw: bool = False,
+    ) -> T | dict | None:
+        """Fetch a single document.
+
+        Args:
+            query: MongoDB query filter dictionary.
+            projection: Fields to return, as a MongoDB projection or a list of field names.
+            sort: List of (field, direction) pairs picking the document among the matches.
+            raw: Whether to return the raw dictionary instead of a model.
+
+        Returns:
+            T | dict | None: The document, or None if no document matches.
+        """
+
+        document = await self.collection.find_one(query, projection=projection, sort=sort)
+        if document is None or raw:
+            return document
+
+        return self.hydrate([document])[0]
+
+
+    async def iter_documents(
+        self,
+        query: dict | None = None,
+        projection: dict | list[str] | None = None,
+        sort: list[tuple[str, int]] | None = None,
+        batch_size: int = 1000,
+        limit: int = 0,
+        raw: bool = False,
+    ) -> AsyncIterator[T | dict]:
+        """Stream documents from the collection through a server-side cursor.
+
+        Args:
+            query: MongoDB query filter dictionary. Defaults to all documents.
+            projection: Fields to return, as a MongoDB projection or a list of field names.
+            sort: List of (field, direction) pairs. Defaults to ascending ``_id``.
+            batch_size: Number of documents fetched and hydrated per round trip.
+            limit: Maximum number of documents to return. 0 for no limit.
+            raw: Whether to yield the raw MongoDB dictionaries instead of models.
+
+        Yields:
+            T | dict: Parsed models, or raw dictionaries if ``raw`` is set.
+        """
+
+        cursor = self.collection.find(query or {}, projection=projection).sort(
+            sort or [("_id", 1)]
+        ).batch_size(batch_size).limit(limit)
+
+        try:
+            batch = []
+            async for document in cursor:
+                batch.append(document)
+
+                if len(batch) >= batch_size:
+                    for item in (batch if raw else self.hydrate(batch)):
+                        yield item
+                    batch = []
+
+            for item in (batch if raw else self.hydrate(batch)):
+                yield item
+
+        finally:
+            await cursor.close()
+
+
+    async def bulk_ingest(
+        self,
+        documents: Iterable[T | dict],
+        upsert_key: str | None = None,
+        max_batch_size: int = 1000,
+        writers: int = 4,
+    ) -> list[dict]:
+        """Write documents in unordered bulk writes, running up to ``writers`` writes concurrently.
+
+        Args:
+            documents: Iterable of Pydantic models or raw dictionaries to write.
+            upsert_key: Field identifying a document. When set, every document replaces the one
+                with the same key, or is inserted if none exists.
+            max_batch_size: Maximum number of documents per bulk write.
+            writers: Number of bulk writes in flight at the same time.
+
+        Returns:
+            list[dict]: Insert, upsert and error counts of every chunk, in order.
+        """
+
+        semaphore = asyncio.Semaphore(max(1, writers))
+
+        async def write(index: int, chunk: list[dict]) -> dict:
+            result = {"chunk": index, "documents": len(chunk), "inserted": 0, "upserted": 0, "errors": 0}
+
+            async with semaphore:
+                try:
+                    if upsert_key:
+                        write_result = await self.collection.bulk_write(
+                            [ReplaceOne({upsert_key: doc.get(upsert_key)}, doc, upsert=True) for doc in chunk],
+                            ordered=False,
+                        )
+                        result["upserted"] = write_result.upserted_count
+
+                    else:
+                        write_result = await self.collection.insert_many(chunk, ordered=False)
+                        result["inserted"] = len(write_result.inserted_ids)
+
+                except errors.BulkWriteError as e:
+                    result["inserted"] = e.details.get("nInserted", 0)
+                    result["upserted"] = e.details.get("nUpserted", 0)
+                    result["errors"] = len(e.details.get("writeErrors", []))
+                    logger.warning(f"Bulk write chunk {index} rejected {result['errors']}/{len(chunk)} documents.")
+
+            return result
+
+        chunks, chunk = [], []
+        for document in documents:
+            if isinstance(document, BaseModel):
+                document = document.model_dump()
+                document.pop("_id", None)
+
+            chunk.append(document)
+            if len(chunk) >= max_batch_size:
+                chunks.append(chunk)
+                chunk = []
+
+        if chunk:
+            chunks.append(chunk)
+
+        return list(await asyncio.gather(*(write(i, chunk) for i, chunk in enumerate(chunks))))
+
+
+    async def get_collection_count(self, query: dict | None = None) -> int:
+        """Get the number of documents in the collection.
+
+        Args:
+            query: MongoDB query filter dictionary. Defaults to all documents.
+
+        Returns:
+            int: Number of matching documents.
+        """
+
+        try:
+            return await self.collection.count_documents(query or {})
+
+        except errors.PyMongoError as e:
+            logger.error(f"Error counting documents in MongoDB: {e}")
+            raise
+
+
+    async def get_version(self) -> int:
+        """Get the content version of the collection, bumped by the offline pipelines.
+
+        Returns:
+            int: Current version, or 0 if the collection was never versioned.
+        """
+
+        document = await self.database[VERSIONS_COLLECTION_NAME].find_one(
+            {"_id": self.collection_name}, projection={"version": 1}
+        )
+
+        return document["version"] if document else 0
+
+
+    def hydrate(self, documents: list[dict]) -> list[T]:
+        """Validate a batch of decoded documents into models, mapping ``_id`` to ``id``.
+
+        Args:
+            documents: Documents decoded with ObjectIds as strings. They are modified in place.
+
+        Returns:
+            list[T]: Parsed Pydantic model instances.
+        """
+
+        for document in documents:
+            document["id"] = document.pop("_id", None)
+
+        return self._adapter.validate_python(documents)
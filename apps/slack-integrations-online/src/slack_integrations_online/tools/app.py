@@ -3,16 +3,23 @@ from pathlib import Path
 
 # from src.slack_integrations_online.application.agents.agents import SupportAgentsManager
 from src.slack_integrations_online.application.agents.agents import SupportAgentsManager
+from src.slack_integrations_online.application.rag.embedding_cache import log_embedding_cache_stats
+from src.slack_integrations_online.application.rag.retrievers import warm_up_retrievers
 
 
 async def main(user_query):
     """Run the app in CLI mode"""
+    await asyncio.to_thread(warm_up_retrievers)
     agent = SupportAgentsManager()
 
-    await agent.run(query=user_query)
+    response = await agent.run(query=user_query)
+
+    log_embedding_cache_stats()
+
+    return response
 
 
 if __name__=="__main__":
     print('\n' + '-'*50 + '\n')
     user_query = input("Enter your query: ")
-    asyncio.run(main(user_query=user_query))
\ No newline at end of file
+    print(asyncio.run(main(user_query=user_query)))
\ No newline at end of file
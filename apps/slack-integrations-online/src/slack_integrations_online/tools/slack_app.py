@@ -1,18 +1,25 @@
 import asyncio
 import re
+import time
 from pathlib import Path
 
-from slack_sdk import WebClient
 from slack_sdk.errors import SlackApiError
+from slack_sdk.http_retry.builtin_async_handlers import AsyncRateLimitErrorRetryHandler
+from slack_sdk.web.async_client import AsyncWebClient
 
-from slack_sdk.socket_mode import SocketModeClient
+from slack_sdk.socket_mode.aiohttp import SocketModeClient
 from slack_sdk.socket_mode.response import SocketModeResponse
 from slack_sdk.socket_mode.request import SocketModeRequest
-from slack_sdk.errors import SlackApiError
 
 from loguru import logger
 
 from src.slack_integrations_online.application.agents.agents import SupportAgentsManager
+from src.slack_integrations_online.application.dispatcher import KeyedDispatcher
+from src.slack_integrations_online.application.rag.embedding_cache import (
+    log_embedding_cache_stats,
+    report_embedding_cache_stats,
+)
+from src.slack_integrations_online.application.rag.retrievers import warm_up_retrievers
 
 from src.slack_integrations_online.config import settings   
 
@@ -21,14 +28,20 @@ slack_token = settings.SLACK_BOT_TOKEN
 app_token = settings.SLACK_APP_TOKEN
 
 
-client = SocketModeClient(
-    app_token=app_token,
-    web_client=WebClient(token=slack_token)
-)
+# The aiohttp Socket Mode client opens its session on creation, so it is created in main()
+# on the bot's event loop
+client: SocketModeClient | None = None
 
 
 bot_user_id = None
 
+PLACEHOLDER_MESSAGE = "_Thinking…_"
+
+BUSY_MESSAGE = "I'm answering a lot of questions right now, please ask me again in a few minutes."
+
+# chat.update is rate limited per workspace, so the streaming edits of all workers share a budget
+last_edit_at = float("-inf")
+
 async def get_bot_user_id():
     """Retrieve and cache the Slack bot's user ID via API authentication.
     
@@ -42,7 +55,7 @@ async def get_bot_user_id():
     global bot_user_id
 
     try:
-        response = client.web_client.auth_test()
+        response = await client.web_client.auth_test()
         bot_user_id = response["user_id"]
 
         logger.info(f"Extracted bot user id: {bot_user_id}")
@@ -75,8 +88,31 @@ async def extract_message_without_mention(text: str, bot_id: str) -> str:
     return text
 
 
+def claim_edit_slot() -> bool:
+    """Claim the workspace wide slot for a streaming edit, shared by every worker.
+
+    Returns:
+        bool: Whether an edit may be sent now, at most ``SLACK_UPDATES_PER_MINUTE`` per minute.
+    """
+
+    global last_edit_at
+
+    now = time.monotonic()
+    if now - last_edit_at < 60 / settings.SLACK_UPDATES_PER_MINUTE:
+        return False
+
+    last_edit_at = now
+
+    return True
+
+
 async def process_agent_query(query: str, channel: str, thread_ts: str = None):
-    """Process user query through support agent and post response to Slack.
+    """Process user query through support agent and stream its response to Slack.
+
+    A placeholder is posted right away, then edited with the progress of the agent and its
+    answer as tokens arrive, at most once every ``SLACK_UPDATE_INTERVAL_SECONDS`` and within the
+    edit budget shared by all workers. These edits are best effort: a failed or throttled edit
+    is skipped, and only the final edit carrying the full answer is required.
     
     Args:
         query: User's query text to process.
@@ -87,10 +123,38 @@ async def process_agent_query(query: str, channel: str, thread_ts: str = None):
         Response object from Slack API, or None if error occurs.
     """
 
+    message_ts = None
+
     try:
 
+        response = await client.web_client.chat_postMessage(
+            channel=channel,
+            text=PLACEHOLDER_MESSAGE,
+            thread_ts=thread_ts,
+        )
+
+        message_ts = response['ts']
+
         agent = SupportAgentsManager()
-        agent_response = await agent.run(query=query)
+        agent_response, progress = "", []
+        last_update = time.monotonic()
+
+        async for event in agent.stream(query=query):
+            if event.kind == "progress":
+                if not progress or progress[-1] != event.text:
+                    progress.append(event.text)
+            else:
+                agent_response = event.text
+
+            throttled = time.monotonic() - last_update < settings.SLACK_UPDATE_INTERVAL_SECONDS
+            if event.kind != "answer" and not throttled and claim_edit_slot():
+                text = agent_response or "\n".join(f"_{line}_" for line in progress)
+                last_update = time.monotonic()
+
+                try:
+                    await client.web_client.chat_update(channel=channel, ts=message_ts, text=text)
+                except SlackApiError as e:
+                    logger.warning(f"Skipped streaming edit of {message_ts}: {e.response['error']}")
 
         if not agent_response:
             agent_response = "Didn't got a response from agent"
@@ -100,26 +164,17 @@ async def process_agent_query(query: str, channel: str, thread_ts: str = None):
         # Add hint message at the end
         full_response = f"{agent_response}\n\n💡 *Hint:* Mention <@{bot_user_id}> in the thread for followups."
 
-
-        response = client.web_client.chat_postMessage(
+        response = await client.web_client.chat_update(
             channel=channel,
+            ts=message_ts,
             text=full_response,
-            thread_ts=thread_ts,
-        )
-
-        message_ts = response['ts']
-
-        client.web_client.reactions_add(
-            channel=channel,
-            name="thumbsup",
-            timestamp=message_ts
         )
-        
 
-        client.web_client.reactions_add(
-            channel=channel,
-            name="thumbsdown",
-            timestamp=message_ts
+        await asyncio.gather(
+            *(
+                client.web_client.reactions_add(channel=channel, name=name, timestamp=message_ts)
+                for name in ("thumbsup", "thumbsdown")
+            )
         )
 
         return response
@@ -127,17 +182,45 @@ async def process_agent_query(query: str, channel: str, thread_ts: str = None):
 
     except Exception as e:
         error_message = f"Sorry, got an error processing your request: {str(e)}"
-        client.web_client.chat_postMessage(
-            channel=channel,
-            text=error_message,
-            thread_ts=thread_ts
-        )
         logger.error(f"Error processing query: {e}")
 
+        # Replace the placeholder, so the thread is not left with a stale progress message
+        if message_ts is not None:
+            await client.web_client.chat_update(channel=channel, ts=message_ts, text=error_message)
+        else:
+            await client.web_client.chat_postMessage(
+                channel=channel,
+                text=error_message,
+                thread_ts=thread_ts
+            )
+
+
+
+async def handle_mention(mention: tuple[str, str, str]):
+    """Answer a queued mention, as a worker of the dispatcher.
+
+    Args:
+        mention: (query, channel, thread_ts) of the mention.
+    """
+
+    query, channel, thread_ts = mention
+
+    await process_agent_query(query=query, channel=channel, thread_ts=thread_ts)
+
+
+dispatcher = KeyedDispatcher(
+    handler=handle_mention,
+    workers=settings.SLACK_WORKERS,
+    max_queue_size=settings.SLACK_MAX_QUEUE_SIZE,
+    metrics_interval=settings.SLACK_METRICS_INTERVAL_SECONDS,
+)
 
 
 async def process_event(client: SocketModeClient, req: SocketModeRequest):
-    """Handle incoming Slack Socket Mode events and route app mentions to agent.
+    """Route app mentions to the dispatcher, keyed by thread so follow-ups stay ordered.
+
+    Slack expects the acknowledgement within 3 seconds, so the request is acknowledged first
+    and the agent runs on a dispatcher worker.
     
     Args:
         client: Socket Mode client instance for Slack connection.
@@ -147,9 +230,7 @@ async def process_event(client: SocketModeClient, req: SocketModeRequest):
         None
     """
 
-    response = SocketModeResponse(envelope_id=req.envelope_id)
-    client.send_socket_mode_response(response)
-
+    await client.send_socket_mode_response(SocketModeResponse(envelope_id=req.envelope_id))
 
     if req.type == "events_api":
         event = req.payload.get("event", {})
@@ -174,10 +255,15 @@ async def process_event(client: SocketModeClient, req: SocketModeRequest):
 
                 logger.info(f"Extracted query: {query}")
 
-                await process_agent_query(query=query, channel=channel, thread_ts=thread_ts)
+                if not dispatcher.submit((channel, thread_ts), (query, channel, thread_ts)):
+                    await client.web_client.chat_postMessage(
+                        channel=channel,
+                        text=BUSY_MESSAGE,
+                        thread_ts=thread_ts,
+                    )
 
             else:
-                client.web_client.chat_postMessage(
+                await client.web_client.chat_postMessage(
                     channel=channel,
                     text="Please provide a query after mentioning me.",
                     thread_ts=thread_ts
@@ -187,22 +273,40 @@ async def process_event(client: SocketModeClient, req: SocketModeRequest):
 async def main():
     """Initialize and run the Slack bot with Socket Mode connection."""
     
+    global client
+
+    web_client = AsyncWebClient(token=slack_token)
+    # Wait for Retry-After on 429s, so the final edit of an answer is not lost to rate limiting
+    web_client.retry_handlers.append(AsyncRateLimitErrorRetryHandler(max_retry_count=2))
+
+    client = SocketModeClient(
+        app_token=app_token,
+        web_client=web_client
+    )
+
     await get_bot_user_id()
-    
-    def event_handler(client: SocketModeClient, req: SocketModeRequest):
-        try:
-            loop = asyncio.get_running_loop()
-        except RuntimeError:
-            asyncio.run(process_event(client, req))
-        else:
-            asyncio.run_coroutine_threadsafe(process_event(client, req), loop)
+    await asyncio.to_thread(warm_up_retrievers)
 
-    client.socket_mode_request_listeners.append(event_handler) # register event handler 
+    dispatcher.start()
+
+    metrics_task = None
+    if settings.SLACK_METRICS_INTERVAL_SECONDS > 0:
+        metrics_task = asyncio.create_task(
+            report_embedding_cache_stats(settings.SLACK_METRICS_INTERVAL_SECONDS),
+            name="embedding-cache-metrics",
+        )
+
+    client.socket_mode_request_listeners.append(process_event) # register event handler 
 
     logger.info("Slack bot is running")
-    client.connect()
+    await client.connect()
 
-    await asyncio.Event().wait() # keeping the connection alive
+    try:
+        await asyncio.Event().wait() # keeping the connection alive
+    finally:
+        if metrics_task is not None:
+            metrics_task.cancel()
+        log_embedding_cache_stats()
 
 
 if __name__=="__main__":
@@ -0,0 +1,6 @@
+import os
+
+# Settings are loaded on import, the tests never reach OpenAI, Slack or LangSmith
+for name in ("OPENAI_API_KEY", "SLACK_BOT_TOKEN", "SLACK_APP_TOKEN", "LANGCHAIN_API_KEY", "LANGCHAIN_PROJECT"):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("LANGCHAIN_TRACING_V2", "false")
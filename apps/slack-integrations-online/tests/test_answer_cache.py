@@ -0,0 +1,164 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from src.slack_integrations_online.application.agents import answer_cache
+from src.slack_integrations_online.application.agents.answer_cache import SemanticAnswerCache
+
+
+class KeywordEmbeddings(Embeddings):
+    """Embeds a query by the counts of a few keywords, so related queries are close."""
+
+    KEYWORDS = ["deploy", "kubernetes", "install", "docker", "stack", "pipeline"]
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [self.embed_query(text) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        words = text.lower().split()
+        return [float(words.count(keyword)) + 0.01 for keyword in self.KEYWORDS]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    # Cached answers are stamped with the real clock
+    state = SimpleNamespace(now=time.monotonic())
+    monkeypatch.setattr(answer_cache, "time", SimpleNamespace(monotonic=lambda: state.now))
+
+    return state
+
+
+@pytest.fixture
+def version(monkeypatch):
+    """Version of the rag collection, as read by the cache."""
+
+    state = SimpleNamespace(value=1)
+
+    class FakeService:
+        def __init__(self, model, collection_name):
+            pass
+
+        async def get_version(self):
+            return state.value
+
+    monkeypatch.setattr(answer_cache, "AsyncMongoDBService", FakeService)
+
+    return state
+
+
+def make_cache(**kwargs) -> SemanticAnswerCache:
+    return SemanticAnswerCache(embeddings=KeywordEmbeddings(), version_check_seconds=0, **kwargs)
+
+
+async def store(cache: SemanticAnswerCache, query: str, answer: str, user_id: str = "user") -> None:
+    cache.store(query, user_id, await cache.embed(query), answer)
+
+
+async def lookup(cache: SemanticAnswerCache, query: str, user_id: str = "user"):
+    return await cache.lookup(query, user_id, await cache.embed(query))
+
+
+def test_similar_queries_of_the_same_user_hit(clock, version):
+    async def scenario():
+        cache = make_cache(threshold=0.95)
+        await store(cache, "how to deploy on kubernetes", "Use the Kubernetes orchestrator.")
+
+        hit = await lookup(cache, "So how do I deploy on Kubernetes")
+        other_user = await lookup(cache, "how to deploy on kubernetes", user_id="someone")
+        unrelated = await lookup(cache, "how to install docker")
+
+        return cache, hit, other_user, unrelated
+
+    cache, hit, other_user, unrelated = asyncio.run(scenario())
+
+    assert hit.answer == "Use the Kubernetes orchestrator."
+    assert hit.query == "how to deploy on kubernetes"
+    assert other_user is None
+    assert unrelated is None
+    assert (cache.stats.hits, cache.stats.misses) == (1, 2)
+
+
+def test_embeddings_are_unit_vectors(version):
+    embedding = asyncio.run(make_cache().embed("deploy a pipeline"))
+
+    assert np.linalg.norm(embedding) == pytest.approx(1.0)
+
+
+def test_answers_expire_after_the_ttl(clock, version):
+    async def scenario():
+        cache = make_cache(ttl_seconds=60)
+        await store(cache, "install docker", "Run the installer.")
+
+        clock.now += 59
+        fresh = await lookup(cache, "install docker")
+        clock.now += 2
+        expired = await lookup(cache, "install docker")
+
+        return cache, fresh, expired
+
+    cache, fresh, expired = asyncio.run(scenario())
+
+    assert fresh is not None
+    assert expired is None
+    assert cache.stats.expirations == 1
+
+
+def test_least_recently_used_answers_are_evicted(clock, version):
+    async def scenario():
+        cache = make_cache(max_size=2)
+        await store(cache, "install docker", "docker")
+        await store(cache, "deploy kubernetes", "kubernetes")
+        await lookup(cache, "install docker")
+        await store(cache, "stack pipeline", "pipeline")
+
+        queries = ("install docker", "deploy kubernetes", "stack pipeline")
+
+        return cache, [await lookup(cache, query) for query in queries]
+
+    cache, results = asyncio.run(scenario())
+
+    assert [result and result.answer for result in results] == ["docker", None, "pipeline"]
+    assert cache.stats.evictions == 1
+
+
+def test_new_rag_version_clears_the_cache(clock, version):
+    async def scenario():
+        cache = make_cache()
+        await lookup(cache, "install docker")
+        await store(cache, "install docker", "Run the installer.")
+        before = await lookup(cache, "install docker")
+
+        version.value = 2
+        after = await lookup(cache, "install docker")
+
+        return cache, before, after
+
+    cache, before, after = asyncio.run(scenario())
+
+    assert before is not None
+    assert after is None
+    assert cache.stats.invalidations == 1
+
+
+def test_version_is_read_at_most_every_interval(clock, version):
+    async def scenario():
+        cache = SemanticAnswerCache(embeddings=KeywordEmbeddings(), version_check_seconds=30)
+        await lookup(cache, "install docker")
+        await store(cache, "install docker", "Run the installer.")
+
+        version.value = 2
+        clock.now += 10
+        cached = await lookup(cache, "install docker")
+        clock.now += 30
+        cleared = await lookup(cache, "install docker")
+
+        return cached, cleared
+
+    cached, cleared = asyncio.run(scenario())
+
+    assert cached is not None
+    assert cleared is None
@@ -0,0 +1,120 @@
+import asyncio
+
+from src.slack_integrations_online.application.dispatcher import KeyedDispatcher
+
+
+async def wait_until_idle(dispatcher: KeyedDispatcher) -> None:
+    await asyncio.wait_for(dispatcher._queue.join(), timeout=5)
+
+
+def test_items_of_a_key_are_handled_in_submission_order():
+    handled = []
+
+    async def handler(item):
+        key, index = item
+        # Later items of a key finish sooner, so only the dispatcher keeps them in order
+        await asyncio.sleep(0.01 * (5 - index))
+        handled.append(item)
+
+    async def scenario():
+        dispatcher = KeyedDispatcher(handler, workers=4, metrics_interval=0)
+        dispatcher.start()
+
+        for index in range(5):
+            for key in ("thread-a", "thread-b"):
+                assert dispatcher.submit(key, (key, index))
+
+        await wait_until_idle(dispatcher)
+        await dispatcher.stop()
+
+        return dispatcher
+
+    dispatcher = asyncio.run(scenario())
+
+    for key in ("thread-a", "thread-b"):
+        assert [index for item_key, index in handled if item_key == key] == list(range(5))
+    assert dispatcher.stats.processed == 10
+
+
+def test_different_keys_run_concurrently():
+    running = 0
+    peak = 0
+
+    async def handler(item):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.05)
+        running -= 1
+
+    async def scenario():
+        dispatcher = KeyedDispatcher(handler, workers=3, metrics_interval=0)
+        dispatcher.start()
+
+        for key in range(6):
+            dispatcher.submit(key, key)
+
+        await wait_until_idle(dispatcher)
+        await dispatcher.stop()
+
+    asyncio.run(scenario())
+
+    assert peak == 3
+
+
+def test_full_queue_rejects_new_items():
+    async def scenario():
+        gate = asyncio.Event()
+
+        async def handler(item):
+            await gate.wait()
+
+        dispatcher = KeyedDispatcher(handler, workers=1, max_queue_size=3, metrics_interval=0)
+        dispatcher.start()
+
+        accepted = [dispatcher.submit("thread", item) for item in range(3)]
+        await asyncio.sleep(0.01)
+        # The worker took the first item, freeing one place
+        accepted.append(dispatcher.submit("thread", 3))
+        accepted.append(dispatcher.submit("other", 4))
+
+        gate.set()
+        await wait_until_idle(dispatcher)
+        await dispatcher.stop()
+
+        return dispatcher, accepted
+
+    dispatcher, accepted = asyncio.run(scenario())
+
+    assert accepted == [True, True, True, True, False]
+    assert dispatcher.stats.rejected == 1
+    assert dispatcher.stats.submitted == 4
+    assert dispatcher.stats.max_depth == 3
+    assert dispatcher.stats.processed == 4
+
+
+def test_handler_failures_are_counted_and_do_not_stop_the_key():
+    handled = []
+
+    async def handler(item):
+        if item == 1:
+            raise RuntimeError("Slack API error")
+        handled.append(item)
+
+    async def scenario():
+        dispatcher = KeyedDispatcher(handler, workers=2, metrics_interval=0)
+        dispatcher.start()
+
+        for item in range(3):
+            dispatcher.submit("thread", item)
+
+        await wait_until_idle(dispatcher)
+        await dispatcher.stop()
+
+        return dispatcher
+
+    dispatcher = asyncio.run(scenario())
+
+    assert handled == [0, 2]
+    assert dispatcher.stats.failed == 1
+    assert dispatcher.stats.to_metadata()["processed"] == 2
@@ -0,0 +1,80 @@
+from types import SimpleNamespace
+
+from src.slack_integrations_online.application.rag import document_cache
+from src.slack_integrations_online.application.rag.document_cache import DocumentCache
+
+
+def test_least_recently_used_documents_are_evicted_beyond_the_byte_budget():
+    cache = DocumentCache(max_bytes=100)
+    cache.put("a", {"content": "a"}, 40)
+    cache.put("b", {"content": "b"}, 40)
+    cache.get("a")
+
+    cache.put("c", {"content": "c"}, 40)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"content": "a"}
+    assert cache.get("c") == {"content": "c"}
+    assert cache.size_bytes == 80
+    assert cache.stats.evictions == 1
+
+
+def test_documents_larger_than_the_budget_are_not_cached():
+    cache = DocumentCache(max_bytes=100)
+    cache.put("a", {"content": "a"}, 40)
+
+    cache.put("huge", {"content": "huge"}, 101)
+
+    assert cache.get("huge") is None
+    assert cache.get("a") is not None
+    assert cache.stats.evictions == 0
+
+
+def test_replacing_a_document_updates_the_size():
+    cache = DocumentCache(max_bytes=100)
+    cache.put("a", {"content": "old"}, 60)
+
+    cache.put("a", {"content": "new"}, 30)
+
+    assert cache.get("a") == {"content": "new"}
+    assert cache.size_bytes == 30
+
+
+def test_version_change_clears_the_cache():
+    cache = DocumentCache()
+    cache.validate((1, 1))
+    cache.put("a", {"content": "a"}, 10)
+
+    cache.validate((1, 1))
+    assert cache.get("a") is not None
+
+    cache.validate((2, 1))
+    assert cache.get("a") is None
+    assert cache.size_bytes == 0
+    assert cache.stats.invalidations == 1
+
+
+def test_versions_are_checked_at_most_every_interval(monkeypatch):
+    clock = SimpleNamespace(now=100.0)
+    monkeypatch.setattr(document_cache, "time", SimpleNamespace(monotonic=lambda: clock.now))
+    cache = DocumentCache(version_check_seconds=30)
+
+    assert cache.needs_version_check()
+    cache.validate((1, 1))
+    clock.now += 29
+    assert not cache.needs_version_check()
+    clock.now += 1
+    assert cache.needs_version_check()
+
+
+def test_stats_report_the_hit_rate():
+    cache = DocumentCache()
+    cache.put("a", {"content": "a"}, 10)
+
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+
+    assert cache.stats.to_metadata() == {
+        "hits": 2, "misses": 1, "evictions": 0, "invalidations": 0, "hit_rate": 0.667,
+    }
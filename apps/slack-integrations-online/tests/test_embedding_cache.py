@@ -0,0 +1,107 @@
+import asyncio
+
+import pytest
+from langchain_core.embeddings import Embeddings
+
+from src.slack_integrations_online.application.rag import embedding_cache
+from src.slack_integrations_online.application.rag.embedding_cache import CachedEmbeddings, with_embedding_cache
+
+
+class CountingEmbeddings(Embeddings):
+    """Embeds a text by its length, counting the calls that reach the model."""
+
+    def __init__(self) -> None:
+        self.queries: list[str] = []
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [[float(len(text)), 1.0] for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        self.queries.append(text)
+        return [float(len(text)), 0.5]
+
+    async def aembed_query(self, text: str) -> list[float]:
+        return self.embed_query(text)
+
+
+@pytest.fixture(autouse=True)
+def caches(monkeypatch):
+    """Isolate the process-wide caches of every test."""
+
+    monkeypatch.setattr(embedding_cache, "_caches", {})
+
+
+def test_normalized_queries_share_an_entry():
+    model = CountingEmbeddings()
+    cache = CachedEmbeddings(model, model_id="model")
+
+    first = cache.embed_query("How do I  deploy?")
+    second = cache.embed_query("how do i deploy?")
+
+    assert first == second
+    assert model.queries == ["How do I  deploy?"]
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_least_recently_used_queries_are_evicted():
+    model = CountingEmbeddings()
+    cache = CachedEmbeddings(model, model_id="model", max_size=2)
+
+    for query in ("a", "b", "a", "c", "b"):
+        cache.embed_query(query)
+
+    assert model.queries == ["a", "b", "c", "b"]
+    assert cache.stats.evictions == 2
+
+
+def test_documents_are_not_cached():
+    model = CountingEmbeddings()
+    cache = CachedEmbeddings(model, model_id="model")
+
+    assert cache.embed_documents(["abc"]) == [[3.0, 1.0]]
+    assert cache.stats.to_metadata()["misses"] == 0
+
+
+def test_sqlite_store_survives_restarts(tmp_path):
+    path = tmp_path / "cache" / "embeddings.sqlite"
+    CachedEmbeddings(CountingEmbeddings(), model_id="model", path=path).embed_query("deploy")
+
+    model = CountingEmbeddings()
+    restarted = CachedEmbeddings(model, model_id="model", path=path)
+    other_model = CountingEmbeddings()
+    CachedEmbeddings(other_model, model_id="other", path=path).embed_query("deploy")
+
+    assert restarted.embed_query("deploy") == [6.0, 0.5]
+    assert restarted.embed_query("deploy") == [6.0, 0.5]
+    assert model.queries == []
+    assert (restarted.stats.disk_hits, restarted.stats.hits) == (1, 1)
+    assert other_model.queries == ["deploy"]
+
+
+def test_async_queries_use_the_same_cache(tmp_path):
+    model = CountingEmbeddings()
+    cache = CachedEmbeddings(model, model_id="model", path=tmp_path / "embeddings.sqlite")
+
+    async def scenario():
+        return [await cache.aembed_query("Deploy"), await cache.aembed_query("deploy")]
+
+    assert asyncio.run(scenario()) == [[6.0, 0.5], [6.0, 0.5]]
+    assert cache.embed_query("DEPLOY") == [6.0, 0.5]
+    assert model.queries == ["Deploy"]
+    assert cache.stats.hit_rate == pytest.approx(2 / 3)
+
+
+def test_one_cache_per_model_id():
+    first = with_embedding_cache(CountingEmbeddings(), model_id="model")
+    second = with_embedding_cache(CountingEmbeddings(), model_id="model")
+    other = with_embedding_cache(CountingEmbeddings(), model_id="other")
+
+    assert first is second
+    assert other is not first
+    assert set(embedding_cache.get_embedding_cache_stats()) == {"model", "other"}
+
+
+def test_disabled_cache_returns_the_model():
+    model = CountingEmbeddings()
+
+    assert with_embedding_cache(model, model_id="model", max_size=0) is model
@@ -0,0 +1,55 @@
+import asyncio
+
+import numpy as np
+import pytest
+from bson.binary import Binary
+from langchain_core.embeddings import Embeddings
+
+from src.slack_integrations_online.application.rag.embedding_storage import (
+    EmbeddingCodec,
+    EncodedEmbeddings,
+    with_embedding_storage,
+)
+
+
+def unit_vector(seed: int, dim: int = 1536) -> list[float]:
+    vector = np.random.default_rng(seed).normal(size=dim)
+
+    return (vector / np.linalg.norm(vector)).tolist()
+
+
+class FixedEmbeddings(Embeddings):
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        return [unit_vector(len(text)) for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        return unit_vector(len(text))
+
+
+@pytest.mark.parametrize("storage", ["float32", "int8"])
+def test_query_vectors_round_trip(storage):
+    codec = EmbeddingCodec(storage=storage, dimensions=512)
+    embedding = np.asarray(unit_vector(1)[:512])
+    embedding /= np.linalg.norm(embedding)
+
+    encoded = codec.encode(unit_vector(1))
+    decoded = codec.decode(encoded)
+
+    assert isinstance(encoded, Binary)
+    assert decoded.shape == (512,)
+    assert decoded @ embedding / np.linalg.norm(decoded) > 0.99
+
+
+def test_async_queries_are_encoded_like_sync_ones():
+    embeddings = with_embedding_storage(FixedEmbeddings(), storage="float32")
+
+    assert isinstance(embeddings, EncodedEmbeddings)
+    assert asyncio.run(embeddings.aembed_query("deploy")) == embeddings.embed_query("deploy")
+
+
+def test_default_storage_keeps_the_model():
+    model = FixedEmbeddings()
+
+    assert with_embedding_storage(model) is model
+    with pytest.raises(ValueError):
+        EmbeddingCodec(storage="binary")
@@ -0,0 +1,82 @@
+from src.slack_integrations_online.application.rag.single_document_retriever import (
+    extract_section,
+    format_document,
+    parse_headings,
+)
+
+
+PAGE = """# Guide
+
+Intro.
+
+## Install
+
+Install it.
+
+Copy```bash
+# not a heading
+pip install zenml
+```
+
+### Docker
+
+Run the image.
+
+## Usage
+
+### Docker
+
+Use the image.
+
+##
+Configuration
+
+Set the options.
+"""
+
+
+def test_headings_inside_code_blocks_are_skipped():
+    headings = [(level, text) for _, level, text in parse_headings(PAGE)]
+
+    assert headings == [
+        (1, "# Guide"),
+        (2, "## Install"),
+        (3, "### Docker"),
+        (2, "## Usage"),
+        (3, "### Docker"),
+        (2, "## Configuration"),
+    ]
+
+
+def test_section_is_extracted_with_its_subsections():
+    section = extract_section(PAGE, "# Guide > ## Install")
+
+    assert section.startswith("## Install")
+    assert "pip install zenml" in section
+    assert "Run the image." in section
+    assert "## Usage" not in section
+
+
+def test_full_path_picks_the_right_duplicate_heading():
+    assert "Use the image." in extract_section(PAGE, "# Guide > ## Usage > ### Docker")
+    assert "Run the image." in extract_section(PAGE, "# Guide > ## Install > ### Docker")
+
+
+def test_last_heading_is_used_when_no_path_matches():
+    assert extract_section(PAGE, "### Docker").startswith("### Docker\n\nRun the image.")
+
+
+def test_empty_heading_takes_the_title_of_the_next_line():
+    assert extract_section(PAGE, "# Guide > ## Configuration").strip().endswith("Set the options.")
+
+
+def test_unknown_section_returns_the_whole_page():
+    assert extract_section(PAGE, "## Missing") == PAGE
+
+
+def test_documents_are_formatted_with_their_url():
+    formatted = format_document({"chunk": "Some text.", "url": "https://docs/a"}, "https://docs/a")
+
+    assert "<url>https://docs/a</url>" in formatted
+    assert "<content>Some text.</content>" in formatted
+    assert "No document found" in format_document(None, "https://docs/b")
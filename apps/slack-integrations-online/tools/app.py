@@ -3,6 +3,7 @@ from pathlib import Path
 import sys
 
 from src.slack_integrations_online.application.agents.agents import SupportAgentsManager
+from src.slack_integrations_online.application.rag.retrievers import warm_up_retrievers
 
 
 async def main(user_query):
@@ -38,6 +39,8 @@ if __name__ == "__main__":
     print('\n' + '='*50)
     print('AI Support Engineer')
     print('='*50)
+
+    warm_up_retrievers()
     
     while True:
         try: